@@ -0,0 +1,390 @@
+"""
+Benchmarks for the task-to-notification hot path.
+
+Drives ``CronLambdaTask.lambda_handler`` (and through it
+``dispatch_sns_messages``) and ``RenderedTemplateNotificationHandler.lambda_handler``
+with stubbed AWS clients, across a grid of result counts, payload sizes, SQS
+batch sizes, and template complexity. Each record in a ``notify`` batch
+carries a distinct payload, so every record is rendered; the ``duplicates``
+scenarios repeat one payload across the batch to time the render memo. Each
+scenario records throughput, p50/p99 latency, and peak traced memory.
+
+Run from the repository root::
+
+    python benchmarks/hot_path.py --save .benchmarks/baseline.json
+    python benchmarks/hot_path.py --compare .benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from lambdacron.codec import CODEC_ENV_VAR  # noqa: E402
+from lambdacron.lambda_task import CronLambdaTask  # noqa: E402
+from lambdacron.notifications.base import (  # noqa: E402
+    RenderedTemplateNotificationHandler,
+    TemplateProvider,
+)
+
+SIMPLE_TEMPLATE = "Result {{ result_type }}: {{ status }}"
+COMPLEX_TEMPLATE = """\
+<h2>Report for {{ result_type }}</h2>
+{% if items %}
+<ul>
+  {% for item in items %}
+  <li>{{ loop.index }}. <strong>{{ item.name | title }}</strong>
+    {% if item.value > 50 %}high{% else %}low{% endif %} ({{ item.value }})
+  </li>
+  {% endfor %}
+</ul>
+{% else %}
+<p>No items.</p>
+{% endif %}
+<p>Status: {{ status | upper }}</p>
+"""
+
+RESULT_COUNTS = (1, 10, 50)
+PAYLOAD_SIZES = (128, 8 * 1024, 128 * 1024)
+BATCH_SIZES = (1, 10, 100)
+TEMPLATES = {"simple": SIMPLE_TEMPLATE, "complex": COMPLEX_TEMPLATE}
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    items_per_iteration: int
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    peak_memory_kib: float
+
+
+class StubSnsClient:
+    def __init__(self) -> None:
+        self.messages: list[dict[str, Any]] = []
+
+    def publish(self, **kwargs: Any) -> dict[str, str]:
+        self.messages.append(kwargs)
+        return {"MessageId": "stub"}
+
+    def publish_batch(self, **kwargs: Any) -> dict[str, Any]:
+        entries = kwargs["PublishBatchRequestEntries"]
+        self.messages.extend(entries)
+        return {
+            "Successful": [
+                {"Id": entry["Id"], "MessageId": "stub"} for entry in entries
+            ],
+            "Failed": [],
+        }
+
+
+class StaticTemplateProvider(TemplateProvider):
+    def __init__(self, template: str) -> None:
+        self.template = template
+
+    def get_template(self) -> str:
+        return self.template
+
+
+class DiscardingHandler(RenderedTemplateNotificationHandler):
+    def notify(
+        self,
+        *,
+        result: Mapping[str, Any],
+        rendered: Mapping[str, str],
+        record: Mapping[str, Any],
+    ) -> None:
+        pass
+
+
+class SyntheticTask(CronLambdaTask):
+    def __init__(self, results: Mapping[str, Any], **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.results = results
+
+    def _perform_task(self, event: Any, context: Any) -> dict[str, Any]:
+        return dict(self.results)
+
+
+def build_payload(size: int) -> dict[str, Any]:
+    item_count = max(1, size // 64)
+    return {
+        "status": "ok",
+        "items": [
+            {"name": f"item-{index:05d}", "value": index % 100}
+            for index in range(item_count)
+        ],
+    }
+
+
+def build_sqs_event(
+    batch_size: int, payload: Mapping[str, Any], *, duplicates: bool = False
+) -> dict[str, Any]:
+    # The notification plumbing subscribes queues with raw message delivery,
+    # so the body is the published message and attributes ride on the record.
+    # Unless duplicates are wanted, a per-record sequence number keeps the
+    # render memo from serving later records in the batch.
+    def body(index: int) -> str:
+        if duplicates:
+            return json.dumps({**payload, "result_type": "report"})
+        return json.dumps({**payload, "sequence": index, "result_type": "report"})
+
+    return {
+        "Records": [
+            {
+                "body": body(index),
+                "eventSource": "aws:sqs",
+                "messageId": f"msg-{index}",
+                "messageAttributes": {
+                    "result_type": {"dataType": "String", "stringValue": "report"}
+                },
+            }
+            for index in range(batch_size)
+        ]
+    }
+
+
+def measure(
+    name: str,
+    func: Callable[[], None],
+    *,
+    items: int,
+    iterations: int,
+    warmup: int = 2,
+) -> BenchmarkResult:
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    timings.sort()
+    p99_index = min(len(timings) - 1, round(0.99 * (len(timings) - 1)))
+    return BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        items_per_iteration=items,
+        throughput=items * len(timings) / sum(timings),
+        p50_ms=statistics.median(timings) * 1000,
+        p99_ms=timings[p99_index] * 1000,
+        peak_memory_kib=peak / 1024,
+    )
+
+
+def dispatch_benchmarks(iterations: int, name_filter: str) -> list[BenchmarkResult]:
+    results = []
+    silent = logging.getLogger("benchmark.dispatch")
+    for count in RESULT_COUNTS:
+        for size in PAYLOAD_SIZES:
+            payloads = {f"type_{index}": build_payload(size) for index in range(count)}
+            for batch in (False, True):
+                mode = "batch" if batch else "single"
+                name = f"dispatch[results={count},payload={size},{mode}]"
+                if name_filter not in name:
+                    continue
+                sns_client = StubSnsClient()
+                task = SyntheticTask(
+                    payloads,
+                    sns_topic_arn="arn:aws:sns:us-east-1:123456789012:bench",
+                    sns_client=sns_client,
+                    logger=silent,
+                    batch_publish=batch,
+                )
+
+                def run(task: SyntheticTask = task, client=sns_client) -> None:
+                    client.messages.clear()
+                    task.lambda_handler({}, None)
+
+                results.append(
+                    measure(
+                        name,
+                        run,
+                        items=count,
+                        iterations=iterations,
+                    )
+                )
+    return results
+
+
+def notification_benchmarks(iterations: int, name_filter: str) -> list[BenchmarkResult]:
+    results = []
+    silent = logging.getLogger("benchmark.notify")
+    for batch_size in BATCH_SIZES:
+        for size in PAYLOAD_SIZES:
+            payload = build_payload(size)
+            events = {"": build_sqs_event(batch_size, payload)}
+            if batch_size > 1:
+                events[",duplicates"] = build_sqs_event(
+                    batch_size, payload, duplicates=True
+                )
+            for suffix, event in events.items():
+                for template_name, template in TEMPLATES.items():
+                    name = (
+                        f"notify[batch={batch_size},payload={size},"
+                        f"template={template_name}{suffix}]"
+                    )
+                    if name_filter not in name:
+                        continue
+                    handler = DiscardingHandler(
+                        {"body": StaticTemplateProvider(template)}, logger=silent
+                    )
+
+                    def run(handler: DiscardingHandler = handler, event=event) -> None:
+                        response = handler.lambda_handler(event, None)
+                        if response["batchItemFailures"]:
+                            raise RuntimeError("benchmark records failed to render")
+
+                    results.append(
+                        measure(
+                            name,
+                            run,
+                            items=batch_size,
+                            iterations=iterations,
+                        )
+                    )
+    return results
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_table(
+    results: list[BenchmarkResult], baseline: Mapping[str, Mapping[str, float]]
+) -> str:
+    lines = [
+        f"{'scenario':<62} {'items/s':>12} {'p50 ms':>9} {'p99 ms':>9} "
+        f"{'peak KiB':>10} {'p50 vs base':>12}"
+    ]
+    for result in results:
+        change = ""
+        previous = baseline.get(result.name)
+        if previous and previous.get("p50_ms"):
+            delta = (result.p50_ms - previous["p50_ms"]) / previous["p50_ms"]
+            change = f"{delta:+.1%}"
+        lines.append(
+            f"{result.name:<62} {result.throughput:>12.1f} {result.p50_ms:>9.3f} "
+            f"{result.p99_ms:>9.3f} {result.peak_memory_kib:>10.1f} {change:>12}"
+        )
+    return "\n".join(lines)
+
+
+def find_regressions(
+    results: list[BenchmarkResult],
+    baseline: Mapping[str, Mapping[str, float]],
+    threshold: float,
+) -> list[str]:
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if not previous or not previous.get("p50_ms"):
+            continue
+        if result.p50_ms > previous["p50_ms"] * (1 + threshold):
+            regressions.append(result.name)
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the LambdaCron task-to-notification hot path."
+    )
+    parser.add_argument(
+        "-n",
+        "--iterations",
+        type=int,
+        default=20,
+        help="Timed iterations per scenario.",
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="Only run scenarios whose name contains this substring.",
+    )
+    parser.add_argument(
+        "--json-codec",
+        help="JSON codec backend to benchmark (json, orjson, msgspec, auto).",
+    )
+    parser.add_argument(
+        "--save",
+        type=Path,
+        help="Write results to this JSON file for later comparison.",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="Compare against a JSON file written by --save.",
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=None,
+        help=(
+            "Exit non-zero if any scenario's p50 is slower than the baseline "
+            "by more than this fraction (e.g. 0.2 for 20%%)."
+        ),
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.json_codec:
+        os.environ[CODEC_ENV_VAR] = args.json_codec
+    logging.getLogger("benchmark").setLevel(logging.WARNING)
+    results = dispatch_benchmarks(args.iterations, args.filter)
+    results += notification_benchmarks(args.iterations, args.filter)
+
+    baseline: dict[str, dict[str, float]] = {}
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+    print(format_table(results, baseline))
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        document = {
+            "commit": current_commit(),
+            "python": platform.python_version(),
+            "results": {result.name: asdict(result) for result in results},
+        }
+        args.save.write_text(json.dumps(document, indent=2), encoding="utf-8")
+
+    if args.compare and args.max_regression is not None:
+        regressions = find_regressions(results, baseline, args.max_regression)
+        if regressions:
+            print(
+                "error: p50 regressions beyond threshold: " + ", ".join(regressions),
+                file=sys.stderr,
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
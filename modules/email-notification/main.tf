@@ -10,8 +10,32 @@ locals {
   }
   optional_env = merge(
     length(var.reply_to) > 0 ? { EMAIL_REPLY_TO = jsonencode(var.reply_to) } : {},
+    var.bulk_send ? { EMAIL_BULK_SEND = "true" } : {},
+    var.rate_limit ? { EMAIL_RATE_LIMIT = "true" } : {},
+    var.metrics_namespace != null ? { LAMBDACRON_METRICS_NAMESPACE = var.metrics_namespace } : {},
+    var.idempotency_table != null ? { LAMBDACRON_IDEMPOTENCY_TABLE = var.idempotency_table } : {},
   )
-  env_vars = merge(local.base_env, local.optional_env)
+  env_vars         = merge(local.base_env, local.optional_env)
+  ses_send_actions = concat(
+    ["ses:SendEmail"],
+    var.bulk_send ? ["ses:SendBulkTemplatedEmail"] : [],
+  )
+  # Bulk sends use a pass-through SES template that the handler creates, or
+  # updates if its parts are out of date, on first use.
+  ses_template_statements = var.bulk_send ? [
+    {
+      Effect   = "Allow"
+      Action   = ["ses:GetTemplate", "ses:CreateTemplate", "ses:UpdateTemplate"]
+      Resource = "*"
+    },
+  ] : []
+  ses_quota_statements = var.rate_limit ? [
+    {
+      Effect   = "Allow"
+      Action   = ["ses:GetSendQuota"]
+      Resource = "*"
+    },
+  ] : []
 }
 
 data "aws_caller_identity" "current" {}
@@ -66,20 +90,54 @@ resource "aws_iam_policy" "lambda_logs_policy" {
 
 resource "aws_iam_policy" "lambda_ses_policy" {
   name = "${local.lambda_name}-ses"
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = concat(
+      [
+        {
+          Effect   = "Allow"
+          Action   = local.ses_send_actions
+          Resource = "*"
+          Condition = {
+            StringEquals = {
+              "ses:FromAddress" = var.sender
+            }
+          }
+        },
+      ],
+      local.ses_template_statements,
+      local.ses_quota_statements,
+    )
+  })
+  tags = local.tags
+}
+
+resource "aws_iam_policy" "lambda_payload_policy" {
+  count = var.payload_bucket != null ? 1 : 0
+  name  = "${local.lambda_name}-payloads"
   policy = jsonencode({
     Version = "2012-10-17"
     Statement = [
       {
-        Effect = "Allow"
-        Action = [
-          "ses:SendEmail",
-        ]
-        Resource = "*"
-        Condition = {
-          StringEquals = {
-            "ses:FromAddress" = var.sender
-          }
-        }
+        Effect   = "Allow"
+        Action   = ["s3:GetObject"]
+        Resource = "arn:aws:s3:::${var.payload_bucket}/lambdacron/payloads/*"
+      },
+    ]
+  })
+  tags = local.tags
+}
+
+resource "aws_iam_policy" "lambda_idempotency_policy" {
+  count = var.idempotency_table != null ? 1 : 0
+  name  = "${local.lambda_name}-idempotency"
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect   = "Allow"
+        Action   = ["dynamodb:PutItem", "dynamodb:DeleteItem"]
+        Resource = "arn:aws:dynamodb:*:${data.aws_caller_identity.current.account_id}:table/${var.idempotency_table}"
       },
     ]
   })
@@ -96,6 +154,18 @@ resource "aws_iam_role_policy_attachment" "lambda_ses_attachment" {
   policy_arn = aws_iam_policy.lambda_ses_policy.arn
 }
 
+resource "aws_iam_role_policy_attachment" "lambda_payload_attachment" {
+  count      = var.payload_bucket != null ? 1 : 0
+  role       = aws_iam_role.lambda_role.name
+  policy_arn = aws_iam_policy.lambda_payload_policy[0].arn
+}
+
+resource "aws_iam_role_policy_attachment" "lambda_idempotency_attachment" {
+  count      = var.idempotency_table != null ? 1 : 0
+  role       = aws_iam_role.lambda_role.name
+  policy_arn = aws_iam_policy.lambda_idempotency_policy[0].arn
+}
+
 resource "aws_lambda_function" "email" {
   function_name = local.lambda_name
   role          = aws_iam_role.lambda_role.arn
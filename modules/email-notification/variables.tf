@@ -79,6 +79,36 @@ variable "reply_to" {
   default     = []
 }
 
+variable "bulk_send" {
+  description = "Send each SQS batch with SES SendBulkTemplatedEmail instead of one SendEmail per record."
+  type        = bool
+  default     = false
+}
+
+variable "rate_limit" {
+  description = "Pace SES sends to the account's maximum send rate and retry throttled sends."
+  type        = bool
+  default     = false
+}
+
+variable "payload_bucket" {
+  description = "Optional S3 bucket holding result payloads offloaded by the scheduled task."
+  type        = string
+  default     = null
+}
+
+variable "idempotency_table" {
+  description = "Optional DynamoDB table recording delivered messages so SQS redeliveries are not emailed twice."
+  type        = string
+  default     = null
+}
+
+variable "metrics_namespace" {
+  description = "Optional CloudWatch namespace for per-invocation metrics emitted in Embedded Metric Format."
+  type        = string
+  default     = null
+}
+
 variable "timeout" {
   description = "Lambda timeout in seconds."
   type        = number
@@ -5,6 +5,7 @@ locals {
   )
   tags                = merge({ managed_by = "lambdacron" }, var.tags)
   dockerfile_arg      = var.dockerfile_path == null ? "" : "-f ${var.dockerfile_path} "
+  build_arg_flags     = join("", [for name, value in var.build_args : "--build-arg ${name}=${value} "])
   build_context_paths = var.build_context_paths == null ? [var.source_dir] : var.build_context_paths
   build_context_hash = sha1(join("", [
     for file_path in flatten([
@@ -103,6 +104,7 @@ resource "null_resource" "build_and_push" {
     build_context   = local.build_context_hash
     repository_name = aws_ecr_repository.lambda_image.name
     dockerfile_path = var.dockerfile_path
+    build_args      = jsonencode(var.build_args)
   }
 
   provisioner "local-exec" {
@@ -113,7 +115,7 @@ resource "null_resource" "build_and_push" {
       export DOCKER_CONFIG="$(mktemp -d)"
       trap 'rm -rf "$DOCKER_CONFIG"' EXIT
       aws ecr get-login-password --region ${data.aws_region.current.name} | docker login --username AWS --password-stdin ${data.aws_caller_identity.current.account_id}.dkr.ecr.${data.aws_region.current.name}.amazonaws.com
-      docker buildx build --platform ${var.platform} ${local.dockerfile_arg}-t ${aws_ecr_repository.lambda_image.repository_url}:${var.image_tag} ${var.source_dir}
+      docker buildx build --platform ${var.platform} ${local.dockerfile_arg}${local.build_arg_flags}-t ${aws_ecr_repository.lambda_image.repository_url}:${var.image_tag} ${var.source_dir}
       docker push ${aws_ecr_repository.lambda_image.repository_url}:${var.image_tag}
     EOC
   }
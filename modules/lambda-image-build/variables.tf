@@ -27,6 +27,12 @@ variable "build_context_paths" {
   default     = null
 }
 
+variable "build_args" {
+  description = "Build arguments passed to docker build, for example the template directory to precompile."
+  type        = map(string)
+  default     = {}
+}
+
 variable "platform" {
   description = "Target platform for the build (e.g., linux/amd64)."
   type        = string
@@ -53,11 +53,33 @@ resource "aws_iam_policy" "lambda_logs_policy" {
   tags = local.tags
 }
 
+resource "aws_iam_policy" "lambda_payload_policy" {
+  count = var.payload_bucket != null ? 1 : 0
+  name  = "${local.lambda_name}-payloads"
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect   = "Allow"
+        Action   = ["s3:GetObject"]
+        Resource = "arn:aws:s3:::${var.payload_bucket}/lambdacron/payloads/*"
+      },
+    ]
+  })
+  tags = local.tags
+}
+
 resource "aws_iam_role_policy_attachment" "lambda_logs_attachment" {
   role       = aws_iam_role.lambda_role.name
   policy_arn = aws_iam_policy.lambda_logs_policy.arn
 }
 
+resource "aws_iam_role_policy_attachment" "lambda_payload_attachment" {
+  count      = var.payload_bucket != null ? 1 : 0
+  role       = aws_iam_role.lambda_role.name
+  policy_arn = aws_iam_policy.lambda_payload_policy[0].arn
+}
+
 resource "aws_lambda_function" "print" {
   function_name = local.lambda_name
   role          = aws_iam_role.lambda_role.arn
@@ -71,9 +93,10 @@ resource "aws_lambda_function" "print" {
   }
 
   environment {
-    variables = {
-      (var.template_env_var) = file(var.template_file)
-    }
+    variables = merge(
+      { (var.template_env_var) = file(var.template_file) },
+      var.metrics_namespace != null ? { LAMBDACRON_METRICS_NAMESPACE = var.metrics_namespace } : {},
+    )
   }
 
   tags = local.tags
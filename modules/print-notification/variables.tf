@@ -36,6 +36,18 @@ variable "template_file" {
   type        = string
 }
 
+variable "payload_bucket" {
+  description = "Optional S3 bucket holding result payloads offloaded by the scheduled task."
+  type        = string
+  default     = null
+}
+
+variable "metrics_namespace" {
+  description = "Optional CloudWatch namespace for per-invocation metrics emitted in Embedded Metric Format."
+  type        = string
+  default     = null
+}
+
 variable "timeout" {
   description = "Lambda timeout in seconds."
   type        = number
@@ -2,6 +2,8 @@ locals {
   tags = merge({ managed_by = "lambdacron" }, var.tags)
   environment_variables = merge(
     { SNS_TOPIC_ARN = var.sns_topic_arn },
+    var.payload_bucket != null ? { LAMBDACRON_PAYLOAD_BUCKET = var.payload_bucket } : {},
+    var.metrics_namespace != null ? { LAMBDACRON_METRICS_NAMESPACE = var.metrics_namespace } : {},
     var.lambda_env,
   )
   lambda_name = coalesce(var.lambda_name, "lambdacron-scheduled-${terraform.workspace}")
@@ -35,6 +37,17 @@ data "aws_iam_policy_document" "lambda_permissions" {
     actions   = ["sns:Publish"]
     resources = [var.sns_topic_arn]
   }
+
+  dynamic "statement" {
+    for_each = var.payload_bucket != null ? [var.payload_bucket] : []
+
+    content {
+      sid       = "AllowPayloadOffload"
+      effect    = "Allow"
+      actions   = ["s3:PutObject"]
+      resources = ["arn:aws:s3:::${statement.value}/lambdacron/payloads/*"]
+    }
+  }
 }
 
 resource "aws_iam_role" "lambda_role" {
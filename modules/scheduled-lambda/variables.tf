@@ -19,6 +19,18 @@ variable "lambda_env" {
   default     = {}
 }
 
+variable "payload_bucket" {
+  description = "Optional S3 bucket for result payloads too large to publish to SNS inline."
+  type        = string
+  default     = null
+}
+
+variable "metrics_namespace" {
+  description = "Optional CloudWatch namespace for per-invocation metrics emitted in Embedded Metric Format."
+  type        = string
+  default     = null
+}
+
 variable "timeout" {
   description = "Lambda timeout in seconds."
   type        = number
@@ -1,11 +1,47 @@
 import json
 import os
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
-from lambdacron.notifications.base import EnvVarTemplateProvider
-from lambdacron.notifications.email_handler import EmailNotificationHandler
+from lambdacron.notifications.base import (
+    EnvVarTemplateProvider,
+    RenderedTemplateNotificationHandler,
+    TemplateProvider,
+    directory_template_providers,
+)
 from lambdacron.notifications.print_handler import PrintNotificationHandler
 
+if TYPE_CHECKING:
+    from lambdacron.notifications.email_handler import EmailNotificationHandler
+
+HandlerT = TypeVar("HandlerT", bound=RenderedTemplateNotificationHandler)
+
+# Environment variables read when a handler is constructed; a change to any of
+# them rebuilds the handler. Template variables are not listed because template
+# providers read them on every invocation.
+HANDLER_CONFIG_ENV_VARS = (
+    "LAMBDACRON_TEMPLATE_DIR",
+    "LAMBDACRON_BYTECODE_CACHE_DIR",
+    "LAMBDACRON_PRECOMPILED_TEMPLATES",
+    "LAMBDACRON_JSON_CODEC",
+    "LAMBDACRON_METRICS_NAMESPACE",
+    "LAMBDACRON_TRACER",
+    "LAMBDACRON_IDEMPOTENCY_TABLE",
+)
+EMAIL_CONFIG_ENV_VARS = (
+    "EMAIL_SENDER",
+    "EMAIL_RECIPIENTS",
+    "EMAIL_REPLY_TO",
+    "EMAIL_BULK_SEND",
+    "EMAIL_RATE_LIMIT",
+    *HANDLER_CONFIG_ENV_VARS,
+)
+PRINT_CONFIG_ENV_VARS = HANDLER_CONFIG_ENV_VARS
+
+# Handler instances live at module scope so warm invocations reuse them (and
+# their boto3 clients and compiled templates) instead of rebuilding them.
+_HANDLERS: dict[str, tuple[tuple[str | None, ...], Any]] = {}
+
 
 def _load_json_list(env_var: str, *, required: bool = False) -> list[str]:
     raw = os.environ.get(env_var)
@@ -16,24 +52,69 @@ def _load_json_list(env_var: str, *, required: bool = False) -> list[str]:
     return json.loads(raw)
 
 
-def email_handler(
-    event: dict[str, Any], context: Any
-) -> dict[str, list[dict[str, str]]]:
-    handler_instance = EmailNotificationHandler(
+def _load_bool(env_var: str) -> bool:
+    return os.environ.get(env_var, "").strip().lower() in ("1", "true", "yes")
+
+
+def _load_partials() -> dict[str, TemplateProvider]:
+    # Shared templates baked into a custom image, available to
+    # {% include %} and {% extends %} by their path in the directory.
+    directory = os.environ.get("LAMBDACRON_TEMPLATE_DIR")
+    if not directory:
+        return {}
+    return directory_template_providers(Path(directory))
+
+
+def _get_handler(
+    name: str, env_vars: tuple[str, ...], factory: Callable[[], HandlerT]
+) -> HandlerT:
+    config = tuple(os.environ.get(env_var) for env_var in env_vars)
+    cached = _HANDLERS.get(name)
+    if cached is None or cached[0] != config:
+        cached = (config, factory())
+        _HANDLERS[name] = cached
+    return cached[1]
+
+
+def _build_email_handler() -> "EmailNotificationHandler":
+    # Imported here so the print handler's cold start does not load boto3.
+    from lambdacron.notifications.email_handler import EmailNotificationHandler
+
+    return EmailNotificationHandler(
         subject_template_provider=EnvVarTemplateProvider("EMAIL_SUBJECT_TEMPLATE"),
         text_template_provider=EnvVarTemplateProvider("EMAIL_TEXT_TEMPLATE"),
         html_template_provider=EnvVarTemplateProvider("EMAIL_HTML_TEMPLATE"),
         sender=os.environ["EMAIL_SENDER"],
         recipients=_load_json_list("EMAIL_RECIPIENTS", required=True),
         reply_to=_load_json_list("EMAIL_REPLY_TO"),
+        bulk_send=_load_bool("EMAIL_BULK_SEND"),
+        rate_limit=_load_bool("EMAIL_RATE_LIMIT"),
+        partial_providers=_load_partials(),
     )
-    return handler_instance.lambda_handler(event, context)
+
+
+def _build_print_handler() -> PrintNotificationHandler:
+    return PrintNotificationHandler(
+        template_provider=EnvVarTemplateProvider(),
+        partial_providers=_load_partials(),
+    )
+
+
+def get_email_handler() -> "EmailNotificationHandler":
+    return _get_handler("email", EMAIL_CONFIG_ENV_VARS, _build_email_handler)
+
+
+def get_print_handler() -> PrintNotificationHandler:
+    return _get_handler("print", PRINT_CONFIG_ENV_VARS, _build_print_handler)
+
+
+def email_handler(
+    event: dict[str, Any], context: Any
+) -> dict[str, list[dict[str, str]]]:
+    return get_email_handler().lambda_handler(event, context)
 
 
 def print_handler(
     event: dict[str, Any], context: Any
 ) -> dict[str, list[dict[str, str]]]:
-    handler_instance = PrintNotificationHandler(
-        template_provider=EnvVarTemplateProvider(),
-    )
-    return handler_instance.lambda_handler(event, context)
+    return get_print_handler().lambda_handler(event, context)
@@ -37,6 +37,7 @@ module "notification_image" {
     "notification-container/Dockerfile",
     "notification-container/lambda.py",
     "notification-container/requirements.txt",
+    "notification-container/templates/**",
     "src/lambdacron/**/*.py",
   ]
 
@@ -0,0 +1,500 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+)
+
+from lambdacron.clients import get_client
+
+
+class ResultState(NamedTuple):
+    """
+    Last published state of a result type.
+
+    Attributes
+    ----------
+    digest : str
+        Content hash of the last published payload.
+    published_at : float
+        Unix time at which the payload was published.
+    """
+
+    digest: str
+    published_at: float
+
+
+class ResultStateStore(ABC):
+    """
+    Base class for persisting the last published state of each result type.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[ResultState]:
+        """
+        Return the stored state for a key.
+
+        Parameters
+        ----------
+        key : str
+            State key for a result type.
+
+        Returns
+        -------
+        ResultState or None
+            Stored state, or ``None`` if nothing has been stored.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(self, key: str, state: ResultState) -> None:
+        """
+        Store the state for a key.
+
+        Parameters
+        ----------
+        key : str
+            State key for a result type.
+        state : ResultState
+            State to store.
+        """
+        raise NotImplementedError
+
+
+class LocalFileStateStore(ResultStateStore):
+    """
+    Store result states in a JSON file on local disk.
+
+    Useful for development and tests. In Lambda, files only survive while
+    the execution environment stays warm.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        JSON file holding all states. Created on first write.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[ResultState]:
+        """
+        Return the stored state for a key.
+
+        Parameters
+        ----------
+        key : str
+            State key for a result type.
+
+        Returns
+        -------
+        ResultState or None
+            Stored state, or ``None`` if nothing has been stored.
+        """
+        with self._lock:
+            entry = self._read().get(key)
+        return ResultState(**entry) if entry else None
+
+    def put(self, key: str, state: ResultState) -> None:
+        """
+        Store the state for a key.
+
+        Parameters
+        ----------
+        key : str
+            State key for a result type.
+        state : ResultState
+            State to store.
+        """
+        with self._lock:
+            states = self._read()
+            states[key] = state._asdict()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file and rename it so a crash mid-write
+            # never leaves a truncated state file behind.
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(states, handle)
+            os.replace(tmp_name, self.path)
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+
+
+class S3StateStore(ResultStateStore):
+    """
+    Store result states as small JSON objects in S3.
+
+    Parameters
+    ----------
+    bucket : str
+        Bucket holding the state objects.
+    prefix : str, optional
+        Key prefix for the state objects.
+    s3_client : botocore.client.BaseClient, optional
+        S3 client. Defaults to the shared client from
+        :func:`lambdacron.clients.get_client`, created on first use.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        prefix: str = "lambdacron/state/",
+        s3_client: Optional[Any] = None,
+    ) -> None:
+        self.bucket = bucket
+        self.prefix = prefix
+        self._s3_client = s3_client
+        self._s3_client_lock = threading.Lock()
+
+    @property
+    def s3_client(self) -> Any:
+        """
+        S3 client holding the state objects, created on first access.
+        """
+        with self._s3_client_lock:
+            if self._s3_client is None:
+                self._s3_client = get_client("s3")
+            return self._s3_client
+
+    def get(self, key: str) -> Optional[ResultState]:
+        """
+        Return the stored state for a key.
+
+        Parameters
+        ----------
+        key : str
+            State key for a result type.
+
+        Returns
+        -------
+        ResultState or None
+            Stored state, or ``None`` if nothing has been stored.
+        """
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket, Key=self._object_key(key)
+            )
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+        return ResultState(**json.loads(response["Body"].read()))
+
+    def put(self, key: str, state: ResultState) -> None:
+        """
+        Store the state for a key.
+
+        Parameters
+        ----------
+        key : str
+            State key for a result type.
+        state : ResultState
+            State to store.
+        """
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=self._object_key(key),
+            Body=json.dumps(state._asdict()).encode("utf-8"),
+            ContentType="application/json",
+        )
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}.json"
+
+
+class DynamoDBStateStore(ResultStateStore):
+    """
+    Store result states in a DynamoDB table.
+
+    The table must have a string partition key named ``key_attribute``.
+
+    Parameters
+    ----------
+    table_name : str
+        DynamoDB table name.
+    key_attribute : str, optional
+        Name of the table's partition key.
+    dynamodb_client : botocore.client.BaseClient, optional
+        DynamoDB client. Defaults to the shared client from
+        :func:`lambdacron.clients.get_client`, created on first use.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        *,
+        key_attribute: str = "result_key",
+        dynamodb_client: Optional[Any] = None,
+    ) -> None:
+        self.table_name = table_name
+        self.key_attribute = key_attribute
+        self._dynamodb_client = dynamodb_client
+        self._dynamodb_client_lock = threading.Lock()
+
+    @property
+    def dynamodb_client(self) -> Any:
+        """
+        DynamoDB client for the state table, created on first access.
+        """
+        with self._dynamodb_client_lock:
+            if self._dynamodb_client is None:
+                self._dynamodb_client = get_client("dynamodb")
+            return self._dynamodb_client
+
+    def get(self, key: str) -> Optional[ResultState]:
+        """
+        Return the stored state for a key.
+
+        Parameters
+        ----------
+        key : str
+            State key for a result type.
+
+        Returns
+        -------
+        ResultState or None
+            Stored state, or ``None`` if nothing has been stored.
+        """
+        response = self.dynamodb_client.get_item(
+            TableName=self.table_name,
+            Key={self.key_attribute: {"S": key}},
+            ConsistentRead=True,
+        )
+        item = response.get("Item")
+        if not item:
+            return None
+        return ResultState(
+            digest=item["digest"]["S"],
+            published_at=float(item["published_at"]["N"]),
+        )
+
+    def put(self, key: str, state: ResultState) -> None:
+        """
+        Store the state for a key.
+
+        Parameters
+        ----------
+        key : str
+            State key for a result type.
+        state : ResultState
+            State to store.
+        """
+        self.dynamodb_client.put_item(
+            TableName=self.table_name,
+            Item={
+                self.key_attribute: {"S": key},
+                "digest": {"S": state.digest},
+                "published_at": {"N": repr(state.published_at)},
+            },
+        )
+
+
+class ChangeDetector:
+    """
+    Suppress results whose payload has not changed since it was last published.
+
+    Each payload is hashed and compared with the digest stored for its
+    result type. Unchanged results are skipped unless ``max_staleness``
+    seconds have passed since they were last published. New digests are only
+    stored by :meth:`commit`, after the results have been published, so a
+    failed publish is retried on the next run.
+
+    Parameters
+    ----------
+    store : ResultStateStore
+        Store holding the last published state of each result type.
+    max_staleness : float, optional
+        Republish unchanged results once this many seconds have passed since
+        they were last published. By default unchanged results are never
+        republished.
+    namespace : str, optional
+        Prefix added to result types to form state keys. Set this when
+        several tasks share one store.
+    logger : logging.Logger, optional
+        Logger used for structured logging.
+    clock : Callable[[], float], optional
+        Function returning the current Unix time.
+    """
+
+    def __init__(
+        self,
+        store: ResultStateStore,
+        *,
+        max_staleness: Optional[float] = None,
+        namespace: str = "",
+        logger: Optional[logging.Logger] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_staleness is not None and max_staleness < 0:
+            raise ValueError("max_staleness must be non-negative")
+        self.store = store
+        self.max_staleness = max_staleness
+        self.namespace = namespace
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.clock = clock
+        self._pending: dict[str, str] = {}
+
+    def digest(self, result_type: str, message: Any) -> str:
+        """
+        Return the content hash for a result payload.
+
+        Override this to ignore volatile fields such as timestamps.
+
+        Parameters
+        ----------
+        result_type : str
+            Result type of the payload.
+        message : Any
+            JSON-serializable payload.
+
+        Returns
+        -------
+        str
+            Hex digest of the canonical JSON form of the payload.
+        """
+        canonical = json.dumps(
+            message, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def should_publish(self, result_type: str, message: Any) -> bool:
+        """
+        Return whether a result must be published, remembering its digest.
+
+        Parameters
+        ----------
+        result_type : str
+            Result type of the payload.
+        message : Any
+            JSON-serializable payload.
+
+        Returns
+        -------
+        bool
+            ``True`` if the payload changed, was never published, or is
+            older than ``max_staleness``.
+        """
+        digest = self.digest(result_type, message)
+        state = self.store.get(self.namespace + result_type)
+        if state is not None and state.digest == digest:
+            age = self.clock() - state.published_at
+            if self.max_staleness is None or age < self.max_staleness:
+                self.logger.info(
+                    "sns_publish_skipped",
+                    extra={"result_type": result_type, "reason": "unchanged"},
+                )
+                return False
+        self._pending[result_type] = digest
+        return True
+
+    def filter(
+        self,
+        results: Mapping[str, Any]
+        | Iterable[tuple[str, Any]]
+        | AsyncIterator[tuple[str, Any]],
+    ) -> Any:
+        """
+        Drop unchanged results from a task's output.
+
+        Parameters
+        ----------
+        results : Mapping[str, Any] or Iterable[tuple[str, Any]] or AsyncIterator[tuple[str, Any]]
+            Task output, as a mapping or a (sync or async) iterable of
+            ``(result_type, payload)`` pairs.
+
+        Returns
+        -------
+        Any
+            Output of the same kind containing only results to publish.
+        """
+        if isinstance(results, Mapping):
+            return {
+                result_type: message
+                for result_type, message in results.items()
+                if self.should_publish(result_type, message)
+            }
+        if hasattr(results, "__aiter__"):
+            return self._filter_async(results)
+        return self._filter_iter(results)
+
+    def commit(self, *, exclude: Iterable[str] = ()) -> None:
+        """
+        Store digests for results that passed :meth:`filter` and were published.
+
+        Parameters
+        ----------
+        exclude : Iterable[str], optional
+            Result types that were not published and must keep their
+            previous state.
+        """
+        pending, self._pending = self._pending, {}
+        now = self.clock()
+        for result_type in set(pending) - set(exclude):
+            self.store.put(
+                self.namespace + result_type,
+                ResultState(digest=pending[result_type], published_at=now),
+            )
+
+    def discard(self) -> None:
+        """
+        Forget digests from :meth:`filter` without storing them.
+        """
+        self._pending = {}
+
+    def _filter_iter(
+        self, results: Iterable[tuple[str, Any]]
+    ) -> Iterator[tuple[str, Any]]:
+        iterator = iter(results)
+        seen: set[str] = set()
+        try:
+            for result_type, message in iterator:
+                _check_unique(result_type, seen)
+                if self.should_publish(result_type, message):
+                    yield result_type, message
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    async def _filter_async(
+        self, results: AsyncIterator[tuple[str, Any]]
+    ) -> AsyncIterator[tuple[str, Any]]:
+        seen: set[str] = set()
+        try:
+            async for result_type, message in results:
+                _check_unique(result_type, seen)
+                if self.should_publish(result_type, message):
+                    yield result_type, message
+        finally:
+            aclose = getattr(results, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+
+def _check_unique(result_type: str, seen: set[str]) -> None:
+    # Checked before filtering so an unchanged repeat still counts; the
+    # dispatcher only sees the results that pass the filter.
+    if result_type in seen:
+        raise ValueError(f"Duplicate result type '{result_type}'")
+    seen.add(result_type)
@@ -0,0 +1,149 @@
+import threading
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import boto3
+    from botocore.client import BaseClient
+    from botocore.config import Config
+
+# botocore's own default pool size; raised when a caller needs more
+# concurrent connections.
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+DEFAULT_RETRY_MODE = "adaptive"
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+
+_clients: dict[tuple[str, Optional[str], str, int], tuple[int, "BaseClient"]] = {}
+_clients_lock = threading.Lock()
+
+
+def client_config(
+    *,
+    max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+    retry_mode: str = DEFAULT_RETRY_MODE,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    tcp_keepalive: bool = True,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    read_timeout: float = DEFAULT_READ_TIMEOUT,
+) -> "Config":
+    """
+    Build the botocore configuration used for LambdaCron clients.
+
+    Parameters
+    ----------
+    max_pool_connections : int, optional
+        Maximum number of pooled HTTP connections per client.
+    retry_mode : str, optional
+        botocore retry mode. ``adaptive`` adds client-side rate limiting on
+        top of the ``standard`` retry behavior when AWS throttles requests.
+    max_attempts : int, optional
+        Maximum number of attempts per request, including the first.
+    tcp_keepalive : bool, optional
+        Enable TCP keepalive so idle pooled connections survive between warm
+        invocations.
+    connect_timeout : float, optional
+        Seconds to wait for a connection to open.
+    read_timeout : float, optional
+        Seconds to wait for a response.
+
+    Returns
+    -------
+    botocore.config.Config
+        Client configuration.
+    """
+    from botocore.config import Config
+
+    if max_pool_connections < 1:
+        raise ValueError("max_pool_connections must be at least 1")
+    return Config(
+        max_pool_connections=max_pool_connections,
+        # total_max_attempts counts the first attempt; botocore's
+        # max_attempts key counts only retries.
+        retries={"mode": retry_mode, "total_max_attempts": max_attempts},
+        tcp_keepalive=tcp_keepalive,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+    )
+
+
+def get_client(
+    service_name: str,
+    *,
+    max_concurrency: int = 1,
+    region_name: Optional[str] = None,
+    session: Optional["boto3.session.Session"] = None,
+    retry_mode: str = DEFAULT_RETRY_MODE,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> "BaseClient":
+    """
+    Return a shared, tuned client for an AWS service.
+
+    Clients from the default session are cached per service, region, and
+    retry settings, so tasks, handlers, and helpers in the same execution
+    environment share one connection pool. A cached client is replaced by a
+    larger one when a caller needs more concurrent connections than its pool
+    allows.
+
+    Parameters
+    ----------
+    service_name : str
+        AWS service name, such as ``"sns"`` or ``"ses"``.
+    max_concurrency : int, optional
+        Number of requests the caller may have in flight at once. The pool
+        holds at least this many connections.
+    region_name : str, optional
+        AWS region. Defaults to the region configured in the environment.
+    session : boto3.session.Session, optional
+        Session to create the client from. Clients from an explicit session
+        are tuned the same way but are not cached.
+    retry_mode : str, optional
+        botocore retry mode.
+    max_attempts : int, optional
+        Maximum number of attempts per request, including the first. Pass
+        ``1`` when the caller retries failed requests itself, so botocore's
+        backoff does not stack with the caller's.
+
+    Returns
+    -------
+    botocore.client.BaseClient
+        Client for the service.
+    """
+    pool_size = max(DEFAULT_MAX_POOL_CONNECTIONS, max_concurrency)
+    if session is not None:
+        return session.client(
+            service_name,
+            region_name=region_name,
+            config=client_config(
+                max_pool_connections=pool_size,
+                retry_mode=retry_mode,
+                max_attempts=max_attempts,
+            ),
+        )
+    key = (service_name, region_name, retry_mode, max_attempts)
+    with _clients_lock:
+        cached = _clients.get(key)
+        if cached is not None and cached[0] >= pool_size:
+            return cached[1]
+        import boto3
+
+        client = boto3.session.Session().client(
+            service_name,
+            region_name=region_name,
+            config=client_config(
+                max_pool_connections=pool_size,
+                retry_mode=retry_mode,
+                max_attempts=max_attempts,
+            ),
+        )
+        _clients[key] = (pool_size, client)
+        return client
+
+
+def clear_clients() -> None:
+    """
+    Drop all cached clients so the next :func:`get_client` call creates new
+    ones.
+    """
+    with _clients_lock:
+        _clients.clear()
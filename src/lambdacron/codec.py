@@ -0,0 +1,121 @@
+import functools
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+CODEC_ENV_VAR = "LAMBDACRON_JSON_CODEC"
+_AUTO_ORDER = ("orjson", "msgspec", "json")
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    """
+    JSON encoder/decoder pair used on the publish and notification paths.
+
+    Attributes
+    ----------
+    name : str
+        Backend name (``json``, ``orjson``, or ``msgspec``).
+    dumps : Callable[[Any], str]
+        Serialize an object to a JSON string.
+    loads : Callable[[str | bytes], Any]
+        Parse a JSON document.
+    decode_errors : tuple[type[Exception], ...]
+        Exception types raised by ``loads`` for malformed input.
+    """
+
+    name: str
+    dumps: Callable[[Any], str]
+    loads: Callable[[str | bytes], Any]
+    decode_errors: tuple[type[Exception], ...]
+
+
+def _stdlib_codec() -> JsonCodec:
+    return JsonCodec(
+        name="json",
+        dumps=json.dumps,
+        loads=json.loads,
+        decode_errors=(json.JSONDecodeError,),
+    )
+
+
+def _orjson_codec() -> JsonCodec:
+    import orjson
+
+    return JsonCodec(
+        name="orjson",
+        dumps=lambda obj: orjson.dumps(obj).decode("utf-8"),
+        loads=orjson.loads,
+        decode_errors=(orjson.JSONDecodeError,),
+    )
+
+
+def _msgspec_codec() -> JsonCodec:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+    return JsonCodec(
+        name="msgspec",
+        dumps=lambda obj: encoder.encode(obj).decode("utf-8"),
+        loads=decoder.decode,
+        decode_errors=(msgspec.DecodeError,),
+    )
+
+
+_BACKENDS = {
+    "json": _stdlib_codec,
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _load_codec(name: str) -> JsonCodec:
+    if name == "auto":
+        for candidate in _AUTO_ORDER:
+            try:
+                return _BACKENDS[candidate]()
+            except ImportError:
+                continue
+    if name not in _BACKENDS:
+        raise ValueError(
+            f"Unknown JSON codec '{name}' (expected one of: auto, "
+            + ", ".join(_BACKENDS)
+            + ")"
+        )
+    return _BACKENDS[name]()
+
+
+def get_json_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Return a JSON codec by backend name.
+
+    The stdlib ``json`` module is the default. ``orjson`` and ``msgspec`` are
+    optional, faster backends; note that they emit compact JSON without the
+    spaces ``json.dumps`` adds and only accept string keys. ``auto`` picks the
+    fastest installed backend.
+
+    Parameters
+    ----------
+    name : str, optional
+        Backend name: ``json``, ``orjson``, ``msgspec``, or ``auto``.
+        Defaults to the ``LAMBDACRON_JSON_CODEC`` environment variable, or
+        ``json`` if it is unset.
+
+    Returns
+    -------
+    JsonCodec
+        Codec for the requested backend.
+
+    Raises
+    ------
+    ValueError
+        If the backend name is unknown.
+    ImportError
+        If an explicitly requested backend is not installed.
+    """
+    if name is None:
+        name = os.environ.get(CODEC_ENV_VAR) or "json"
+    return _load_codec(name.strip().lower())
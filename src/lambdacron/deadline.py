@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised by :meth:`Deadline.check` once a deadline has passed.
+    """
+
+
+class Deadline:
+    """
+    Cancellation token tied to a point in time.
+
+    Scheduled tasks receive one as ``self.deadline`` and can poll
+    :attr:`expired` or call :meth:`check` between units of work to stop
+    early and leave time for their results to be published.
+
+    Parameters
+    ----------
+    expires_at : float, optional
+        Clock reading at which the deadline passes. ``None`` means the
+        deadline never passes on its own (it can still be cancelled).
+    clock : Callable[[], float], optional
+        Monotonic clock returning seconds.
+    """
+
+    def __init__(
+        self,
+        expires_at: Optional[float] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.expires_at = expires_at
+        self.clock = clock
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def from_context(
+        cls,
+        context: Any,
+        *,
+        reserve: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> "Deadline":
+        """
+        Build a deadline from a Lambda context's remaining time.
+
+        Parameters
+        ----------
+        context : Any
+            Lambda context object. If it has no
+            ``get_remaining_time_in_millis`` method, the deadline never
+            passes.
+        reserve : float, optional
+            Seconds before the invocation times out at which the deadline
+            passes.
+        clock : Callable[[], float], optional
+            Monotonic clock returning seconds.
+
+        Returns
+        -------
+        Deadline
+            Deadline for the current invocation.
+        """
+        get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+        if get_remaining is None:
+            return cls(clock=clock)
+        return cls(clock() + get_remaining() / 1000 - reserve, clock=clock)
+
+    def remaining(self) -> Optional[float]:
+        """
+        Return the seconds left before the deadline.
+
+        Returns
+        -------
+        float or None
+            Seconds left (zero once expired), or ``None`` if the deadline
+            has no expiry time and has not been cancelled.
+        """
+        if self._cancelled.is_set():
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self.clock())
+
+    @property
+    def expired(self) -> bool:
+        """
+        Whether the deadline has passed or been cancelled.
+        """
+        return self.remaining() == 0.0
+
+    def cancel(self) -> None:
+        """
+        Expire the deadline immediately.
+        """
+        self._cancelled.set()
+
+    def check(self) -> None:
+        """
+        Raise if the deadline has passed.
+
+        Raises
+        ------
+        DeadlineExceeded
+            If the deadline has passed or been cancelled.
+        """
+        if self.expired:
+            raise DeadlineExceeded("deadline exceeded")
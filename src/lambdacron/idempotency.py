@@ -0,0 +1,457 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional
+
+from lambdacron.clients import get_client
+
+IDEMPOTENCY_TABLE_ENV_VAR = "LAMBDACRON_IDEMPOTENCY_TABLE"
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+KEY_SOURCES = ("message_id", "content")
+
+
+class IdempotencyStore(ABC):
+    """
+    Base class for persisting which notifications have been delivered.
+
+    Entries have a status (:data:`IN_PROGRESS` or :data:`COMPLETED`) and an
+    expiry time, after which they no longer count.
+    """
+
+    @abstractmethod
+    def claim(self, key: str, *, expires_at: float, now: float) -> Optional[str]:
+        """
+        Mark a key as in progress unless it has an unexpired entry.
+
+        The check and the write are a single conditional write, so only one
+        of several concurrent claims succeeds.
+
+        Parameters
+        ----------
+        key : str
+            Idempotency key of a notification.
+        expires_at : float
+            Unix time at which the in-progress entry lapses, so a handler
+            that crashed mid-delivery does not block retries forever.
+        now : float
+            Current Unix time. Entries expiring at or before it are replaced.
+
+        Returns
+        -------
+        str or None
+            ``None`` if the key was claimed, otherwise the status of the
+            existing entry.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, key: str, *, expires_at: float) -> None:
+        """
+        Mark a key as delivered.
+
+        Parameters
+        ----------
+        key : str
+            Idempotency key of a notification.
+        expires_at : float
+            Unix time until which redeliveries are skipped.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def release(self, key: str) -> None:
+        """
+        Remove an in-progress entry so the notification can be retried.
+
+        Parameters
+        ----------
+        key : str
+            Idempotency key of a notification.
+        """
+        raise NotImplementedError
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """
+    Store idempotency entries in a SQLite database.
+
+    Useful for development and tests. In Lambda, a database file only
+    survives while the execution environment stays warm and is not shared
+    between concurrent executions.
+
+    Parameters
+    ----------
+    path : pathlib.Path or str, optional
+        Database file, created if missing. Defaults to an in-memory
+        database.
+    """
+
+    def __init__(self, path: Path | str = ":memory:") -> None:
+        import sqlite3
+
+        self.path = path
+        self._connection = sqlite3.connect(
+            str(path), isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS idempotency ("
+            "key TEXT PRIMARY KEY, status TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def claim(self, key: str, *, expires_at: float, now: float) -> Optional[str]:
+        """
+        Mark a key as in progress unless it has an unexpired entry.
+
+        Parameters
+        ----------
+        key : str
+            Idempotency key of a notification.
+        expires_at : float
+            Unix time at which the in-progress entry lapses.
+        now : float
+            Current Unix time.
+
+        Returns
+        -------
+        str or None
+            ``None`` if the key was claimed, otherwise the status of the
+            existing entry.
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT INTO idempotency (key, status, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET status = excluded.status, "
+                "expires_at = excluded.expires_at WHERE idempotency.expires_at <= ?",
+                (key, IN_PROGRESS, expires_at, now),
+            )
+            if cursor.rowcount:
+                return None
+            row = self._connection.execute(
+                "SELECT status FROM idempotency WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else IN_PROGRESS
+
+    def complete(self, key: str, *, expires_at: float) -> None:
+        """
+        Mark a key as delivered.
+
+        Parameters
+        ----------
+        key : str
+            Idempotency key of a notification.
+        expires_at : float
+            Unix time until which redeliveries are skipped.
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO idempotency (key, status, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, COMPLETED, expires_at),
+            )
+
+    def release(self, key: str) -> None:
+        """
+        Remove an in-progress entry so the notification can be retried.
+
+        Parameters
+        ----------
+        key : str
+            Idempotency key of a notification.
+        """
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM idempotency WHERE key = ? AND status = ?",
+                (key, IN_PROGRESS),
+            )
+
+
+class DynamoDBIdempotencyStore(IdempotencyStore):
+    """
+    Store idempotency entries in a DynamoDB table.
+
+    The table must have a string partition key named ``key_attribute``.
+    Enable DynamoDB time to live on the ``expires_at`` attribute to have
+    expired entries deleted.
+
+    Parameters
+    ----------
+    table_name : str
+        DynamoDB table name.
+    key_attribute : str, optional
+        Name of the table's partition key.
+    dynamodb_client : botocore.client.BaseClient, optional
+        DynamoDB client. Defaults to the shared client from
+        :func:`lambdacron.clients.get_client`, created on first use.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        *,
+        key_attribute: str = "idempotency_key",
+        dynamodb_client: Optional[Any] = None,
+    ) -> None:
+        self.table_name = table_name
+        self.key_attribute = key_attribute
+        self._dynamodb_client = dynamodb_client
+        self._dynamodb_client_lock = threading.Lock()
+
+    @property
+    def dynamodb_client(self) -> Any:
+        """
+        DynamoDB client for the idempotency table, created on first access.
+        """
+        with self._dynamodb_client_lock:
+            if self._dynamodb_client is None:
+                self._dynamodb_client = get_client("dynamodb")
+            return self._dynamodb_client
+
+    def claim(self, key: str, *, expires_at: float, now: float) -> Optional[str]:
+        """
+        Mark a key as in progress unless it has an unexpired entry.
+
+        Parameters
+        ----------
+        key : str
+            Idempotency key of a notification.
+        expires_at : float
+            Unix time at which the in-progress entry lapses.
+        now : float
+            Current Unix time.
+
+        Returns
+        -------
+        str or None
+            ``None`` if the key was claimed, otherwise the status of the
+            existing entry.
+        """
+        from botocore.exceptions import ClientError
+
+        try:
+            self.dynamodb_client.put_item(
+                TableName=self.table_name,
+                Item=self._item(key, IN_PROGRESS, expires_at),
+                ConditionExpression="attribute_not_exists(#key) OR #expires_at <= :now",
+                ExpressionAttributeNames={
+                    "#key": self.key_attribute,
+                    "#expires_at": "expires_at",
+                },
+                ExpressionAttributeValues={":now": {"N": repr(now)}},
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            )
+        except ClientError as exc:
+            if not _condition_failed(exc):
+                raise
+            item = exc.response.get("Item") or {}
+            return item.get("status", {}).get("S", IN_PROGRESS)
+        return None
+
+    def complete(self, key: str, *, expires_at: float) -> None:
+        """
+        Mark a key as delivered.
+
+        Parameters
+        ----------
+        key : str
+            Idempotency key of a notification.
+        expires_at : float
+            Unix time until which redeliveries are skipped.
+        """
+        self.dynamodb_client.put_item(
+            TableName=self.table_name, Item=self._item(key, COMPLETED, expires_at)
+        )
+
+    def release(self, key: str) -> None:
+        """
+        Remove an in-progress entry so the notification can be retried.
+
+        Parameters
+        ----------
+        key : str
+            Idempotency key of a notification.
+        """
+        from botocore.exceptions import ClientError
+
+        try:
+            self.dynamodb_client.delete_item(
+                TableName=self.table_name,
+                Key={self.key_attribute: {"S": key}},
+                ConditionExpression="#status = :in_progress",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={":in_progress": {"S": IN_PROGRESS}},
+            )
+        except ClientError as exc:
+            if not _condition_failed(exc):
+                raise
+
+    def _item(self, key: str, status: str, expires_at: float) -> dict[str, Any]:
+        # DynamoDB time to live reads whole epoch seconds.
+        return {
+            self.key_attribute: {"S": key},
+            "status": {"S": status},
+            "expires_at": {"N": str(math.ceil(expires_at))},
+        }
+
+
+class IdempotencyLedger:
+    """
+    Remember delivered notifications so redelivered records are not sent
+    twice.
+
+    Before a record is delivered, its key is claimed with a conditional
+    write. Records whose key was already delivered within ``ttl`` seconds
+    are skipped and reported as succeeded. Records claimed by another
+    execution that is still delivering them are returned to the queue. After
+    delivery, keys of delivered records are marked completed and keys of
+    failed records are released so retries deliver them.
+
+    Parameters
+    ----------
+    store : IdempotencyStore
+        Store holding the ledger entries.
+    ttl : float, optional
+        Seconds a delivered key is remembered.
+    lease : float, optional
+        Seconds a claim blocks other deliveries of the same key. A handler
+        that dies mid-delivery holds its claims until the lease lapses, so
+        keep this above the Lambda timeout.
+    key_source : str, optional
+        ``"message_id"`` to key on the SQS message ID, which catches SQS
+        redeliveries, or ``"content"`` to key on a hash of the rendered
+        templates, which also catches the same result published twice.
+    namespace : str, optional
+        Prefix added to keys. Set this when several handlers share one
+        store.
+    logger : logging.Logger, optional
+        Logger used for structured logging.
+    clock : Callable[[], float], optional
+        Function returning the current Unix time.
+    """
+
+    def __init__(
+        self,
+        store: IdempotencyStore,
+        *,
+        ttl: float = 24 * 3600,
+        lease: float = 900.0,
+        key_source: str = "message_id",
+        namespace: str = "",
+        logger: Optional[logging.Logger] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if ttl <= 0 or lease <= 0:
+            raise ValueError("ttl and lease must be positive")
+        if key_source not in KEY_SOURCES:
+            raise ValueError(
+                f"Unsupported key_source '{key_source}'; expected one of {KEY_SOURCES}"
+            )
+        self.store = store
+        self.ttl = ttl
+        self.lease = lease
+        self.key_source = key_source
+        self.namespace = namespace
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.clock = clock
+
+    def key(self, record: Mapping[str, Any], rendered: Mapping[str, str]) -> str:
+        """
+        Return the idempotency key for a rendered record.
+
+        Records without a message ID are keyed on their content.
+
+        Parameters
+        ----------
+        record : Mapping[str, Any]
+            SQS record.
+        rendered : Mapping[str, str]
+            Rendered template output keyed by template name.
+
+        Returns
+        -------
+        str
+            Idempotency key.
+        """
+        message_id = record.get("messageId")
+        if self.key_source == "message_id" and message_id:
+            return f"{self.namespace}message:{message_id}"
+        canonical = json.dumps(rendered, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return f"{self.namespace}content:{digest}"
+
+    def claim(self, key: str) -> Optional[str]:
+        """
+        Claim a key before delivering its notification.
+
+        Parameters
+        ----------
+        key : str
+            Idempotency key.
+
+        Returns
+        -------
+        str or None
+            ``None`` if the notification should be delivered, otherwise the
+            status of the existing entry: :data:`COMPLETED` if it was
+            already delivered, or :data:`IN_PROGRESS` if another execution
+            is delivering it.
+        """
+        now = self.clock()
+        return self.store.claim(key, expires_at=now + self.lease, now=now)
+
+    def complete(self, key: str) -> None:
+        """
+        Record that a claimed notification was delivered.
+
+        Parameters
+        ----------
+        key : str
+            Idempotency key.
+        """
+        self.store.complete(key, expires_at=self.clock() + self.ttl)
+
+    def release(self, key: str) -> None:
+        """
+        Drop the claim of a notification that failed to deliver.
+
+        Parameters
+        ----------
+        key : str
+            Idempotency key.
+        """
+        self.store.release(key)
+
+
+def load_idempotency_ledger(
+    *, env_var: str = IDEMPOTENCY_TABLE_ENV_VAR
+) -> Optional[IdempotencyLedger]:
+    """
+    Build an idempotency ledger from the environment.
+
+    Parameters
+    ----------
+    env_var : str, optional
+        Environment variable naming the DynamoDB table of the ledger.
+
+    Returns
+    -------
+    IdempotencyLedger or None
+        A ledger keyed on SQS message IDs and backed by the table, or
+        ``None`` if the environment variable is unset.
+    """
+    table_name = os.environ.get(env_var)
+    if not table_name:
+        return None
+    return IdempotencyLedger(DynamoDBIdempotencyStore(table_name))
+
+
+def _condition_failed(exc: Any) -> bool:
+    code = exc.response.get("Error", {}).get("Code")
+    return code == "ConditionalCheckFailedException"
@@ -1,11 +1,98 @@
-import json
+import asyncio
+import contextlib
+import functools
+import inspect
 import logging
 import os
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Mapping, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+)
 
-import boto3
-from botocore.client import BaseClient
+from lambdacron.change_detection import ChangeDetector
+from lambdacron.clients import get_client
+from lambdacron.codec import JsonCodec, get_json_codec
+from lambdacron.deadline import Deadline, DeadlineExceeded
+from lambdacron.metrics import MetricsRecorder, load_metrics
+from lambdacron.tracing import Tracer, load_tracer
+from lambdacron.transport import PayloadTransport, load_payload_transport
+
+if TYPE_CHECKING:
+    import boto3
+    from botocore.client import BaseClient
+
+SNS_PUBLISH_BATCH_MAX_ENTRIES = 10
+SNS_PUBLISH_BATCH_MAX_BYTES = 256 * 1024
+_PUBLISH_BATCH_RETRY_DELAY = 0.1
+_ASYNC_QUEUE_POLL_INTERVAL = 0.005
+# Publishing stops this many seconds before the invocation times out, so a
+# call started just before the cutoff can still complete.
+_DISPATCH_CUTOFF_MARGIN = 0.5
+_END_OF_RESULTS = object()
+
+
+class BatchPublishError(RuntimeError):
+    """
+    Raised when SNS ``PublishBatch`` entries still fail after retrying.
+
+    Parameters
+    ----------
+    failures : Mapping[str, Mapping[str, Any]]
+        Failed ``PublishBatch`` response entries keyed by result type.
+
+    Attributes
+    ----------
+    failures : dict[str, dict[str, Any]]
+        Failed ``PublishBatch`` response entries keyed by result type.
+    """
+
+    def __init__(self, failures: Mapping[str, Mapping[str, Any]]) -> None:
+        self.failures = {key: dict(value) for key, value in failures.items()}
+        super().__init__(
+            "Failed to publish result types: " + ", ".join(sorted(self.failures))
+        )
+
+
+@dataclass(frozen=True)
+class DispatchStats:
+    """
+    Timing summary for a single :func:`dispatch_sns_messages` call.
+
+    Attributes
+    ----------
+    duration : float
+        Wall-clock seconds spent building and publishing all results.
+    slowest_publish : float
+        Seconds taken by the slowest single ``Publish`` or ``PublishBatch``
+        call.
+    publish_calls : int
+        Number of SNS API calls made, including retries.
+    result_count : int
+        Number of result types dispatched.
+    dropped : tuple[str, ...]
+        Result types that were not published because the dispatch deadline
+        passed.
+    """
+
+    duration: float
+    slowest_publish: float
+    publish_calls: int
+    result_count: int
+    dropped: tuple[str, ...]
 
 
 class CronLambdaTask(ABC):
@@ -18,17 +105,72 @@ class CronLambdaTask(ABC):
         SNS topic ARN used for all published results. Defaults to loading from
         the ``SNS_TOPIC_ARN`` environment variable.
     sns_client : botocore.client.BaseClient, optional
-        Preconfigured SNS client. If omitted, a client is created from the
-        provided session.
+        Preconfigured SNS client. If omitted, a tuned client from
+        :func:`lambdacron.clients.get_client` (created from ``session`` if
+        given) is used, with a connection pool sized for ``max_in_flight``.
+        It is created the first time results are published, so ``boto3`` is
+        not imported while the Lambda module loads.
     session : boto3.session.Session, optional
         Session used to create the SNS client when one is not provided.
     logger : logging.Logger, optional
         Logger used for structured logging. Defaults to a class-named logger.
+    batch_publish : bool, optional
+        Publish results with SNS ``PublishBatch`` (up to 10 results per call)
+        instead of one ``Publish`` call per result type.
+    max_in_flight : int, optional
+        Maximum number of concurrent SNS calls used when dispatching results.
+        Defaults to 1 (publish serially).
+    json_codec : JsonCodec, optional
+        Codec used to serialize result payloads. Defaults to the backend
+        selected by :func:`lambdacron.codec.get_json_codec`.
+    payload_transport : PayloadTransport, optional
+        Transport used to compress large results and offload the largest to
+        S3. Defaults to :func:`lambdacron.transport.load_payload_transport`,
+        which is ``None`` (publish inline) unless
+        ``LAMBDACRON_PAYLOAD_BUCKET`` is set.
+    dispatch_reserve : float, optional
+        Seconds of the invocation's remaining time reserved for publishing.
+        :attr:`deadline` expires this long before the Lambda times out.
+    change_detector : ChangeDetector, optional
+        If set, results whose payload is unchanged since they were last
+        published are not published again (until the detector's
+        ``max_staleness`` passes).
+    metrics : MetricsRecorder, optional
+        Recorder for per-invocation CloudWatch metrics. Defaults to
+        :func:`lambdacron.metrics.load_metrics`, which records nothing unless
+        ``LAMBDACRON_METRICS_NAMESPACE`` is set.
+    tracer : Tracer, optional
+        Hooks wrapped around the invocation and its ``perform``,
+        ``build_payload`` and ``publish`` stages. Defaults to
+        :func:`lambdacron.tracing.load_tracer`, which does nothing unless
+        ``LAMBDACRON_TRACER`` is set.
 
     Attributes
     ----------
     sns_topic_arn : str
         SNS topic ARN used for all published results.
+    batch_publish : bool
+        Whether results are published with SNS ``PublishBatch``.
+    max_in_flight : int
+        Maximum number of concurrent SNS calls used when dispatching results.
+    json_codec : JsonCodec
+        Codec used to serialize result payloads.
+    payload_transport : PayloadTransport or None
+        Transport used for large result payloads.
+    deadline : Deadline
+        Cancellation token for the current invocation. ``_perform_task``
+        should poll ``deadline.expired`` or call ``deadline.check()`` and
+        stop early once it passes. Results a generator task has already
+        yielded are still published, and no further results are requested
+        from it. The deadline never expires when the Lambda context does not
+        report its remaining time.
+    change_detector : ChangeDetector or None
+        Detector used to suppress unchanged results.
+    metrics : MetricsRecorder
+        Recorder for task duration, publish latency per result type, result
+        counts and failures. Flushed once at the end of each invocation.
+    tracer : Tracer
+        Hooks wrapped around each stage of an invocation.
 
     """
 
@@ -36,18 +178,57 @@ class CronLambdaTask(ABC):
         self,
         *,
         sns_topic_arn: Optional[str] = None,
-        sns_client: Optional[BaseClient] = None,
-        session: Optional[boto3.session.Session] = None,
+        sns_client: Optional["BaseClient"] = None,
+        session: Optional["boto3.session.Session"] = None,
         logger: Optional[logging.Logger] = None,
+        batch_publish: bool = False,
+        max_in_flight: int = 1,
+        json_codec: Optional[JsonCodec] = None,
+        payload_transport: Optional[PayloadTransport] = None,
+        dispatch_reserve: float = 5.0,
+        change_detector: Optional[ChangeDetector] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        tracer: Optional[Tracer] = None,
     ) -> None:
+        if dispatch_reserve < 0:
+            raise ValueError("dispatch_reserve must be non-negative")
         if sns_topic_arn is None:
             sns_topic_arn = load_sns_topic_arn()
         self.sns_topic_arn = sns_topic_arn
-        if sns_client is None:
-            session = session or boto3.session.Session()
-            sns_client = session.client("sns")
-        self.sns_client = sns_client
+        self._sns_client = sns_client
+        self._session = session
+        self._sns_client_lock = threading.Lock()
         self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.batch_publish = batch_publish
+        self.max_in_flight = max_in_flight
+        self.json_codec = json_codec or get_json_codec()
+        if payload_transport is None:
+            payload_transport = load_payload_transport()
+        self.payload_transport = payload_transport
+        self.dispatch_reserve = dispatch_reserve
+        self.change_detector = change_detector
+        if metrics is None:
+            metrics = load_metrics(dimensions={"Task": self.__class__.__name__})
+        self.metrics = metrics
+        self.tracer = tracer or load_tracer()
+        self.deadline = Deadline()
+        self._dispatch_deadline = Deadline()
+
+    @property
+    def sns_client(self) -> "BaseClient":
+        """
+        SNS client used to publish results, created on first access.
+        """
+        with self._sns_client_lock:
+            if self._sns_client is None:
+                self._sns_client = get_client(
+                    "sns", max_concurrency=self.max_in_flight, session=self._session
+                )
+            return self._sns_client
+
+    @sns_client.setter
+    def sns_client(self, sns_client: "BaseClient") -> None:
+        self._sns_client = sns_client
 
     def lambda_handler(self, event: Any, context: Any) -> None:
         """
@@ -61,25 +242,321 @@ class CronLambdaTask(ABC):
         context : Any
             Lambda context object.
         """
+        self._log_invocation(event, context)
+        self._start_deadline(context)
+        with (
+            self._recording_metrics(),
+            self._tracing(),
+            contextlib.ExitStack() as perform,
+        ):
+            # Streamed results are computed while they are published, so the
+            # perform span stays open until the stream is exhausted.
+            perform.enter_context(self.tracer.span("perform"))
+            try:
+                result = self._perform_task(event, context)
+            except DeadlineExceeded:
+                self._log_deadline_exceeded(0)
+                result = {}
+            if inspect.isasyncgen(result):
+                result = iterate_async_results(result)
+            if isinstance(result, Mapping):
+                perform.close()
+            else:
+                result = _closing_after(self._until_deadline(result), perform)
+            if self.change_detector is not None:
+                result = self.change_detector.filter(result)
+            try:
+                stats = dispatch_sns_messages(result=result, **self._dispatch_options())
+            except BaseException as exc:
+                self._commit_changes_after_error(exc)
+                raise
+            self._commit_changes(stats)
+            self._record_dispatch(stats)
+
+    @abstractmethod
+    def _perform_task(
+        self, event: Any, context: Any
+    ) -> dict[str, Any] | Iterator[tuple[str, Any]] | AsyncIterator[tuple[str, Any]]:
+        """
+        This should return a dictionary where each key corresponds to a
+        result type, and the value is the message to be sent to SNS as a
+        JSON serializable object.
+
+        Alternatively, this can be a generator (or async generator) that
+        yields ``(result_type, message)`` pairs. Each result is published as
+        soon as it is yielded, while the task keeps computing the next one,
+        so earlier notifications go out sooner and only in-flight results
+        are held in memory.
+
+        Parameters
+        ----------
+        event : Any
+            Event payload passed to the Lambda.
+        context : Any
+            Lambda context object.
+
+        Returns
+        -------
+        dict[str, Any] or Iterator[tuple[str, Any]] or AsyncIterator[tuple[str, Any]]
+            Mapping of result types to JSON-serializable payloads, or an
+            iterator of ``(result_type, payload)`` pairs.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def _start_deadline(self, context: Any) -> None:
+        self.deadline = Deadline.from_context(context, reserve=self.dispatch_reserve)
+        self._dispatch_deadline = Deadline.from_context(
+            context, reserve=_DISPATCH_CUTOFF_MARGIN
+        )
+
+    def _until_deadline(
+        self, results: Iterable[tuple[str, Any]]
+    ) -> Iterator[tuple[str, Any]]:
+        iterator = iter(results)
+        produced = 0
+        try:
+            while not self.deadline.expired:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                except DeadlineExceeded:
+                    break
+                produced += 1
+                yield item
+            self._log_deadline_exceeded(produced)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    @contextlib.contextmanager
+    def _recording_metrics(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        except BatchPublishError as exc:
+            for result_type in exc.failures:
+                self.metrics.put(
+                    "PublishFailures", 1, dimensions={"ResultType": result_type}
+                )
+            raise
+        except Exception:
+            self.metrics.put("TaskFailures", 1)
+            raise
+        finally:
+            self.metrics.put(
+                "TaskDuration", (time.perf_counter() - start) * 1000, "Milliseconds"
+            )
+            self.metrics.flush()
+
+    def _tracing(self) -> ContextManager[Any]:
+        return self.tracer.invocation(self.__class__.__name__)
+
+    def _commit_changes(self, stats: DispatchStats) -> None:
+        if self.change_detector is not None:
+            self.change_detector.commit(exclude=stats.dropped)
+
+    def _commit_changes_after_error(self, exc: BaseException) -> None:
+        if self.change_detector is None:
+            return
+        if isinstance(exc, BatchPublishError):
+            # Everything except the failed entries reached SNS.
+            self.change_detector.commit(exclude=exc.failures)
+        else:
+            self.change_detector.discard()
+
+    def _log_deadline_exceeded(self, produced: int) -> None:
+        self.logger.warning(
+            "task_deadline_exceeded",
+            extra={
+                "results_produced": produced,
+                "dispatch_reserve": self.dispatch_reserve,
+            },
+        )
+
+    def _log_invocation(self, event: Any, context: Any) -> None:
         self.logger.info(
             "lambda_invocation",
             extra={"event": event, "context": extract_context_metadata(context)},
         )
 
-        result = self._perform_task(event, context)
-        dispatch_sns_messages(
-            result=result,
-            sns_topic_arn=self.sns_topic_arn,
-            sns_client=self.sns_client,
-            logger=self.logger,
+    def _dispatch_options(self) -> dict[str, Any]:
+        return {
+            "sns_topic_arn": self.sns_topic_arn,
+            "sns_client": self.sns_client,
+            "logger": self.logger,
+            "batch": self.batch_publish,
+            "max_in_flight": self.max_in_flight,
+            "json_codec": self.json_codec,
+            "payload_transport": self.payload_transport,
+            "deadline": self._dispatch_deadline,
+            "metrics": self.metrics,
+            "tracer": self.tracer,
+        }
+
+    def _record_dispatch(self, stats: DispatchStats) -> None:
+        self.metrics.put("ResultCount", stats.result_count)
+        self.metrics.put("DroppedResults", len(stats.dropped))
+        self.metrics.put("PublishCalls", stats.publish_calls)
+        self.metrics.put("DispatchDuration", stats.duration * 1000, "Milliseconds")
+        self.logger.info(
+            "sns_dispatch",
+            extra={
+                "result_count": stats.result_count,
+                "dropped_count": len(stats.dropped),
+                "publish_calls": stats.publish_calls,
+                "dispatch_ms": round(stats.duration * 1000, 3),
+                "slowest_publish_ms": round(stats.slowest_publish * 1000, 3),
+            },
         )
 
+
+class AsyncCronLambdaTask(CronLambdaTask):
+    """
+    Base class for scheduled Lambda tasks with an asynchronous ``_perform_task``.
+
+    ``lambda_handler`` runs :meth:`handle` on an event loop owned by the task.
+    The loop is kept open between warm invocations, so loop-bound resources
+    created by the task (for example HTTP client sessions) stay usable on
+    the next invocation. SNS calls are made with the synchronous client on
+    worker threads, so they do not block the loop.
+
+    Parameters are the same as for :class:`CronLambdaTask`.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def lambda_handler(self, event: Any, context: Any) -> None:
+        """
+        Synchronous entry point for the Lambda function.
+
+        Parameters
+        ----------
+        event : Any
+            Event payload passed to the Lambda.
+        context : Any
+            Lambda context object.
+
+        Raises
+        ------
+        RuntimeError
+            If called while an event loop is already running in this thread;
+            await :meth:`handle` instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "lambda_handler cannot run inside a running event loop; "
+                "await handle() instead"
+            )
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self.handle(event, context))
+
+    async def handle(self, event: Any, context: Any) -> None:
+        """
+        Run the task and publish its results.
+
+        Parameters
+        ----------
+        event : Any
+            Event payload passed to the Lambda.
+        context : Any
+            Lambda context object.
+        """
+        self._log_invocation(event, context)
+        self._start_deadline(context)
+        with (
+            self._recording_metrics(),
+            self._tracing(),
+            contextlib.ExitStack() as perform,
+        ):
+            perform.enter_context(self.tracer.span("perform"))
+            result = self._perform_task(event, context)
+            if inspect.isawaitable(result):
+                try:
+                    result = await asyncio.wait_for(
+                        result, timeout=self.deadline.remaining()
+                    )
+                except TimeoutError:
+                    if not self.deadline.expired:
+                        raise
+                    self._log_deadline_exceeded(0)
+                    result = {}
+            elif hasattr(result, "__aiter__"):
+                result = self._until_deadline_async(result)
+            if isinstance(result, Mapping):
+                perform.close()
+            elif hasattr(result, "__aiter__"):
+                result = _aclosing_after(result, perform)
+            else:
+                result = _closing_after(result, perform)
+            if self.change_detector is not None:
+                result = self.change_detector.filter(result)
+            try:
+                stats = await dispatch_sns_messages_async(
+                    result=result, **self._dispatch_options()
+                )
+            except BaseException as exc:
+                self._commit_changes_after_error(exc)
+                raise
+            self._commit_changes(stats)
+            self._record_dispatch(stats)
+
+    async def _until_deadline_async(
+        self, results: AsyncIterator[tuple[str, Any]]
+    ) -> AsyncIterator[tuple[str, Any]]:
+        produced = 0
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(
+                        anext(results), timeout=self.deadline.remaining()
+                    )
+                except StopAsyncIteration:
+                    return
+                except TimeoutError:
+                    if not self.deadline.expired:
+                        raise
+                    break
+                produced += 1
+                yield item
+            self._log_deadline_exceeded(produced)
+        finally:
+            aclose = getattr(results, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    def close(self) -> None:
+        """
+        Shut down and close the task's event loop.
+
+        A new loop is created if the task is invoked again.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
     @abstractmethod
-    def _perform_task(self, event: Any, context: Any) -> dict[str, Any]:
+    async def _perform_task(
+        self, event: Any, context: Any
+    ) -> dict[str, Any] | AsyncIterator[tuple[str, Any]]:
         """
-        This should return a dictionary where each key corresponds to a
-        result type, and the value is the message to be sent to SNS as a
-        JSON serializable object.
+        Produce the task results asynchronously.
+
+        This can be a coroutine returning a mapping of result types to
+        JSON-serializable payloads, or an async generator yielding
+        ``(result_type, message)`` pairs that are published as they arrive.
 
         Parameters
         ----------
@@ -90,8 +567,9 @@ class CronLambdaTask(ABC):
 
         Returns
         -------
-        dict[str, Any]
-            Mapping of result types to JSON-serializable payloads.
+        dict[str, Any] or AsyncIterator[tuple[str, Any]]
+            Mapping of result types to JSON-serializable payloads, or an
+            async iterator of ``(result_type, payload)`` pairs.
         """
         raise NotImplementedError("Subclasses must implement this method.")
 
@@ -198,42 +676,784 @@ def build_result_message_payload(*, result_type: str, message: Any) -> dict[str,
     return payload
 
 
+def build_sns_publish_entry(
+    *,
+    result_type: str,
+    message: Any,
+    json_codec: Optional[JsonCodec] = None,
+    payload_transport: Optional[PayloadTransport] = None,
+) -> dict[str, Any]:
+    """
+    Build the SNS publish parameters for a single result type.
+
+    The returned mapping holds the message-level fields shared by ``Publish``
+    and ``PublishBatch`` entries; callers add ``TopicArn`` or ``Id``.
+
+    Parameters
+    ----------
+    result_type : str
+        Result type key from the task output mapping.
+    message : Any
+        JSON-serializable payload associated with the result type.
+    json_codec : JsonCodec, optional
+        Codec used to serialize the message. Defaults to the backend selected
+        by :func:`lambdacron.codec.get_json_codec`.
+    payload_transport : PayloadTransport, optional
+        Transport used to compress or offload large messages. Without one,
+        the serialized payload is published inline.
+
+    Returns
+    -------
+    dict[str, Any]
+        Message, subject, attributes, and message group for the result.
+    """
+    payload = build_result_message_payload(result_type=result_type, message=message)
+    codec = json_codec or get_json_codec()
+    body = codec.dumps(payload)
+    if payload_transport is not None:
+        body = payload_transport.encode(body, result_type=result_type)
+    return {
+        "Message": body,
+        "Subject": f"Notification for {result_type}",
+        "MessageAttributes": {
+            "result_type": {
+                "DataType": "String",
+                "StringValue": result_type,
+            }
+        },
+        "MessageGroupId": load_sns_message_group_id(),
+    }
+
+
+def estimate_sns_entry_size(entry: Mapping[str, Any]) -> int:
+    """
+    Estimate the size SNS counts against its message size limit.
+
+    Parameters
+    ----------
+    entry : Mapping[str, Any]
+        Publish parameters as returned by :func:`build_sns_publish_entry`.
+
+    Returns
+    -------
+    int
+        Size in bytes of the message body, subject, and message attributes.
+    """
+    size = len(entry["Message"].encode("utf-8"))
+    size += len(entry.get("Subject", "").encode("utf-8"))
+    for name, attribute in entry.get("MessageAttributes", {}).items():
+        size += len(name.encode("utf-8"))
+        size += len(attribute["DataType"].encode("utf-8"))
+        size += len(attribute.get("StringValue", "").encode("utf-8"))
+    return size
+
+
+def chunk_sns_batch_entries(
+    entries: Sequence[Mapping[str, Any]],
+    *,
+    max_entries: int = SNS_PUBLISH_BATCH_MAX_ENTRIES,
+    max_bytes: int = SNS_PUBLISH_BATCH_MAX_BYTES,
+) -> list[list[Mapping[str, Any]]]:
+    """
+    Group publish entries into ``PublishBatch``-sized chunks.
+
+    Entries keep their order. A chunk is closed when adding the next entry
+    would exceed either the entry count or the aggregate size limit. An entry
+    that is larger than ``max_bytes`` on its own is placed in a chunk by
+    itself so SNS can report it as a per-entry failure.
+
+    Parameters
+    ----------
+    entries : Sequence[Mapping[str, Any]]
+        Publish entries to group.
+    max_entries : int, optional
+        Maximum number of entries in a single chunk.
+    max_bytes : int, optional
+        Maximum aggregate size of a single chunk in bytes.
+
+    Returns
+    -------
+    list[list[Mapping[str, Any]]]
+        Chunks of publish entries.
+    """
+    chunks: list[list[Mapping[str, Any]]] = []
+    current: list[Mapping[str, Any]] = []
+    current_size = 0
+    for entry in entries:
+        entry_size = estimate_sns_entry_size(entry)
+        if current and (
+            len(current) >= max_entries or current_size + entry_size > max_bytes
+        ):
+            chunks.append(current)
+            current = []
+            current_size = 0
+        current.append(entry)
+        current_size += entry_size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def is_fifo_topic(sns_topic_arn: str) -> bool:
+    """
+    Return whether an SNS topic ARN refers to a FIFO topic.
+
+    Parameters
+    ----------
+    sns_topic_arn : str
+        SNS topic ARN.
+
+    Returns
+    -------
+    bool
+        ``True`` if the topic name ends with ``.fifo``.
+    """
+    return sns_topic_arn.endswith(".fifo")
+
+
 def dispatch_sns_messages(
     *,
-    result: Mapping[str, Any],
+    result: Mapping[str, Any] | Iterable[tuple[str, Any]],
     sns_topic_arn: str,
-    sns_client: BaseClient,
+    sns_client: "BaseClient",
     logger: logging.Logger,
-) -> None:
+    batch: bool = False,
+    max_batch_retries: int = 2,
+    max_in_flight: int = 1,
+    json_codec: Optional[JsonCodec] = None,
+    payload_transport: Optional[PayloadTransport] = None,
+    deadline: Optional[Deadline] = None,
+    metrics: Optional[MetricsRecorder] = None,
+    tracer: Optional[Tracer] = None,
+) -> DispatchStats:
     """
     Publishes result messages to an SNS topic.
 
     Parameters
     ----------
-    result : Mapping[str, Any]
-        Mapping of result types to message payloads.
+    result : Mapping[str, Any] or Iterable[tuple[str, Any]]
+        Mapping of result types to message payloads, or an iterable of
+        ``(result_type, payload)`` pairs. Pairs are published as they are
+        produced on a background pool of ``max_in_flight`` workers (batched
+        into ``PublishBatch`` calls as batches fill when ``batch`` is set),
+        so producing results overlaps with publishing them.
     sns_topic_arn : str
         SNS topic ARN to publish all result messages.
     sns_client : botocore.client.BaseClient
         SNS client used to publish messages.
     logger : logging.Logger
         Logger used to emit structured publish logs.
+    batch : bool, optional
+        Publish with ``PublishBatch`` instead of one ``Publish`` per result.
+    max_batch_retries : int, optional
+        Number of times entries that fail in a ``PublishBatch`` call are
+        retried. Only failed entries are resent, and entries rejected as a
+        sender fault are not retried. On FIFO topics, failed entries are
+        retried before the next batch of their message group is sent. Once
+        an entry fails for good, the group's later entries are not published.
+        They are reported as failures with code ``MessageGroupBlocked``.
+    max_in_flight : int, optional
+        Maximum number of SNS calls in flight at once. Values above one
+        spread calls across a thread pool sharing ``sns_client``. For FIFO
+        topics, calls for the same message group are still made in order.
+    json_codec : JsonCodec, optional
+        Codec used to serialize result payloads. Defaults to the backend
+        selected by :func:`lambdacron.codec.get_json_codec`.
+    payload_transport : PayloadTransport, optional
+        Transport used to compress or offload large messages.
+    deadline : Deadline, optional
+        Once this passes, no further SNS calls are started. Results that
+        were not yet published are reported in ``DispatchStats.dropped`` and
+        logged as ``sns_results_dropped``.
+    metrics : MetricsRecorder, optional
+        Recorder for the latency of each SNS call (``PublishLatency``) and
+        failed calls (``PublishFailures``), per result type. The caller is
+        responsible for flushing it.
+    tracer : Tracer, optional
+        Hooks wrapped around building each SNS entry (``build_payload``) and
+        each SNS call (``publish``).
+
+    Returns
+    -------
+    DispatchStats
+        Timing summary for the dispatch.
+
+    Raises
+    ------
+    BatchPublishError
+        If batched entries still fail after all retries.
+    ValueError
+        If an iterable of pairs yields the same result type twice. Results
+        yielded before the duplicate have already been published.
     """
-    for result_type, message in result.items():
-        payload = build_result_message_payload(result_type=result_type, message=message)
-        sns_client.publish(
-            TopicArn=sns_topic_arn,
-            Message=json.dumps(payload),
-            Subject=f"Notification for {result_type}",
-            MessageAttributes={
-                "result_type": {
-                    "DataType": "String",
-                    "StringValue": result_type,
-                }
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+    start = time.perf_counter()
+    codec = json_codec or get_json_codec()
+    tracer = tracer or Tracer()
+    publisher = _Publisher(
+        sns_topic_arn=sns_topic_arn,
+        sns_client=sns_client,
+        logger=logger,
+        max_in_flight=max_in_flight,
+        deadline=deadline,
+        metrics=metrics,
+        tracer=tracer,
+    )
+    if isinstance(result, Mapping):
+        entries = {}
+        for result_type, message in result.items():
+            with tracer.span("build_payload"):
+                entries[result_type] = build_sns_publish_entry(
+                    result_type=result_type,
+                    message=message,
+                    json_codec=codec,
+                    payload_transport=payload_transport,
+                )
+        if batch:
+            publisher.publish_batched(entries, max_retries=max_batch_retries)
+        else:
+            publisher.publish(entries)
+        result_count = len(entries)
+    else:
+        try:
+            result_count = publisher.publish_stream(
+                _stream_entries(
+                    result,
+                    json_codec=codec,
+                    payload_transport=payload_transport,
+                    tracer=tracer,
+                ),
+                batch=batch,
+                max_retries=max_batch_retries,
+            )
+        finally:
+            # Stop an abandoned generator (and run its cleanup) right away
+            # rather than whenever it is garbage collected.
+            close = getattr(result, "close", None)
+            if close is not None:
+                close()
+    if publisher.dropped:
+        logger.warning(
+            "sns_results_dropped",
+            extra={
+                "result_types": publisher.dropped,
+                "topic_arn": sns_topic_arn,
             },
-            MessageGroupId=load_sns_message_group_id(),
         )
-        logger.info(
+    return DispatchStats(
+        duration=time.perf_counter() - start,
+        slowest_publish=publisher.slowest_publish,
+        publish_calls=publisher.publish_calls,
+        result_count=result_count,
+        dropped=tuple(publisher.dropped),
+    )
+
+
+async def dispatch_sns_messages_async(
+    *,
+    result: Mapping[str, Any]
+    | Iterable[tuple[str, Any]]
+    | AsyncIterator[tuple[str, Any]],
+    max_in_flight: int = 1,
+    **kwargs: Any,
+) -> DispatchStats:
+    """
+    Publish result messages to an SNS topic without blocking the event loop.
+
+    This wraps :func:`dispatch_sns_messages`, running it on a worker thread.
+    Async iterators are consumed on the event loop and handed to the
+    dispatcher through a bounded queue, so results are still published as
+    they arrive.
+
+    Parameters
+    ----------
+    result : Mapping[str, Any] or Iterable[tuple[str, Any]] or AsyncIterator[tuple[str, Any]]
+        Mapping of result types to message payloads, or a (sync or async)
+        iterable of ``(result_type, payload)`` pairs.
+    max_in_flight : int, optional
+        Maximum number of SNS calls in flight at once.
+    **kwargs : Any
+        Remaining keyword arguments for :func:`dispatch_sns_messages`.
+
+    Returns
+    -------
+    DispatchStats
+        Timing summary for the dispatch.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+    dispatch = functools.partial(
+        dispatch_sns_messages, max_in_flight=max_in_flight, **kwargs
+    )
+    if not hasattr(result, "__aiter__"):
+        return await asyncio.to_thread(dispatch, result=result)
+
+    items: queue.Queue = queue.Queue(maxsize=2 * max_in_flight)
+    stopped = threading.Event()
+
+    def consume() -> Iterator[tuple[str, Any]]:
+        while (item := items.get()) is not _END_OF_RESULTS:
+            yield item
+
+    async def put(item: Any) -> bool:
+        # Poll rather than block a thread on put(): once the dispatcher has
+        # stopped nothing drains the queue, and the loop must not hang.
+        while not stopped.is_set():
+            try:
+                items.put_nowait(item)
+                return True
+            except queue.Full:
+                await asyncio.sleep(_ASYNC_QUEUE_POLL_INTERVAL)
+        return False
+
+    dispatched = asyncio.ensure_future(asyncio.to_thread(dispatch, result=consume()))
+    dispatched.add_done_callback(lambda _: stopped.set())
+    try:
+        async for item in result:
+            if not await put(item):
+                break
+    except BaseException:
+        await put(_END_OF_RESULTS)
+        with contextlib.suppress(Exception):
+            await dispatched
+        raise
+    finally:
+        aclose = getattr(result, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    await put(_END_OF_RESULTS)
+    return await dispatched
+
+
+def iterate_async_results(
+    results: AsyncIterator[tuple[str, Any]],
+) -> Iterator[tuple[str, Any]]:
+    """
+    Drive an async iterator of results from synchronous code.
+
+    Each item is awaited on a private event loop only when the caller asks
+    for it, so the async task still streams results one at a time.
+
+    Parameters
+    ----------
+    results : AsyncIterator[tuple[str, Any]]
+        Async iterator of ``(result_type, payload)`` pairs.
+
+    Yields
+    ------
+    tuple[str, Any]
+        The pairs produced by ``results``.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(anext(results))
+            except StopAsyncIteration:
+                break
+    finally:
+        aclose = getattr(results, "aclose", None)
+        if aclose is not None:
+            loop.run_until_complete(aclose())
+        loop.close()
+
+
+def _closing_after(
+    results: Iterable[tuple[str, Any]], stack: contextlib.ExitStack
+) -> Iterator[tuple[str, Any]]:
+    try:
+        yield from results
+    finally:
+        stack.close()
+
+
+async def _aclosing_after(
+    results: AsyncIterator[tuple[str, Any]], stack: contextlib.ExitStack
+) -> AsyncIterator[tuple[str, Any]]:
+    try:
+        async for item in results:
+            yield item
+    finally:
+        try:
+            aclose = getattr(results, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        finally:
+            stack.close()
+
+
+def _stream_entries(
+    results: Iterable[tuple[str, Any]],
+    *,
+    json_codec: JsonCodec,
+    payload_transport: Optional[PayloadTransport],
+    tracer: Tracer,
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    seen: set[str] = set()
+    for result_type, message in results:
+        if not isinstance(result_type, str) or not result_type:
+            raise ValueError("Result types must be non-empty strings")
+        if result_type in seen:
+            raise ValueError(f"Duplicate result type '{result_type}'")
+        seen.add(result_type)
+        with tracer.span("build_payload"):
+            entry = build_sns_publish_entry(
+                result_type=result_type,
+                message=message,
+                json_codec=json_codec,
+                payload_transport=payload_transport,
+            )
+        yield result_type, entry
+
+
+class _Publisher:
+    def __init__(
+        self,
+        *,
+        sns_topic_arn: str,
+        sns_client: "BaseClient",
+        logger: logging.Logger,
+        max_in_flight: int,
+        deadline: Optional[Deadline] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        tracer: Optional[Tracer] = None,
+    ) -> None:
+        self.sns_topic_arn = sns_topic_arn
+        self.sns_client = sns_client
+        self.logger = logger
+        self.max_in_flight = max_in_flight
+        self.deadline = deadline
+        self.metrics = metrics or MetricsRecorder(enabled=False)
+        self.tracer = tracer or Tracer()
+        self.fifo = is_fifo_topic(sns_topic_arn)
+        self.slowest_publish = 0.0
+        self.publish_calls = 0
+        self.dropped: list[str] = []
+        self._failed_groups: set[Any] = set()
+        self._lock = threading.Lock()
+
+    def publish(self, entries: Mapping[str, Mapping[str, Any]]) -> None:
+        calls = [
+            (
+                self._ordering_key(entry, index),
+                functools.partial(self._publish_one, result_type, entry),
+            )
+            for index, (result_type, entry) in enumerate(entries.items())
+        ]
+        self._run(calls)
+
+    def publish_batched(
+        self, entries: Mapping[str, Mapping[str, Any]], *, max_retries: int
+    ) -> None:
+        result_types = {
+            str(index): result_type for index, result_type in enumerate(entries)
+        }
+        pending = [
+            {"Id": entry_id, **entries[result_type]}
+            for entry_id, result_type in result_types.items()
+        ]
+        failures: dict[str, Mapping[str, Any]] = {}
+        if self.fifo:
+            groups: dict[Any, list[Mapping[str, Any]]] = {}
+            for entry in pending:
+                groups.setdefault(entry.get("MessageGroupId"), []).append(entry)
+            calls = [
+                (
+                    f"group:{group}",
+                    functools.partial(
+                        self._publish_group,
+                        group,
+                        group_entries,
+                        result_types,
+                        max_retries=max_retries,
+                    ),
+                )
+                for group, group_entries in groups.items()
+            ]
+            for group_failures in self._run(calls):
+                failures.update(group_failures)
+        else:
+            failures.update(
+                self._publish_with_retries(
+                    pending, result_types, max_retries=max_retries
+                )
+            )
+
+        if failures:
+            failed = {
+                result_types[entry_id]: failure
+                for entry_id, failure in failures.items()
+            }
+            for result_type, failure in failed.items():
+                self.logger.error(
+                    "sns_publish_failed",
+                    extra={
+                        "result_type": result_type,
+                        "topic_arn": self.sns_topic_arn,
+                        "error_code": failure.get("Code"),
+                        "error_message": failure.get("Message"),
+                        "sender_fault": failure.get("SenderFault"),
+                    },
+                )
+            raise BatchPublishError(failed)
+
+    def _publish_group(
+        self,
+        group: Any,
+        entries: Sequence[Mapping[str, Any]],
+        result_types: Mapping[str, str],
+        *,
+        max_retries: int,
+    ) -> dict[str, Mapping[str, Any]]:
+        # A FIFO group's chunks go out one at a time, each retried before the
+        # next is sent. Once an entry of the group has failed for good, the
+        # rest of the group is held back, as on the non-batch path; this also
+        # holds across the batches of a streamed dispatch.
+        failures: dict[str, Mapping[str, Any]] = {}
+        chunks = chunk_sns_batch_entries(entries)
+        for position, chunk in enumerate(chunks):
+            with self._lock:
+                blocked = group in self._failed_groups
+            if blocked:
+                for held in chunks[position:]:
+                    for entry in held:
+                        failures[entry["Id"]] = {
+                            "Id": entry["Id"],
+                            "Code": "MessageGroupBlocked",
+                            "Message": (
+                                f"Not published because an earlier entry in "
+                                f"message group {group!r} failed"
+                            ),
+                            "SenderFault": False,
+                        }
+                break
+            chunk_failures = self._publish_with_retries(
+                chunk, result_types, max_retries=max_retries
+            )
+            if chunk_failures:
+                failures.update(chunk_failures)
+                with self._lock:
+                    self._failed_groups.add(group)
+        return failures
+
+    def _publish_with_retries(
+        self,
+        entries: Sequence[Mapping[str, Any]],
+        result_types: Mapping[str, str],
+        *,
+        max_retries: int,
+    ) -> dict[str, Mapping[str, Any]]:
+        pending = {entry["Id"]: entry for entry in entries}
+        failures: dict[str, Mapping[str, Any]] = {}
+        for attempt in range(max_retries + 1):
+            if attempt:
+                time.sleep(_PUBLISH_BATCH_RETRY_DELAY * 2 ** (attempt - 1))
+            calls = [
+                (
+                    self._ordering_key(chunk[0], index),
+                    functools.partial(self._publish_chunk, chunk),
+                )
+                for index, chunk in enumerate(
+                    chunk_sns_batch_entries(list(pending.values()))
+                )
+            ]
+            retryable: dict[str, Mapping[str, Any]] = {}
+            for response in self._run(calls):
+                for success in response.get("Successful", []):
+                    self.logger.info(
+                        "sns_publish",
+                        extra={
+                            "result_type": result_types[success["Id"]],
+                            "topic_arn": self.sns_topic_arn,
+                        },
+                    )
+                for failure in response.get("Failed", []):
+                    if failure.get("SenderFault"):
+                        failures[failure["Id"]] = failure
+                    else:
+                        retryable[failure["Id"]] = failure
+            if not retryable:
+                break
+            pending = {entry_id: pending[entry_id] for entry_id in retryable}
+            if attempt < max_retries:
+                self.logger.warning(
+                    "sns_publish_batch_retry",
+                    extra={
+                        "result_types": [
+                            result_types[entry_id] for entry_id in pending
+                        ],
+                        "attempt": attempt + 1,
+                    },
+                )
+        else:
+            failures.update(retryable)
+        return failures
+
+    def publish_stream(
+        self,
+        entries: Iterable[tuple[str, Mapping[str, Any]]],
+        *,
+        batch: bool,
+        max_retries: int,
+    ) -> int:
+        count = 0
+        batch_failures: dict[str, Mapping[str, Any]] = {}
+        errors: list[BaseException] = []
+        tails: dict[str, Future] = {}
+        # Bound the results waiting to be published so a fast producer does
+        # not buffer its whole output in memory.
+        slots = threading.BoundedSemaphore(2 * self.max_in_flight)
+        pending: dict[str, Mapping[str, Any]] = {}
+        pending_size = 0
+
+        def on_done(future: Future) -> None:
+            slots.release()
+            exc = future.exception()
+            if isinstance(exc, BatchPublishError):
+                with self._lock:
+                    batch_failures.update(exc.failures)
+            elif exc is not None:
+                errors.append(exc)
+
+        def submit(key: str, call: Callable[[], Any]) -> None:
+            slots.acquire()
+            future = executor.submit(self._run_after, tails.get(key), call)
+            tails[key] = future
+            future.add_done_callback(on_done)
+
+        def flush() -> None:
+            nonlocal pending, pending_size
+            chunk, pending, pending_size = pending, {}, 0
+            key = "fifo" if self.fifo else f"call:{count}"
+            submit(
+                key,
+                functools.partial(self.publish_batched, chunk, max_retries=max_retries),
+            )
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            for result_type, entry in entries:
+                if errors:
+                    break
+                count += 1
+                if not batch:
+                    submit(
+                        self._ordering_key(entry, count),
+                        functools.partial(self._publish_one, result_type, entry),
+                    )
+                    continue
+                entry_size = estimate_sns_entry_size(entry)
+                if pending and (
+                    len(pending) >= SNS_PUBLISH_BATCH_MAX_ENTRIES
+                    or pending_size + entry_size > SNS_PUBLISH_BATCH_MAX_BYTES
+                ):
+                    flush()
+                pending[result_type] = entry
+                pending_size += entry_size
+            if pending and not errors:
+                flush()
+        if errors:
+            raise errors[0]
+        if batch_failures:
+            raise BatchPublishError(batch_failures)
+        return count
+
+    @staticmethod
+    def _run_after(previous: Optional[Future], call: Callable[[], Any]) -> Any:
+        # Calls that share an ordering key are chained so they run in order.
+        # A failed call fails the later ones unsent, except for per-entry
+        # batch failures: later batches still run, and on FIFO topics they
+        # hold back the entries of any message group that already failed.
+        if previous is not None:
+            exc = previous.exception()
+            if exc is not None and not isinstance(exc, BatchPublishError):
+                raise exc
+        return call()
+
+    def _ordering_key(self, entry: Mapping[str, Any], index: int) -> str:
+        # FIFO topics only guarantee ordering within a message group, so calls
+        # for one group must not overlap; everything else can run freely.
+        if self.fifo:
+            return f"group:{entry.get('MessageGroupId')}"
+        return f"call:{index}"
+
+    def _publish_one(self, result_type: str, entry: Mapping[str, Any]) -> None:
+        if self._past_deadline([result_type]):
+            return
+        self._timed(
+            self.sns_client.publish,
+            [result_type],
+            TopicArn=self.sns_topic_arn,
+            **entry,
+        )
+        self.logger.info(
             "sns_publish",
-            extra={"result_type": result_type, "topic_arn": sns_topic_arn},
+            extra={"result_type": result_type, "topic_arn": self.sns_topic_arn},
         )
+
+    def _publish_chunk(self, chunk: Sequence[Mapping[str, Any]]) -> Mapping[str, Any]:
+        result_types = [
+            entry["MessageAttributes"]["result_type"]["StringValue"] for entry in chunk
+        ]
+        if self._past_deadline(result_types):
+            return {"Successful": [], "Failed": []}
+        return self._timed(
+            self.sns_client.publish_batch,
+            result_types,
+            TopicArn=self.sns_topic_arn,
+            PublishBatchRequestEntries=list(chunk),
+        )
+
+    def _past_deadline(self, result_types: Sequence[str]) -> bool:
+        if self.deadline is None or not self.deadline.expired:
+            return False
+        with self._lock:
+            self.dropped.extend(result_types)
+        return True
+
+    def _timed(
+        self, method: Callable[..., Any], result_types: Sequence[str], **kwargs: Any
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            with self.tracer.span("publish"):
+                return method(**kwargs)
+        except Exception:
+            for result_type in result_types:
+                self.metrics.put(
+                    "PublishFailures", 1, dimensions={"ResultType": result_type}
+                )
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.publish_calls += 1
+                self.slowest_publish = max(self.slowest_publish, elapsed)
+            for result_type in result_types:
+                self.metrics.put(
+                    "PublishLatency",
+                    elapsed * 1000,
+                    "Milliseconds",
+                    dimensions={"ResultType": result_type},
+                )
+
+    def _run(self, calls: Sequence[tuple[str, Callable[[], Any]]]) -> list[Any]:
+        if self.max_in_flight == 1 or len(calls) <= 1:
+            return [call() for _, call in calls]
+        results: list[Any] = [None] * len(calls)
+        ordered: dict[str, list[int]] = {}
+        for index, (key, _) in enumerate(calls):
+            ordered.setdefault(key, []).append(index)
+
+        def run_in_order(indices: list[int]) -> None:
+            for index in indices:
+                results[index] = calls[index][1]()
+
+        workers = min(self.max_in_flight, len(ordered))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(run_in_order, indices) for indices in ordered.values()
+            ]
+            for future in futures:
+                future.result()
+        return results
@@ -0,0 +1,201 @@
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Iterator, Mapping, Optional, TextIO
+
+METRICS_NAMESPACE_ENV_VAR = "LAMBDACRON_METRICS_NAMESPACE"
+# CloudWatch accepts at most 100 metrics per EMF document and 100 values per
+# metric.
+_EMF_MAX_METRICS = 100
+_EMF_MAX_VALUES = 100
+
+
+class MetricsRecorder:
+    """
+    Buffer metrics for an invocation and emit them as CloudWatch EMF.
+
+    Values are kept in memory until :meth:`flush`, which writes one Embedded
+    Metric Format JSON line per set of dimensions. In Lambda these lines go
+    to CloudWatch Logs, where CloudWatch extracts them as metrics without any
+    API calls. A disabled recorder ignores every call, so instrumented code
+    does not need to check whether metrics are configured.
+
+    Parameters
+    ----------
+    namespace : str, optional
+        CloudWatch metric namespace.
+    dimensions : Mapping[str, str], optional
+        Dimensions added to every metric.
+    enabled : bool, optional
+        Whether metrics are recorded at all.
+    stream : TextIO, optional
+        Stream the EMF lines are written to. Defaults to ``sys.stdout`` at
+        flush time.
+    clock : Callable[[], float], optional
+        Function returning the current Unix time, used for timestamps.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "LambdaCron",
+        *,
+        dimensions: Optional[Mapping[str, str]] = None,
+        enabled: bool = True,
+        stream: Optional[TextIO] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.namespace = namespace
+        self.dimensions = dict(dimensions or {})
+        self.enabled = enabled
+        self.stream = stream
+        self.clock = clock
+        self._buffer: dict[
+            tuple[tuple[str, str], ...], dict[str, tuple[str, list[float]]]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def put(
+        self,
+        name: str,
+        value: float,
+        unit: str = "Count",
+        *,
+        dimensions: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """
+        Record a metric value.
+
+        Parameters
+        ----------
+        name : str
+            Metric name.
+        value : float
+            Metric value.
+        unit : str, optional
+            CloudWatch unit, such as ``Count`` or ``Milliseconds``.
+        dimensions : Mapping[str, str], optional
+            Extra dimensions for this value, such as a result type.
+        """
+        if not self.enabled:
+            return
+        key = tuple(sorted((dimensions or {}).items()))
+        with self._lock:
+            metrics = self._buffer.setdefault(key, {})
+            metrics.setdefault(name, (unit, []))[1].append(value)
+
+    @contextlib.contextmanager
+    def timer(
+        self, name: str, *, dimensions: Optional[Mapping[str, str]] = None
+    ) -> Iterator[None]:
+        """
+        Record the duration of a block in milliseconds.
+
+        Parameters
+        ----------
+        name : str
+            Metric name.
+        dimensions : Mapping[str, str], optional
+            Extra dimensions for this value.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.put(
+                name,
+                (time.perf_counter() - start) * 1000,
+                "Milliseconds",
+                dimensions=dimensions,
+            )
+
+    def flush(self) -> None:
+        """
+        Write all buffered metrics as EMF documents and clear the buffer.
+        """
+        with self._lock:
+            buffer, self._buffer = self._buffer, {}
+        if not buffer:
+            return
+        timestamp = int(self.clock() * 1000)
+        stream = self.stream or sys.stdout
+        for extra_dimensions, metrics in buffer.items():
+            for document in self._documents(dict(extra_dimensions), metrics, timestamp):
+                stream.write(json.dumps(document) + "\n")
+        stream.flush()
+
+    def _documents(
+        self,
+        extra_dimensions: dict[str, str],
+        metrics: dict[str, tuple[str, list[float]]],
+        timestamp: int,
+    ) -> Iterator[dict[str, Any]]:
+        dimensions = {**self.dimensions, **extra_dimensions}
+        pending = [
+            (name, unit, values[start : start + _EMF_MAX_VALUES])
+            for name, (unit, values) in metrics.items()
+            for start in range(0, len(values), _EMF_MAX_VALUES)
+        ]
+        while pending:
+            # A metric name may appear only once per document, so values
+            # beyond the per-metric limit spill into following documents.
+            batch: dict[str, tuple[str, list[float]]] = {}
+            remaining = []
+            for name, unit, values in pending:
+                if name in batch or len(batch) >= _EMF_MAX_METRICS:
+                    remaining.append((name, unit, values))
+                else:
+                    batch[name] = (unit, values)
+            pending = remaining
+            yield {
+                "_aws": {
+                    "Timestamp": timestamp,
+                    "CloudWatchMetrics": [
+                        {
+                            "Namespace": self.namespace,
+                            "Dimensions": [list(dimensions)],
+                            "Metrics": [
+                                {"Name": name, "Unit": unit}
+                                for name, (unit, _) in batch.items()
+                            ],
+                        }
+                    ],
+                },
+                **dimensions,
+                **{
+                    name: values[0] if len(values) == 1 else values
+                    for name, (_, values) in batch.items()
+                },
+            }
+
+
+def load_metrics(
+    *,
+    dimensions: Optional[Mapping[str, str]] = None,
+    env_var: str = METRICS_NAMESPACE_ENV_VAR,
+) -> MetricsRecorder:
+    """
+    Build a metrics recorder from the environment.
+
+    Parameters
+    ----------
+    dimensions : Mapping[str, str], optional
+        Dimensions added to every metric.
+    env_var : str, optional
+        Environment variable holding the CloudWatch namespace.
+
+    Returns
+    -------
+    MetricsRecorder
+        A recorder for the configured namespace, or a disabled recorder if
+        the environment variable is unset.
+    """
+    namespace = os.environ.get(env_var)
+    if not namespace:
+        return MetricsRecorder(dimensions=dimensions, enabled=False)
+    return MetricsRecorder(namespace, dimensions=dimensions)
@@ -1,17 +1,69 @@
-from lambdacron.notifications.base import (
-    EnvVarTemplateProvider,
-    FileTemplateProvider,
-    RenderedTemplateNotificationHandler,
-    TemplateProvider,
-)
-from lambdacron.notifications.email_handler import EmailNotificationHandler
-from lambdacron.notifications.print_handler import PrintNotificationHandler
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from lambdacron.notifications.base import (
+        CachingTemplateProvider,
+        EnvVarTemplateProvider,
+        FileTemplateProvider,
+        PendingNotification,
+        RenderedTemplateNotificationHandler,
+        TemplateBytecodeCache,
+        TemplateCache,
+        TemplateProvider,
+        TemplateProviderLoader,
+    )
+    from lambdacron.notifications.email_handler import EmailNotificationHandler
+    from lambdacron.notifications.print_handler import PrintNotificationHandler
+    from lambdacron.notifications.remote_providers import (
+        HttpTemplateProvider,
+        S3TemplateProvider,
+    )
+
+# Submodules are imported on first attribute access (PEP 562), so a print
+# handler does not pay for importing boto3 through the email handler.
+_EXPORTS = {
+    "CachingTemplateProvider": "base",
+    "EmailNotificationHandler": "email_handler",
+    "EnvVarTemplateProvider": "base",
+    "FileTemplateProvider": "base",
+    "HttpTemplateProvider": "remote_providers",
+    "PendingNotification": "base",
+    "PrintNotificationHandler": "print_handler",
+    "RenderedTemplateNotificationHandler": "base",
+    "S3TemplateProvider": "remote_providers",
+    "TemplateBytecodeCache": "base",
+    "TemplateCache": "base",
+    "TemplateProvider": "base",
+    "TemplateProviderLoader": "base",
+}
 
 __all__ = [
+    "CachingTemplateProvider",
     "EmailNotificationHandler",
     "EnvVarTemplateProvider",
     "FileTemplateProvider",
+    "HttpTemplateProvider",
+    "PendingNotification",
     "PrintNotificationHandler",
     "RenderedTemplateNotificationHandler",
+    "S3TemplateProvider",
+    "TemplateBytecodeCache",
+    "TemplateCache",
     "TemplateProvider",
+    "TemplateProviderLoader",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
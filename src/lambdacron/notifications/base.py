@@ -1,11 +1,48 @@
+import hashlib
 import json
 import logging
 import os
+import stat
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Mapping, Optional
+from typing import Any, Callable, Mapping, NamedTuple, Optional, Sequence
 
-from jinja2 import Environment, StrictUndefined
+from jinja2 import (
+    BaseLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    StrictUndefined,
+    Template,
+    TemplateNotFound,
+)
+from jinja2.bccache import Bucket
+
+from lambdacron.codec import JsonCodec, get_json_codec
+from lambdacron.idempotency import (
+    COMPLETED,
+    IdempotencyLedger,
+    load_idempotency_ledger,
+)
+from lambdacron.metrics import MetricsRecorder, load_metrics
+from lambdacron.tracing import Tracer, load_tracer
+from lambdacron.transport import PayloadTransport
+
+BYTECODE_CACHE_ENV_VAR = "LAMBDACRON_BYTECODE_CACHE_DIR"
+PRECOMPILED_TEMPLATES_ENV_VAR = "LAMBDACRON_PRECOMPILED_TEMPLATES"
+# /tmp survives between invocations of the same execution environment, so
+# warm and reused containers skip compiling templates. The directory name
+# gets the user ID appended, as with Jinja's own default cache.
+DEFAULT_BYTECODE_CACHE_NAME = "lambdacron-jinja"
+# Characters of rendered output kept per invocation for records whose payload
+# repeats an earlier record's.
+DEFAULT_RENDER_MEMO_LIMIT = 4 * 1024 * 1024
+# Seconds a partial that has no version is served before it is fetched again.
+DEFAULT_PARTIAL_TTL = 60.0
 
 
 class TemplateProvider(ABC):
@@ -25,6 +62,22 @@ class TemplateProvider(ABC):
         """
         raise NotImplementedError
 
+    def get_version(self) -> Optional[str]:
+        """
+        Return a cheap validator for the current template contents.
+
+        Providers that can tell whether their template changed without
+        fetching it (for example from a file modification time or an ETag)
+        override this so cached templates can be revalidated cheaply.
+
+        Returns
+        -------
+        str or None
+            Opaque version string, or ``None`` if the provider cannot
+            determine one without fetching the template.
+        """
+        return None
+
 
 class EnvVarTemplateProvider(TemplateProvider):
     """
@@ -83,6 +136,426 @@ class FileTemplateProvider(TemplateProvider):
         """
         return self.path.read_text(encoding="utf-8")
 
+    def get_version(self) -> Optional[str]:
+        """
+        Return the file modification time and size as a version string.
+
+        Returns
+        -------
+        str or None
+            Version string, or ``None`` if the file cannot be read.
+        """
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def directory_template_providers(directory: Path) -> dict[str, TemplateProvider]:
+    """
+    Build file template providers for every file under a directory.
+
+    Hidden files and directories, whose names start with ``.``, are skipped,
+    so placeholders such as ``.gitkeep`` are not treated as templates.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+        Directory of templates.
+
+    Returns
+    -------
+    dict[str, TemplateProvider]
+        Providers keyed by each file's path relative to ``directory``, with
+        ``/`` separators, which is the name used to include it.
+    """
+    return {
+        path.relative_to(directory).as_posix(): FileTemplateProvider(path)
+        for path in sorted(directory.rglob("*"))
+        if path.is_file()
+        and not any(part.startswith(".") for part in path.relative_to(directory).parts)
+    }
+
+
+class CachingTemplateProvider(TemplateProvider):
+    """
+    Cache templates from another provider for a time-to-live.
+
+    The wrapped provider is not called until the template is first needed.
+    Within ``ttl`` seconds of a fetch the cached template is returned without
+    any I/O. After that, the wrapped provider's :meth:`~TemplateProvider.get_version`
+    is checked and the cached template is kept if the version is unchanged;
+    otherwise the template is fetched again. :meth:`get_version` follows the
+    same schedule, so a :class:`TemplateProviderLoader` can check a cached
+    template without fetching it, even if the wrapped provider has no
+    version of its own.
+
+    Parameters
+    ----------
+    provider : TemplateProvider
+        Provider whose templates are cached.
+    ttl : float, optional
+        Seconds a fetched template is served without revalidation.
+    clock : Callable[[], float], optional
+        Monotonic clock returning seconds, mainly for testing.
+    """
+
+    def __init__(
+        self,
+        provider: TemplateProvider,
+        *,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl < 0:
+            raise ValueError("ttl must be non-negative")
+        self.provider = provider
+        self.ttl = ttl
+        self.clock = clock
+        self._template: Optional[str] = None
+        self._version: Optional[str] = None
+        self._generation = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_template(self) -> str:
+        """
+        Return the cached template, revalidating or refetching when stale.
+
+        Returns
+        -------
+        str
+            Template contents as a string.
+        """
+        with self._lock:
+            return self._refresh()
+
+    def get_version(self) -> Optional[str]:
+        """
+        Return a version string for the cached template.
+
+        The version changes whenever a fetch returns different contents.
+        Like :meth:`get_template`, it only consults the wrapped provider once
+        the cached template is older than ``ttl``.
+
+        Returns
+        -------
+        str or None
+            Version string of the cached template.
+        """
+        with self._lock:
+            self._refresh()
+            return str(self._generation)
+
+    def invalidate(self) -> None:
+        """
+        Drop the cached template so the next call fetches it again.
+        """
+        with self._lock:
+            self._template = None
+            self._version = None
+
+    def _refresh(self) -> str:
+        now = self.clock()
+        if self._template is not None:
+            if now - self._checked_at < self.ttl:
+                return self._template
+            version = self.provider.get_version()
+            if version is not None and version == self._version:
+                self._checked_at = now
+                return self._template
+        # Read the version before the contents so a change that lands in
+        # between is picked up on the next revalidation.
+        self._version = self.provider.get_version()
+        template = self.provider.get_template()
+        if template != self._template:
+            self._generation += 1
+        self._template = template
+        self._checked_at = now
+        return template
+
+
+class TemplateProviderLoader(BaseLoader):
+    """
+    Jinja2 loader that looks templates up by name in template providers.
+
+    Templates loaded through an environment with this loader can
+    ``{% include %}``, ``{% extends %}`` or ``{% import %}`` each other by
+    provider name. Jinja keeps loaded templates until the provider's
+    :meth:`~TemplateProvider.get_version` (or, when it has none, its
+    template contents) changes.
+
+    Parameters
+    ----------
+    providers : Mapping[str, TemplateProvider]
+        Providers keyed by template name.
+    """
+
+    def __init__(self, providers: Mapping[str, TemplateProvider]) -> None:
+        self.providers = providers
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> tuple[str, Optional[str], Callable[[], bool]]:
+        """
+        Return the source of a template from its provider.
+
+        Parameters
+        ----------
+        environment : jinja2.Environment
+            Environment loading the template.
+        template : str
+            Template name.
+
+        Returns
+        -------
+        tuple[str, None, Callable[[], bool]]
+            Template source, no filename, and a function telling Jinja
+            whether a loaded copy is still current.
+
+        Raises
+        ------
+        jinja2.TemplateNotFound
+            If no provider has the template name.
+        """
+        provider = self.providers.get(template)
+        if provider is None:
+            raise TemplateNotFound(template)
+        version = provider.get_version()
+        source = provider.get_template()
+        if version is not None:
+            return source, None, lambda: provider.get_version() == version
+        return source, None, lambda: provider.get_template() == source
+
+    def list_templates(self) -> list[str]:
+        """
+        Return the names of all templates.
+
+        Returns
+        -------
+        list[str]
+            Sorted template names.
+        """
+        return sorted(self.providers)
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """
+    Filesystem cache of compiled template bytecode.
+
+    Bytecode is read from and written to ``directory``. When it is missing
+    there, it is read from ``precompiled_dir``, a read-only directory of
+    bytecode built into the container image by ``python -m
+    lambdacron.precompile``. Failures to write the cache are ignored.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+        Writable cache directory. Created if missing.
+    precompiled_dir : pathlib.Path, optional
+        Directory of precompiled bytecode.
+    """
+
+    def __init__(
+        self, directory: Path, *, precompiled_dir: Optional[Path] = None
+    ) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(directory))
+        self.precompiled_dir = precompiled_dir
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        """
+        Load bytecode for a bucket from the cache or the precompiled files.
+
+        Parameters
+        ----------
+        bucket : jinja2.bccache.Bucket
+            Bucket to fill.
+        """
+        super().load_bytecode(bucket)
+        if bucket.code is not None or self.precompiled_dir is None:
+            return
+        try:
+            with open(self.precompiled_dir / (self.pattern % bucket.key), "rb") as f:
+                bucket.load_bytecode(f)
+        except OSError:
+            return
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        """
+        Write bytecode for a bucket, ignoring filesystem errors.
+
+        Parameters
+        ----------
+        bucket : jinja2.bccache.Bucket
+            Bucket to store.
+        """
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
+
+def load_bytecode_cache(
+    *,
+    env_var: str = BYTECODE_CACHE_ENV_VAR,
+    precompiled_env_var: str = PRECOMPILED_TEMPLATES_ENV_VAR,
+) -> Optional[TemplateBytecodeCache]:
+    """
+    Build the template bytecode cache from the environment.
+
+    Parameters
+    ----------
+    env_var : str, optional
+        Environment variable naming the writable cache directory. Defaults
+        to a private ``lambdacron-jinja-<uid>`` directory in the temporary
+        directory, which is not used if another user owns it. Set it to an
+        empty string to disable the cache.
+    precompiled_env_var : str, optional
+        Environment variable naming a directory of precompiled bytecode.
+
+    Returns
+    -------
+    TemplateBytecodeCache or None
+        The cache, or ``None`` if it is disabled or its directory cannot be
+        created.
+    """
+    directory = os.environ.get(env_var)
+    if directory is None:
+        default = _default_bytecode_cache_dir()
+        directory = str(default) if default is not None else ""
+    if not directory:
+        return None
+    precompiled = os.environ.get(precompiled_env_var)
+    try:
+        return TemplateBytecodeCache(
+            Path(directory),
+            precompiled_dir=Path(precompiled) if precompiled else None,
+        )
+    except OSError:
+        return None
+
+
+class TemplateCache:
+    """
+    Size-bounded LRU cache of compiled Jinja2 templates.
+
+    Entries are keyed by template name and a hash of the template source, so
+    a changed template is compiled again while unchanged templates are reused
+    across records and warm Lambda invocations. On a miss, bytecode is taken
+    from the environment's bytecode cache when it has one, keyed by the
+    source alone so precompiled bytecode is found whatever name the template
+    is rendered under.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of compiled templates to keep.
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups served from the cache.
+    misses : int
+        Number of lookups that compiled a template.
+    evictions : int
+        Number of compiled templates dropped to respect ``maxsize``.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._templates: OrderedDict[tuple[str, str], Template] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def get(self, env: Environment, name: str, source: str) -> Template:
+        """
+        Return the compiled template for ``source``, compiling it on a miss.
+
+        Parameters
+        ----------
+        env : jinja2.Environment
+            Environment used to compile the template on a cache miss.
+        name : str
+            Template name, used as part of the cache key.
+        source : str
+            Template source string.
+
+        Returns
+        -------
+        jinja2.Template
+            Compiled template.
+        """
+        key = (name, hashlib.sha256(source.encode("utf-8")).hexdigest())
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return template
+            self.misses += 1
+        template = _compile_template(env, name, source, key[1])
+        with self._lock:
+            self._templates[key] = template
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+                self.evictions += 1
+        return template
+
+    def clear(self) -> None:
+        """
+        Drop all compiled templates and reset the counters.
+        """
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+def _compile_template(
+    env: Environment, name: str, source: str, digest: str
+) -> Template:
+    if env.bytecode_cache is None:
+        return env.from_string(source)
+    bucket = Bucket(env, f"source-{digest}", digest)
+    env.bytecode_cache.load_bytecode(bucket)
+    if bucket.code is None:
+        bucket.code = env.compile(source, name or None)
+        env.bytecode_cache.dump_bytecode(bucket)
+    return env.template_class.from_code(env, bucket.code, env.make_globals(None))
+
+
+class PendingNotification(NamedTuple):
+    """
+    A validated and rendered SQS record waiting to be delivered.
+
+    Attributes
+    ----------
+    index : int
+        Position of the record in the Lambda event.
+    record : Mapping[str, Any]
+        Original SQS record.
+    result : Mapping[str, Any]
+        Parsed result payload.
+    rendered : dict[str, str]
+        Rendered template output keyed by template name.
+    """
+
+    index: int
+    record: Mapping[str, Any]
+    result: Mapping[str, Any]
+    rendered: dict[str, str]
+
 
 class RenderedTemplateNotificationHandler(ABC):
     """
@@ -97,7 +570,64 @@ class RenderedTemplateNotificationHandler(ABC):
     logger : logging.Logger, optional
         Logger used for structured logging.
     jinja_env : jinja2.Environment, optional
-        Jinja2 environment used for rendering templates.
+        Jinja2 environment used for rendering templates. Defaults to a
+        strict environment whose :class:`TemplateProviderLoader` serves the
+        handler's templates and partials, with the bytecode cache from
+        :func:`load_bytecode_cache`.
+    partial_providers : Mapping[str, TemplateProvider], optional
+        Providers of shared templates that the handler's templates can
+        ``{% include %}`` or ``{% extends %}`` by name but that are not
+        rendered on their own. Jinja checks whether a loaded partial is
+        current on every render, so partials whose providers have no
+        :meth:`~TemplateProvider.get_version` (such as S3 or HTTP providers)
+        are wrapped in a :class:`CachingTemplateProvider` even if
+        ``template_ttl`` is not set.
+    template_cache : TemplateCache, optional
+        Cache of compiled templates. Defaults to a new cache held by the
+        handler, which is reused across warm invocations.
+    template_ttl : float, optional
+        If set, wrap each template provider in a
+        :class:`CachingTemplateProvider` with this time-to-live in seconds,
+        so warm invocations do not fetch templates on every batch.
+    notify_concurrency : int, optional
+        Maximum number of concurrent :meth:`notify` calls. Records are still
+        validated, parsed, and rendered on the calling thread. Records from
+        the same FIFO message group are notified in order, and once one fails
+        the rest of its group is reported as failed without being sent.
+        Defaults to 1 (notify serially).
+    json_codec : JsonCodec, optional
+        Codec used to decode SQS record bodies. Defaults to the backend
+        selected by :func:`lambdacron.codec.get_json_codec`.
+    payload_transport : PayloadTransport, optional
+        Transport used to inflate compressed results and fetch results
+        offloaded to S3. Defaults to a transport that creates its S3 client
+        on first use.
+    metrics : MetricsRecorder, optional
+        Recorder for records per batch, render time per template, notify
+        latency and failure counts, flushed once per invocation. Defaults to
+        :func:`lambdacron.metrics.load_metrics`, which records nothing unless
+        ``LAMBDACRON_METRICS_NAMESPACE`` is set.
+    tracer : Tracer, optional
+        Hooks wrapped around the invocation and the ``validate``, ``parse``,
+        ``render`` and ``notify`` stages of each record. Defaults to
+        :func:`lambdacron.tracing.load_tracer`, which does nothing unless
+        ``LAMBDACRON_TRACER`` is set.
+    render_memo_limit : int, optional
+        Maximum number of characters of rendered output remembered during
+        one invocation. Records whose parsed payload matches an earlier
+        record's reuse its rendering instead of rendering again. Once the
+        limit is reached, new renderings are not remembered. ``0`` turns
+        the memo off.
+    dedupe_notifications : bool, optional
+        If true, records in a batch whose parsed payload matches an earlier
+        record's are not notified again. They succeed or fail together with
+        the first record, so redelivered or re-fired results are sent once.
+    idempotency : IdempotencyLedger, optional
+        Ledger consulted before each delivery so records already delivered
+        by an earlier invocation (after an SQS redelivery or a partial batch
+        failure) are not sent again. Defaults to
+        :func:`lambdacron.idempotency.load_idempotency_ledger`, which uses
+        no ledger unless ``LAMBDACRON_IDEMPOTENCY_TABLE`` is set.
     """
 
     def __init__(
@@ -107,11 +637,49 @@ class RenderedTemplateNotificationHandler(ABC):
         expected_queue_arn: Optional[str] = None,
         logger: Optional[logging.Logger] = None,
         jinja_env: Optional[Environment] = None,
+        partial_providers: Optional[Mapping[str, TemplateProvider]] = None,
+        template_cache: Optional[TemplateCache] = None,
+        template_ttl: Optional[float] = None,
+        notify_concurrency: int = 1,
+        json_codec: Optional[JsonCodec] = None,
+        payload_transport: Optional[PayloadTransport] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        tracer: Optional[Tracer] = None,
+        render_memo_limit: int = DEFAULT_RENDER_MEMO_LIMIT,
+        dedupe_notifications: bool = False,
+        idempotency: Optional[IdempotencyLedger] = None,
     ) -> None:
-        self.template_providers = dict(template_providers)
+        if notify_concurrency < 1:
+            raise ValueError("notify_concurrency must be at least 1")
+        if render_memo_limit < 0:
+            raise ValueError("render_memo_limit must be non-negative")
+        self.template_providers = _cached_providers(template_providers, template_ttl)
+        self.partial_providers = _cached_partial_providers(
+            partial_providers or {}, template_ttl
+        )
         self.expected_queue_arn = expected_queue_arn
         self.logger = logger or logging.getLogger(self.__class__.__name__)
-        self.jinja_env = jinja_env or Environment(undefined=StrictUndefined)
+        self.jinja_env = jinja_env or Environment(
+            undefined=StrictUndefined,
+            loader=TemplateProviderLoader(
+                {**self.partial_providers, **self.template_providers}
+            ),
+            bytecode_cache=load_bytecode_cache(),
+        )
+        self.template_cache = template_cache or TemplateCache()
+        self.notify_concurrency = notify_concurrency
+        self.json_codec = json_codec or get_json_codec()
+        self.payload_transport = payload_transport or PayloadTransport()
+        if metrics is None:
+            metrics = load_metrics(dimensions={"Handler": self.__class__.__name__})
+        self.metrics = metrics
+        self.tracer = tracer or load_tracer()
+        self.render_memo_limit = render_memo_limit
+        self.dedupe_notifications = dedupe_notifications
+        if idempotency is None:
+            idempotency = load_idempotency_ledger()
+        self.idempotency = idempotency
+        self._decode_seconds = 0.0
 
     def lambda_handler(
         self, event: Mapping[str, Any], context: Any
@@ -133,30 +701,88 @@ class RenderedTemplateNotificationHandler(ABC):
         """
         self.logger.info(
             "notification_invocation",
-            extra={"record_count": len(event.get("Records", []))},
+            extra={
+                "record_count": len(event.get("Records", [])),
+                "template_cache_hits": self.template_cache.hits,
+                "template_cache_misses": self.template_cache.misses,
+            },
         )
+        start = time.perf_counter()
+        try:
+            with self.tracer.invocation(self.__class__.__name__):
+                return self._handle_records(event.get("Records", []))
+        finally:
+            self.metrics.put(
+                "HandlerDuration", (time.perf_counter() - start) * 1000, "Milliseconds"
+            )
+            self.metrics.flush()
+
+    def _handle_records(
+        self, records: Sequence[Mapping[str, Any]]
+    ) -> dict[str, list[dict[str, str]]]:
         templates = {
             name: provider.get_template()
             for name, provider in self.template_providers.items()
         }
-        failures = []
-        records = event.get("Records", [])
-        for record in records:
+        self._decode_seconds = 0.0
+        tracer = self.tracer
+        track_payloads = self.render_memo_limit > 0 or self.dedupe_notifications
+        templates_digest = _payload_digest(templates) if track_payloads else ""
+        memo = _RenderMemo(self.render_memo_limit)
+        payload_keys: dict[int, str] = {}
+        failures: dict[int, dict[str, str]] = {}
+        pending: list[PendingNotification] = []
+        for index, record in enumerate(records):
             try:
-                self._validate_record(record)
-                result = self._parse_result(record)
-                rendered = self._render_templates(templates, result)
-                self.notify(result=result, rendered=rendered, record=record)
+                with tracer.span("validate"):
+                    self._validate_record(record)
+                with tracer.span("parse"):
+                    result = self._parse_result(record)
+                with tracer.span("render"):
+                    if track_payloads:
+                        key = f"{templates_digest}:{_payload_digest(result)}"
+                        payload_keys[index] = key
+                        rendered = memo.get(key)
+                        if rendered is None:
+                            rendered = self._render_templates(templates, result)
+                            memo.put(key, rendered)
+                    else:
+                        rendered = self._render_templates(templates, result)
             except Exception as exc:
-                message_id = record.get("messageId")
-                if not message_id:
-                    raise
-                self.logger.exception(
-                    "notification_record_failed",
-                    extra={"message_id": message_id, "error": str(exc)},
+                failures[index] = self._record_failure(record, exc)
+                continue
+            pending.append(PendingNotification(index, record, result, dict(rendered)))
+        duplicates: dict[int, int] = {}
+        if self.dedupe_notifications:
+            pending, duplicates = _drop_duplicates(pending, payload_keys)
+        claims: dict[int, str] = {}
+        if pending and self.idempotency is not None:
+            pending, claims = self._claim_deliveries(pending, failures)
+        if pending:
+            failures.update(self._deliver(pending))
+        if claims:
+            self._settle_claims(claims, failures)
+        for index, original in duplicates.items():
+            if original in failures:
+                error = RuntimeError(
+                    "Not delivered because an identical record in the batch failed"
                 )
-                failures.append({"itemIdentifier": message_id})
-        return {"batchItemFailures": failures}
+                failures[index] = self._record_failure(records[index], error)
+        self.logger.info(
+            "notification_batch_complete",
+            extra={
+                "record_count": len(records),
+                "failure_count": len(failures),
+                "json_codec": self.json_codec.name,
+                "decode_ms": round(self._decode_seconds * 1000, 3),
+                "render_memo_hits": memo.hits,
+                "duplicate_count": len(duplicates),
+            },
+        )
+        self.metrics.put("RecordsPerBatch", len(records))
+        self.metrics.put("RecordFailures", len(failures))
+        self.metrics.put("DecodeTime", self._decode_seconds * 1000, "Milliseconds")
+        return {"batchItemFailures": [failures[index] for index in sorted(failures)]}
 
     @abstractmethod
     def notify(
@@ -180,6 +806,153 @@ class RenderedTemplateNotificationHandler(ABC):
         """
         raise NotImplementedError
 
+    def _deliver(
+        self, pending: Sequence[PendingNotification]
+    ) -> dict[int, dict[str, str]]:
+        """
+        Deliver rendered notifications and report the ones that failed.
+
+        The default implementation calls :meth:`notify` for each record,
+        serially or on a worker pool depending on ``notify_concurrency``.
+        Subclasses can override this to deliver a whole batch at once.
+
+        Parameters
+        ----------
+        pending : Sequence[PendingNotification]
+            Rendered notifications in event order.
+
+        Returns
+        -------
+        dict[int, dict[str, str]]
+            Batch item failure entries keyed by record index.
+        """
+        if self.notify_concurrency == 1:
+            failures = {}
+            for item in pending:
+                try:
+                    self._timed_notify(item)
+                except Exception as exc:
+                    failures[item.index] = self._record_failure(item.record, exc)
+            return failures
+        groups: dict[str, list[PendingNotification]] = {}
+        for item in pending:
+            groups.setdefault(self._ordering_key(item), []).append(item)
+        return self._notify_concurrently(groups)
+
+    def _claim_deliveries(
+        self,
+        pending: list[PendingNotification],
+        failures: dict[int, dict[str, str]],
+    ) -> tuple[list[PendingNotification], dict[int, str]]:
+        ledger = self.idempotency
+        claimed = []
+        claims: dict[int, str] = {}
+        skipped = 0
+        for item in pending:
+            try:
+                key = ledger.key(item.record, item.rendered)
+                status = ledger.claim(key)
+            except Exception as exc:
+                failures[item.index] = self._record_failure(item.record, exc)
+                continue
+            message_id = item.record.get("messageId")
+            if status is None:
+                claims[item.index] = key
+                claimed.append(item)
+            elif status == COMPLETED:
+                skipped += 1
+                self.logger.info(
+                    "notification_record_duplicate",
+                    extra={"message_id": message_id, "idempotency_key": key},
+                )
+            else:
+                # Another execution is delivering this record; return it to
+                # the queue so it is retried once that delivery settles.
+                self.logger.warning(
+                    "notification_record_in_progress",
+                    extra={"message_id": message_id, "idempotency_key": key},
+                )
+                failures[item.index] = {"itemIdentifier": message_id}
+        self.metrics.put("DuplicateDeliveries", skipped)
+        return claimed, claims
+
+    def _settle_claims(
+        self, claims: Mapping[int, str], failures: Mapping[int, dict[str, str]]
+    ) -> None:
+        for index, key in claims.items():
+            try:
+                if index in failures:
+                    self.idempotency.release(key)
+                else:
+                    self.idempotency.complete(key)
+            except Exception as exc:
+                # The delivery outcome stands; an unsettled claim lapses
+                # when its lease expires.
+                self.logger.warning(
+                    "idempotency_update_failed",
+                    extra={"idempotency_key": key, "error": str(exc)},
+                )
+
+    def _timed_notify(self, item: PendingNotification) -> None:
+        with self.tracer.span("notify"), self.metrics.timer("NotifyLatency"):
+            self.notify(result=item.result, rendered=item.rendered, record=item.record)
+
+    def _record_failure(
+        self, record: Mapping[str, Any], exc: Exception
+    ) -> dict[str, str]:
+        message_id = record.get("messageId")
+        if not message_id:
+            raise exc
+        self.logger.error(
+            "notification_record_failed",
+            exc_info=exc,
+            extra={"message_id": message_id, "error": str(exc)},
+        )
+        return {"itemIdentifier": message_id}
+
+    @staticmethod
+    def _ordering_key(item: PendingNotification) -> str:
+        # Records from a FIFO queue carry a message group; those must be
+        # delivered in order, while all other records are independent.
+        group_id = item.record.get("attributes", {}).get("MessageGroupId")
+        if group_id:
+            return f"group:{group_id}"
+        return f"record:{item.index}"
+
+    def _notify_concurrently(
+        self, groups: Mapping[str, list[PendingNotification]]
+    ) -> dict[int, dict[str, str]]:
+        failures: dict[int, dict[str, str]] = {}
+        workers = min(self.notify_concurrency, len(groups))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._notify_in_order, items)
+                for items in groups.values()
+            ]
+            for future in futures:
+                failures.update(future.result())
+        return failures
+
+    def _notify_in_order(
+        self, items: list[PendingNotification]
+    ) -> dict[int, dict[str, str]]:
+        failures: dict[int, dict[str, str]] = {}
+        for position, item in enumerate(items):
+            try:
+                self._timed_notify(item)
+            except Exception as exc:
+                failures[item.index] = self._record_failure(item.record, exc)
+                # Later messages in the same group must not overtake the
+                # failed one, so they are returned to the queue unsent.
+                skip = RuntimeError(
+                    "Not delivered because an earlier record in its message "
+                    "group failed"
+                )
+                for skipped in items[position + 1 :]:
+                    failures[skipped.index] = self._record_failure(skipped.record, skip)
+                break
+        return failures
+
     def _validate_record(self, record: Mapping[str, Any]) -> None:
         event_source = record.get("eventSource")
         if event_source and event_source != "aws:sqs":
@@ -195,18 +968,25 @@ class RenderedTemplateNotificationHandler(ABC):
         body = record.get("body")
         if not body:
             raise ValueError("SQS record body is missing")
-        try:
-            payload = json.loads(body)
-        except json.JSONDecodeError as exc:
-            raise ValueError("SQS record body must be valid JSON") from exc
-        if isinstance(payload, dict) and "Message" in payload:
+        attribute_result_type = self._extract_result_type(record)
+        payload = self._decode_json(body, "SQS record body must be valid JSON")
+        # With raw message delivery SNS copies message attributes onto the SQS
+        # record and the body is the published message itself, so the
+        # envelope probe is only needed when no attributes came through.
+        if (
+            attribute_result_type is None
+            and isinstance(payload, dict)
+            and "Message" in payload
+        ):
             message = payload.get("Message")
             if not isinstance(message, str):
                 raise ValueError("SNS message must be a JSON string")
-            try:
-                payload = json.loads(message)
-            except json.JSONDecodeError as exc:
-                raise ValueError("SNS message must be valid JSON") from exc
+            payload = self._decode_json(message, "SNS message must be valid JSON")
+        if PayloadTransport.is_envelope(payload):
+            payload = self._decode_json(
+                self.payload_transport.decode(payload),
+                "Transported result payload must be valid JSON",
+            )
         if not isinstance(payload, dict):
             raise ValueError("Result payload must be a JSON object")
         payload_result_type = payload.get("result_type")
@@ -215,7 +995,6 @@ class RenderedTemplateNotificationHandler(ABC):
                 "Result payload must include a non-empty string result_type"
             )
 
-        attribute_result_type = self._extract_result_type(record)
         if attribute_result_type and attribute_result_type != payload_result_type:
             raise ValueError(
                 "Result type mismatch between payload and message attributes "
@@ -223,17 +1002,29 @@ class RenderedTemplateNotificationHandler(ABC):
             )
         return payload
 
-    def _render_template(self, template: str, result: Mapping[str, Any]) -> str:
-        jinja_template = self.jinja_env.from_string(template)
+    def _decode_json(self, document: str, error_message: str) -> Any:
+        start = time.perf_counter()
+        try:
+            return self.json_codec.loads(document)
+        except self.json_codec.decode_errors as exc:
+            raise ValueError(error_message) from exc
+        finally:
+            self._decode_seconds += time.perf_counter() - start
+
+    def _render_template(
+        self, template: str, result: Mapping[str, Any], *, name: str = ""
+    ) -> str:
+        jinja_template = self.template_cache.get(self.jinja_env, name, template)
         return jinja_template.render(**result)
 
     def _render_templates(
         self, templates: Mapping[str, str], result: Mapping[str, Any]
     ) -> dict[str, str]:
-        return {
-            name: self._render_template(template, result)
-            for name, template in templates.items()
-        }
+        rendered = {}
+        for name, template in templates.items():
+            with self.metrics.timer("RenderTime", dimensions={"Template": name}):
+                rendered[name] = self._render_template(template, result, name=name)
+        return rendered
 
     @staticmethod
     def _extract_result_type(record: Mapping[str, Any]) -> Optional[str]:
@@ -243,3 +1034,95 @@ class RenderedTemplateNotificationHandler(ABC):
         if isinstance(value, str) and value:
             return value
         return None
+
+
+class _RenderMemo:
+    # Rendered templates for one invocation, keyed by template set and
+    # payload, holding at most ``limit`` characters of output.
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.size = 0
+        self.hits = 0
+        self._rendered: dict[str, dict[str, str]] = {}
+
+    def get(self, key: str) -> Optional[dict[str, str]]:
+        rendered = self._rendered.get(key)
+        if rendered is not None:
+            self.hits += 1
+        return rendered
+
+    def put(self, key: str, rendered: dict[str, str]) -> None:
+        size = sum(len(text) for text in rendered.values())
+        if self.size + size <= self.limit:
+            self._rendered[key] = rendered
+            self.size += size
+
+
+def _payload_digest(payload: Mapping[str, Any]) -> str:
+    document = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+def _drop_duplicates(
+    pending: list[PendingNotification], payload_keys: Mapping[int, str]
+) -> tuple[list[PendingNotification], dict[int, int]]:
+    first_by_key: dict[str, int] = {}
+    unique = []
+    duplicates = {}
+    for item in pending:
+        key = payload_keys[item.index]
+        original = first_by_key.setdefault(key, item.index)
+        if original == item.index:
+            unique.append(item)
+        else:
+            duplicates[item.index] = original
+    return unique, duplicates
+
+
+def _default_bytecode_cache_dir() -> Optional[Path]:
+    # Cached bytecode is unmarshalled and run, so a directory in the shared
+    # temporary directory must be private to this user. Anyone could have
+    # created it first.
+    if not hasattr(os, "getuid"):
+        return None
+    uid = os.getuid()
+    directory = Path(tempfile.gettempdir()) / f"{DEFAULT_BYTECODE_CACHE_NAME}-{uid}"
+    try:
+        directory.mkdir(mode=0o700, exist_ok=True)
+        info = directory.lstat()
+        if info.st_uid != uid or not stat.S_ISDIR(info.st_mode):
+            return None
+        if stat.S_IMODE(info.st_mode) != 0o700:
+            directory.chmod(0o700)
+    except OSError:
+        return None
+    return directory
+
+
+def _cached_providers(
+    providers: Mapping[str, TemplateProvider], ttl: Optional[float]
+) -> dict[str, TemplateProvider]:
+    return {
+        name: (
+            provider
+            if ttl is None or isinstance(provider, CachingTemplateProvider)
+            else CachingTemplateProvider(provider, ttl=ttl)
+        )
+        for name, provider in providers.items()
+    }
+
+
+def _cached_partial_providers(
+    providers: Mapping[str, TemplateProvider], ttl: Optional[float]
+) -> dict[str, TemplateProvider]:
+    if ttl is not None:
+        return _cached_providers(providers, ttl)
+    return {
+        name: (
+            provider
+            if isinstance(provider, CachingTemplateProvider)
+            or provider.get_version() is not None
+            else CachingTemplateProvider(provider, ttl=DEFAULT_PARTIAL_TTL)
+        )
+        for name, provider in providers.items()
+    }
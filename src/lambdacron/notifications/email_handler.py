@@ -1,14 +1,44 @@
+import json
 import logging
-from typing import Any, Mapping, Optional, Sequence
+import random
+import threading
+import time
+from typing import Any, Callable, Mapping, Optional, Sequence
 
-import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
 from jinja2 import Environment
 
+from lambdacron.clients import get_client
+from lambdacron.codec import JsonCodec
+from lambdacron.deadline import DeadlineExceeded
+from lambdacron.idempotency import IdempotencyLedger
+from lambdacron.metrics import MetricsRecorder
 from lambdacron.notifications.base import (
+    DEFAULT_RENDER_MEMO_LIMIT,
+    PendingNotification,
     RenderedTemplateNotificationHandler,
+    TemplateCache,
     TemplateProvider,
 )
+from lambdacron.rate_limit import TokenBucket
+from lambdacron.tracing import Tracer
+from lambdacron.transport import PayloadTransport
+
+SES_BULK_MAX_DESTINATIONS = 50
+THROTTLE_ERROR_CODES = frozenset(
+    {"Throttling", "ThrottlingException", "TooManyRequestsException"}
+)
+TRANSIENT_ERROR_CODES = frozenset(
+    {"InternalFailure", "InternalError", "ServiceUnavailable", "RequestTimeout"}
+)
+_THROTTLE_BACKOFF_BASE = 0.1
+_THROTTLE_BACKOFF_MAX = 5.0
+BULK_PASSTHROUGH_TEMPLATE = {
+    "SubjectPart": "{{{subject}}}",
+    "TextPart": "{{{text}}}",
+    "HtmlPart": "{{{html}}}",
+}
 
 
 class EmailNotificationHandler(RenderedTemplateNotificationHandler):
@@ -28,7 +58,10 @@ class EmailNotificationHandler(RenderedTemplateNotificationHandler):
     recipients : Sequence[str]
         Default recipient list.
     ses_client : Any, optional
-        Injected SES client for testing or customization.
+        Injected SES client for testing or customization. Defaults to the
+        shared client from :func:`lambdacron.clients.get_client` with
+        botocore retries turned off, since throttled sends are retried by the
+        handler.
     config_set : str, optional
         Optional SES configuration set name.
     reply_to : Sequence[str], optional
@@ -39,6 +72,52 @@ class EmailNotificationHandler(RenderedTemplateNotificationHandler):
         Logger used for structured logging.
     jinja_env : jinja2.Environment, optional
         Jinja2 environment used for rendering templates.
+    partial_providers : Mapping[str, TemplateProvider], optional
+        Providers of shared templates the email templates can include or
+        extend by name.
+    template_cache : TemplateCache, optional
+        Cache of compiled templates shared across invocations.
+    template_ttl : float, optional
+        Seconds to cache fetched templates between revalidations.
+    notify_concurrency : int, optional
+        Maximum number of concurrent SES sends per batch.
+    json_codec : JsonCodec, optional
+        Codec used to decode SQS record bodies.
+    payload_transport : PayloadTransport, optional
+        Transport used to inflate compressed or S3-offloaded results.
+    metrics : MetricsRecorder, optional
+        Recorder for per-invocation CloudWatch metrics.
+    tracer : Tracer, optional
+        Hooks wrapped around each stage of an invocation.
+    render_memo_limit : int, optional
+        Characters of rendered output reused for repeated payloads within
+        one invocation. ``0`` turns reuse off.
+    dedupe_notifications : bool, optional
+        Send one email for records in a batch with identical payloads.
+    idempotency : IdempotencyLedger, optional
+        Ledger that keeps redelivered records from being emailed twice.
+    bulk_send : bool, optional
+        Send each batch with SES ``SendBulkTemplatedEmail`` (up to 50 emails
+        per call) instead of one ``SendEmail`` call per record.
+    bulk_template_name : str, optional
+        Name of the SES template used for bulk sends. The template passes the
+        Jinja-rendered subject, text, and HTML through unchanged, and is
+        created, or updated if its parts differ, on first use.
+    rate_limit : bool, optional
+        Pace sends client-side to the account's SES maximum send rate, read
+        once with ``GetSendQuota``. Ignored if ``rate_limiter`` is given.
+    rate_limiter : TokenBucket, optional
+        Explicit limiter used to pace sends. SES counts each recipient
+        against the maximum send rate, so one token is taken per recipient
+        of every email.
+    max_throttle_retries : int, optional
+        Number of times a throttled or transiently failed send (a 5xx
+        response, a connection error or a read timeout) is retried with
+        jittered exponential backoff. Retries stop early if the backoff would
+        run past the invocation's remaining time.
+    deadline_reserve : float, optional
+        Seconds of the invocation's remaining time kept free of retries and
+        rate-limit waits so the handler can still report failures.
     """
 
     def __init__(
@@ -55,6 +134,23 @@ class EmailNotificationHandler(RenderedTemplateNotificationHandler):
         expected_queue_arn: Optional[str] = None,
         logger: Optional[logging.Logger] = None,
         jinja_env: Optional[Environment] = None,
+        partial_providers: Optional[Mapping[str, TemplateProvider]] = None,
+        template_cache: Optional[TemplateCache] = None,
+        template_ttl: Optional[float] = None,
+        notify_concurrency: int = 1,
+        json_codec: Optional[JsonCodec] = None,
+        payload_transport: Optional[PayloadTransport] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        tracer: Optional[Tracer] = None,
+        render_memo_limit: int = DEFAULT_RENDER_MEMO_LIMIT,
+        dedupe_notifications: bool = False,
+        idempotency: Optional[IdempotencyLedger] = None,
+        bulk_send: bool = False,
+        bulk_template_name: str = "lambdacron-passthrough",
+        rate_limit: bool = False,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_throttle_retries: int = 5,
+        deadline_reserve: float = 1.0,
     ) -> None:
         super().__init__(
             template_providers={
@@ -65,6 +161,17 @@ class EmailNotificationHandler(RenderedTemplateNotificationHandler):
             expected_queue_arn=expected_queue_arn,
             logger=logger,
             jinja_env=jinja_env,
+            partial_providers=partial_providers,
+            template_cache=template_cache,
+            template_ttl=template_ttl,
+            notify_concurrency=notify_concurrency,
+            json_codec=json_codec,
+            payload_transport=payload_transport,
+            metrics=metrics,
+            tracer=tracer,
+            render_memo_limit=render_memo_limit,
+            dedupe_notifications=dedupe_notifications,
+            idempotency=idempotency,
         )
         self.sender = sender
         if not recipients:
@@ -72,7 +179,65 @@ class EmailNotificationHandler(RenderedTemplateNotificationHandler):
         self.recipients = list(recipients)
         self.config_set = config_set
         self.reply_to = list(reply_to) if reply_to else None
-        self.ses_client = ses_client or boto3.client("ses")
+        self._ses_client = ses_client
+        self._ses_client_lock = threading.Lock()
+        self.bulk_send = bulk_send
+        self.bulk_template_name = bulk_template_name
+        self._bulk_template_ready = False
+        self._bulk_template_lock = threading.Lock()
+        self.rate_limit = rate_limit
+        self.rate_limiter = rate_limiter
+        self.max_throttle_retries = max_throttle_retries
+        self.deadline_reserve = deadline_reserve
+        self._rate_limiter_lock = threading.Lock()
+        self._deadline: Optional[float] = None
+
+    @property
+    def ses_client(self) -> Any:
+        """
+        SES client used to send emails, created on first access.
+        """
+        with self._ses_client_lock:
+            if self._ses_client is None:
+                # Throttled and transiently failed sends are retried by
+                # _send_with_backoff within the invocation's remaining time,
+                # so botocore must not retry them first.
+                self._ses_client = get_client(
+                    "ses",
+                    max_concurrency=self.notify_concurrency,
+                    retry_mode="standard",
+                    max_attempts=1,
+                )
+            return self._ses_client
+
+    def lambda_handler(
+        self, event: Mapping[str, Any], context: Any
+    ) -> dict[str, list[dict[str, str]]]:
+        """
+        Entry point for SQS-triggered email notifications.
+
+        Records the invocation deadline from ``context`` so throttle retries
+        and rate-limit waits stay within the remaining execution time.
+
+        Parameters
+        ----------
+        event : Mapping[str, Any]
+            Lambda event payload containing SQS records.
+        context : Any
+            Lambda context object.
+
+        Returns
+        -------
+        dict[str, list[dict[str, str]]]
+            Batch item failures payload for SQS partial retries.
+        """
+        self._deadline = None
+        get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+        if get_remaining is not None:
+            self._deadline = (
+                time.monotonic() + get_remaining() / 1000 - self.deadline_reserve
+            )
+        return super().lambda_handler(event, context)
 
     def notify(
         self,
@@ -110,21 +275,222 @@ class EmailNotificationHandler(RenderedTemplateNotificationHandler):
         if self.reply_to:
             payload["ReplyToAddresses"] = self.reply_to
         try:
-            response = self.ses_client.send_email(**payload)
+            response = self._send_with_backoff(self.ses_client.send_email, payload)
         except ClientError as exc:
-            error = exc.response.get("Error", {})
-            meta = exc.response.get("ResponseMetadata", {})
-            self.logger.exception(
-                "ses_email_failed",
-                extra={
-                    "error_code": error.get("Code"),
-                    "error_message": error.get("Message"),
-                    "request_id": meta.get("RequestId"),
-                    "http_status": meta.get("HTTPStatusCode"),
-                },
-            )
+            self._log_client_error("ses_email_failed", exc)
             raise
         self.logger.info(
             "ses_email_sent",
             extra={"message_id": response.get("MessageId")},
         )
+
+    def _deliver(
+        self, pending: Sequence[PendingNotification]
+    ) -> dict[int, dict[str, str]]:
+        if not self.bulk_send:
+            return super()._deliver(pending)
+        failures: dict[int, dict[str, str]] = {}
+        chunks = [
+            pending[start : start + SES_BULK_MAX_DESTINATIONS]
+            for start in range(0, len(pending), SES_BULK_MAX_DESTINATIONS)
+        ]
+        for position, chunk in enumerate(chunks):
+            try:
+                failures.update(self._send_bulk(chunk))
+            except DeadlineExceeded as exc:
+                # Later chunks would wait on the same exhausted time budget,
+                # so they are returned to the queue unsent.
+                for held in chunks[position:]:
+                    for item in held:
+                        failures[item.index] = self._record_failure(item.record, exc)
+                break
+        return failures
+
+    def _send_bulk(
+        self, chunk: Sequence[PendingNotification]
+    ) -> dict[int, dict[str, str]]:
+        destination = {"ToAddresses": self.recipients}
+        payload = {
+            "Source": self.sender,
+            "Template": self.bulk_template_name,
+            "DefaultTemplateData": json.dumps({"subject": "", "text": "", "html": ""}),
+            "Destinations": [
+                {
+                    "Destination": destination,
+                    "ReplacementTemplateData": json.dumps(
+                        {
+                            "subject": item.rendered["subject"],
+                            "text": item.rendered["text"],
+                            "html": item.rendered["html"],
+                        }
+                    ),
+                }
+                for item in chunk
+            ],
+        }
+        if self.config_set:
+            payload["ConfigurationSetName"] = self.config_set
+        if self.reply_to:
+            payload["ReplyToAddresses"] = self.reply_to
+        try:
+            # A template that cannot be set up fails this chunk's records
+            # rather than the whole batch, and is tried again for the next.
+            self._ensure_bulk_template()
+            with self.tracer.span("notify"), self.metrics.timer("NotifyLatency"):
+                response = self._send_with_backoff(
+                    self.ses_client.send_bulk_templated_email,
+                    payload,
+                    count=len(chunk),
+                )
+        except ClientError as exc:
+            self._log_client_error("ses_bulk_email_failed", exc)
+            return {
+                item.index: self._record_failure(item.record, exc) for item in chunk
+            }
+        except BotoCoreError as exc:
+            self.logger.error(
+                "ses_bulk_email_failed",
+                exc_info=exc,
+                extra={"error_message": str(exc)},
+            )
+            return {
+                item.index: self._record_failure(item.record, exc) for item in chunk
+            }
+
+        failures: dict[int, dict[str, str]] = {}
+        statuses = response.get("Status", [])
+        for position, item in enumerate(chunk):
+            if position >= len(statuses):
+                error = RuntimeError("SES bulk send returned no status for email")
+                failures[item.index] = self._record_failure(item.record, error)
+                continue
+            status = statuses[position]
+            if status.get("Status", "Success") == "Success":
+                self.logger.info(
+                    "ses_email_sent",
+                    extra={"message_id": status.get("MessageId")},
+                )
+                continue
+            error = RuntimeError(
+                f"SES bulk send failed with {status.get('Status')}: "
+                f"{status.get('Error')}"
+            )
+            failures[item.index] = self._record_failure(item.record, error)
+        return failures
+
+    def _send_with_backoff(
+        self,
+        operation: Callable[..., Mapping[str, Any]],
+        payload: Mapping[str, Any],
+        *,
+        count: int = 1,
+    ) -> Mapping[str, Any]:
+        attempt = 0
+        while True:
+            self._wait_for_send_rate(count)
+            try:
+                return operation(**payload)
+            except (ClientError, BotoCoreError) as exc:
+                if not _is_retryable_error(exc) or attempt >= self.max_throttle_retries:
+                    raise
+                cap = min(_THROTTLE_BACKOFF_MAX, _THROTTLE_BACKOFF_BASE * 2**attempt)
+                delay = random.uniform(0, cap)
+                if delay > self._remaining_time():
+                    raise
+                attempt += 1
+                throttled = isinstance(exc, ClientError) and _is_throttle_error(exc)
+                self.logger.warning(
+                    "ses_throttled_retry" if throttled else "ses_transient_retry",
+                    extra={"attempt": attempt, "delay": round(delay, 3)},
+                )
+                time.sleep(delay)
+
+    def _wait_for_send_rate(self, count: int) -> None:
+        limiter = self._get_rate_limiter()
+        if limiter is None:
+            return
+        tokens = count * len(self.recipients)
+        if not limiter.acquire(tokens, timeout=self._remaining_time()):
+            raise DeadlineExceeded(
+                "SES send rate limit cannot be met within the remaining time"
+            )
+
+    def _get_rate_limiter(self) -> Optional[TokenBucket]:
+        if self.rate_limiter is not None or not self.rate_limit:
+            return self.rate_limiter
+        with self._rate_limiter_lock:
+            if self.rate_limiter is None:
+                quota = self.ses_client.get_send_quota()
+                self.rate_limiter = TokenBucket(float(quota["MaxSendRate"]))
+        return self.rate_limiter
+
+    def _remaining_time(self) -> float:
+        if self._deadline is None:
+            return float("inf")
+        return max(0.0, self._deadline - time.monotonic())
+
+    def _ensure_bulk_template(self) -> None:
+        with self._bulk_template_lock:
+            if self._bulk_template_ready:
+                return
+            template = {"TemplateName": self.bulk_template_name}
+            template.update(BULK_PASSTHROUGH_TEMPLATE)
+            try:
+                response = self.ses_client.get_template(
+                    TemplateName=self.bulk_template_name
+                )
+            except ClientError as exc:
+                if exc.response.get("Error", {}).get("Code") != "TemplateDoesNotExist":
+                    raise
+                try:
+                    self.ses_client.create_template(Template=template)
+                except ClientError as create_exc:
+                    code = create_exc.response.get("Error", {}).get("Code")
+                    if code != "AlreadyExists":
+                        raise
+            else:
+                # Templates created by older releases escaped the subject.
+                existing = response.get("Template", {})
+                if any(
+                    existing.get(part) != value
+                    for part, value in BULK_PASSTHROUGH_TEMPLATE.items()
+                ):
+                    self.ses_client.update_template(Template=template)
+            self._bulk_template_ready = True
+
+    def _log_client_error(self, event: str, exc: ClientError) -> None:
+        error = exc.response.get("Error", {})
+        meta = exc.response.get("ResponseMetadata", {})
+        self.logger.error(
+            event,
+            exc_info=exc,
+            extra={
+                "error_code": error.get("Code"),
+                "error_message": error.get("Message"),
+                "request_id": meta.get("RequestId"),
+                "http_status": meta.get("HTTPStatusCode"),
+            },
+        )
+
+
+def _is_throttle_error(exc: ClientError) -> bool:
+    error = exc.response.get("Error", {})
+    if error.get("Code") not in THROTTLE_ERROR_CODES:
+        return False
+    # SES reports an exhausted daily quota with the same code as a rate
+    # throttle, but retrying within the invocation cannot help.
+    return "daily message quota" not in str(error.get("Message", "")).lower()
+
+
+def _is_retryable_error(exc: Exception) -> bool:
+    if isinstance(exc, (BotoConnectionError, HTTPClientError)):
+        return True
+    if not isinstance(exc, ClientError):
+        return False
+    if _is_throttle_error(exc):
+        return True
+    error = exc.response.get("Error", {})
+    status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return error.get("Code") in TRANSIENT_ERROR_CODES or (
+        isinstance(status, int) and status >= 500
+    )
@@ -18,6 +18,9 @@ class PrintNotificationHandler(RenderedTemplateNotificationHandler):
         Queue ARN to validate incoming SQS records.
     logger : logging.Logger, optional
         Logger used for structured logging.
+    partial_providers : Mapping[str, TemplateProvider], optional
+        Providers of shared templates the template can include or extend by
+        name.
     """
 
     def __init__(
@@ -26,11 +29,13 @@ class PrintNotificationHandler(RenderedTemplateNotificationHandler):
         template_provider: TemplateProvider,
         expected_queue_arn: str | None = None,
         logger: Any | None = None,
+        partial_providers: Mapping[str, TemplateProvider] | None = None,
     ) -> None:
         super().__init__(
             template_providers={"body": template_provider},
             expected_queue_arn=expected_queue_arn,
             logger=logger,
+            partial_providers=partial_providers,
         )
 
     def notify(
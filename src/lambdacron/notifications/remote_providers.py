@@ -0,0 +1,171 @@
+import threading
+import urllib.error
+import urllib.request
+from typing import Any, Mapping, Optional
+
+from botocore.exceptions import ClientError
+
+from lambdacron.clients import get_client
+from lambdacron.notifications.base import TemplateProvider
+
+
+class S3TemplateProvider(TemplateProvider):
+    """
+    Load a notification template from an S3 object.
+
+    The last fetched template and its ETag are kept in memory, and later
+    fetches send ``IfNoneMatch`` so an unchanged object costs a single
+    ``304 Not Modified`` response instead of a full download.
+
+    Parameters
+    ----------
+    bucket : str
+        Name of the bucket containing the template.
+    key : str
+        Object key of the template.
+    s3_client : Any, optional
+        Injected S3 client for testing or customization.
+    """
+
+    def __init__(self, bucket: str, key: str, *, s3_client: Optional[Any] = None):
+        self.bucket = bucket
+        self.key = key
+        self._s3_client = s3_client
+        self._template: Optional[str] = None
+        self._etag: Optional[str] = None
+        self._lock = threading.Lock()
+        self._s3_client_lock = threading.Lock()
+
+    @property
+    def s3_client(self) -> Any:
+        """
+        S3 client used to fetch the template, created on first access.
+        """
+        with self._s3_client_lock:
+            if self._s3_client is None:
+                self._s3_client = get_client("s3")
+            return self._s3_client
+
+    @classmethod
+    def from_uri(
+        cls, uri: str, *, s3_client: Optional[Any] = None
+    ) -> "S3TemplateProvider":
+        """
+        Create a provider from an ``s3://bucket/key`` URI.
+
+        Parameters
+        ----------
+        uri : str
+            S3 URI of the template object.
+        s3_client : Any, optional
+            Injected S3 client for testing or customization.
+
+        Returns
+        -------
+        S3TemplateProvider
+            Provider for the referenced object.
+
+        Raises
+        ------
+        ValueError
+            If the URI is not an ``s3://`` URI with a bucket and key.
+        """
+        prefix = "s3://"
+        bucket, _, key = uri[len(prefix) :].partition("/")
+        if not uri.startswith(prefix) or not bucket or not key:
+            raise ValueError(f"Invalid S3 template URI: {uri}")
+        return cls(bucket, key, s3_client=s3_client)
+
+    def get_template(self) -> str:
+        """
+        Return the template, downloading it only if the object changed.
+
+        Returns
+        -------
+        str
+            Template contents as a string.
+        """
+        with self._lock:
+            request = {"Bucket": self.bucket, "Key": self.key}
+            if self._template is not None and self._etag:
+                request["IfNoneMatch"] = self._etag
+            try:
+                response = self.s3_client.get_object(**request)
+            except ClientError as exc:
+                if self._template is not None and _is_not_modified(exc.response):
+                    return self._template
+                raise
+            self._template = response["Body"].read().decode("utf-8")
+            self._etag = response.get("ETag")
+            return self._template
+
+
+class HttpTemplateProvider(TemplateProvider):
+    """
+    Load a notification template from an HTTP(S) URL.
+
+    The last fetched template and its validators are kept in memory, and
+    later fetches send ``If-None-Match`` (or ``If-Modified-Since``) so an
+    unchanged template costs a single ``304 Not Modified`` response.
+
+    Parameters
+    ----------
+    url : str
+        URL of the template.
+    timeout : float, optional
+        Request timeout in seconds.
+    headers : Mapping[str, str], optional
+        Extra request headers, such as an authorization header.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        timeout: float = 10.0,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.url = url
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self._template: Optional[str] = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get_template(self) -> str:
+        """
+        Return the template, downloading it only if the resource changed.
+
+        Returns
+        -------
+        str
+            Template contents as a string.
+        """
+        with self._lock:
+            request = urllib.request.Request(self.url, headers=self.headers)
+            if self._template is not None:
+                if self._etag:
+                    request.add_header("If-None-Match", self._etag)
+                if self._last_modified:
+                    request.add_header("If-Modified-Since", self._last_modified)
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    charset = response.headers.get_content_charset() or "utf-8"
+                    template = response.read().decode(charset)
+                    self._etag = response.headers.get("ETag")
+                    self._last_modified = response.headers.get("Last-Modified")
+            except urllib.error.HTTPError as exc:
+                if exc.code == 304 and self._template is not None:
+                    return self._template
+                raise
+            self._template = template
+            return template
+
+
+def _is_not_modified(response: Mapping[str, Any]) -> bool:
+    error = response.get("Error", {})
+    meta = response.get("ResponseMetadata", {})
+    return error.get("Code") in ("304", "NotModified") or (
+        meta.get("HTTPStatusCode") == 304
+    )
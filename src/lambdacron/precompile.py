@@ -0,0 +1,107 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import Sequence
+
+from jinja2 import Environment, StrictUndefined, TemplateError
+
+from lambdacron.notifications.base import (
+    TemplateBytecodeCache,
+    TemplateCache,
+    TemplateProviderLoader,
+    directory_template_providers,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compile notification templates to Jinja bytecode, for example "
+            "while building a Lambda container image."
+        )
+    )
+    parser.add_argument(
+        "template_dirs",
+        metavar="template-dir",
+        nargs="+",
+        type=Path,
+        help=(
+            "Directory of templates. Each file is compiled under its path "
+            "relative to the directory, which is the name used to include it."
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        required=True,
+        type=Path,
+        help=(
+            "Directory the bytecode is written to. Point "
+            "LAMBDACRON_PRECOMPILED_TEMPLATES at it in the image."
+        ),
+    )
+    return parser
+
+
+def precompile_templates(
+    template_dirs: Sequence[Path], *, output_dir: Path
+) -> list[str]:
+    """
+    Compile every template in the given directories to Jinja bytecode.
+
+    Each template is stored twice: by name, for loading through a
+    :class:`~lambdacron.notifications.base.TemplateProviderLoader` (for
+    example an ``{% include %}`` of a partial), and by source, for rendering
+    the same contents from any template provider. The bytecode is tied to
+    the Python and Jinja2 versions, so run this with the interpreter of the
+    image that will load it.
+
+    Parameters
+    ----------
+    template_dirs : Sequence[pathlib.Path]
+        Directories of templates.
+    output_dir : pathlib.Path
+        Directory the bytecode is written to.
+
+    Returns
+    -------
+    list[str]
+        Names of the compiled templates.
+
+    Raises
+    ------
+    jinja2.TemplateError
+        If a template does not compile.
+    """
+    providers = {}
+    for template_dir in template_dirs:
+        providers.update(directory_template_providers(template_dir))
+    env = Environment(
+        undefined=StrictUndefined,
+        loader=TemplateProviderLoader(providers),
+        bytecode_cache=TemplateBytecodeCache(output_dir),
+    )
+    template_cache = TemplateCache()
+    for name, provider in providers.items():
+        env.get_template(name)
+        template_cache.get(env, name, provider.get_template())
+    return list(providers)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    for template_dir in args.template_dirs:
+        if not template_dir.is_dir():
+            parser.error(f"{template_dir} is not a directory")
+    try:
+        names = precompile_templates(args.template_dirs, output_dir=args.output_dir)
+    except (OSError, UnicodeDecodeError, TemplateError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    print(f"Precompiled {len(names)} templates into {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Callers that find the bucket empty reserve their tokens and sleep until
+    those tokens would have been refilled, so concurrent callers are spaced
+    out rather than all waking up at once.
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added per second.
+    capacity : float, optional
+        Maximum number of tokens held. Defaults to ``rate`` (one second of
+        burst).
+    clock : Callable[[], float], optional
+        Monotonic clock returning seconds.
+    sleep : Callable[[float], None], optional
+        Function used to wait for tokens.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0, *, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens from the bucket, waiting for them if necessary.
+
+        Parameters
+        ----------
+        tokens : float, optional
+            Number of tokens to take.
+        timeout : float, optional
+            Maximum number of seconds to wait. If the tokens would not be
+            available in time, nothing is taken and ``False`` is returned.
+
+        Returns
+        -------
+        bool
+            ``True`` once the tokens have been taken.
+        """
+        with self._lock:
+            now = self.clock()
+            elapsed = max(0.0, now - self._updated_at)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if timeout is not None and wait > timeout:
+                return False
+            self._tokens -= tokens
+        if wait:
+            self.sleep(wait)
+        return True
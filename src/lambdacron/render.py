@@ -1,17 +1,42 @@
 import argparse
+import glob
 import json
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Mapping, TextIO
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TextIO,
+)
 
-from jinja2 import TemplateError
+from jinja2 import (
+    Environment,
+    FileSystemLoader,
+    StrictUndefined,
+    TemplateError,
+    TemplateSyntaxError,
+    meta,
+)
 
 from lambdacron.lambda_task import build_result_message_payload
 from lambdacron.notifications.base import (
     FileTemplateProvider,
     RenderedTemplateNotificationHandler,
+    TemplateCache,
 )
 
+SUMMARY_FILENAME = "render-summary.json"
+DEFAULT_POLL_INTERVAL = 0.5
+_BATCH_TEMPLATE_CACHE_SIZE = 1024
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -31,23 +56,113 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-t",
         "--template",
-        required=True,
         type=Path,
         help="Path to the Jinja2 template file.",
     )
     parser.add_argument(
         "-r",
         "--result-type",
-        required=True,
-        help="Result type key to emulate from the LambdaCron task output.",
+        help=(
+            "Result type key to emulate from the LambdaCron task output. In "
+            "batch mode, only render this result type."
+        ),
+    )
+    parser.add_argument(
+        "-I",
+        "--template-dir",
+        action="append",
+        default=[],
+        type=Path,
+        help=(
+            "Directory searched for templates named in {% include %} and "
+            "{% extends %}. The directories of the rendered templates are "
+            "always searched."
+        ),
+    )
+    watch = parser.add_argument_group(
+        "watch mode",
+        "Keep running and re-render whenever a template or task output changes.",
+    )
+    watch.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        help=(
+            "Re-render outputs whose template, included or extended "
+            "templates, or task output file changed."
+        ),
+    )
+    watch.add_argument(
+        "--poll",
+        action="store_true",
+        help="Poll for changes even if the watchfiles package is installed.",
+    )
+    watch.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="Seconds between checks when polling for changes.",
+    )
+    batch = parser.add_argument_group(
+        "batch mode",
+        "Render many template and task output combinations in one process.",
+    )
+    batch.add_argument(
+        "--manifest",
+        type=Path,
+        help=(
+            "JSON manifest listing renders as objects with 'template', "
+            "'fixture', and optional 'result_type' and 'output' keys. Paths "
+            "are relative to the manifest."
+        ),
+    )
+    batch.add_argument(
+        "--templates",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Glob of template files to render against every fixture.",
+    )
+    batch.add_argument(
+        "--fixtures",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Glob of task output JSON files to render every template with.",
+    )
+    batch.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        help=(
+            f"Directory for rendered outputs and the {SUMMARY_FILENAME} timing summary."
+        ),
+    )
+    batch.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: render in this process).",
     )
     return parser
 
 
 class RenderNotificationHandler(RenderedTemplateNotificationHandler):
-    def __init__(self, *, template_path: Path, stream: TextIO | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        template_path: Path,
+        stream: TextIO | None = None,
+        jinja_env: Environment | None = None,
+        template_cache: TemplateCache | None = None,
+        template_ttl: float | None = None,
+    ) -> None:
         super().__init__(
-            template_providers={"body": FileTemplateProvider(template_path)}
+            template_providers={"body": FileTemplateProvider(template_path)},
+            jinja_env=jinja_env,
+            template_cache=template_cache,
+            template_ttl=template_ttl,
         )
         self.stream = stream or sys.stdout
 
@@ -61,22 +176,32 @@ class RenderNotificationHandler(RenderedTemplateNotificationHandler):
         print(rendered["body"], file=self.stream)
 
     def render_payload(self, *, payload_json: str, result_type: str) -> None:
-        event = {
-            "Records": [
-                {
-                    "body": payload_json,
-                    "eventSource": "aws:sqs",
-                    "messageAttributes": {
-                        "result_type": {
-                            "DataType": "String",
-                            "StringValue": result_type,
-                        }
-                    },
-                }
-            ]
-        }
+        event = {"Records": [build_render_record(payload_json, result_type)]}
         self.lambda_handler(event=event, context=None)
 
+    def render(self, *, payload_json: str, result_type: str) -> str:
+        record = build_render_record(payload_json, result_type)
+        self._validate_record(record)
+        result = self._parse_result(record)
+        templates = {
+            name: provider.get_template()
+            for name, provider in self.template_providers.items()
+        }
+        return self._render_templates(templates, result)["body"]
+
+
+def build_render_record(payload_json: str, result_type: str) -> dict[str, Any]:
+    return {
+        "body": payload_json,
+        "eventSource": "aws:sqs",
+        "messageAttributes": {
+            "result_type": {
+                "DataType": "String",
+                "StringValue": result_type,
+            }
+        },
+    }
+
 
 def read_payload_json(source: str, *, stdin: TextIO) -> str:
     if source == "-":
@@ -88,12 +213,22 @@ def read_payload_json(source: str, *, stdin: TextIO) -> str:
 
 
 def extract_result_payload(payload_json: str, *, result_type: str) -> str:
+    return select_result_payload(
+        load_task_output(payload_json), result_type=result_type
+    )
+
+
+def load_task_output(payload_json: str) -> dict[str, Any]:
     try:
         payload = json.loads(payload_json)
     except json.JSONDecodeError as exc:
         raise ValueError("Task output must be valid JSON") from exc
     if not isinstance(payload, dict):
         raise ValueError("Task output must be a JSON object keyed by result type")
+    return payload
+
+
+def select_result_payload(payload: Mapping[str, Any], *, result_type: str) -> str:
     selected = payload.get(result_type)
     if not isinstance(selected, Mapping):
         raise ValueError(
@@ -106,15 +241,507 @@ def extract_result_payload(payload_json: str, *, result_type: str) -> str:
     return json.dumps(payload_for_publish)
 
 
+class RenderJob(NamedTuple):
+    template: Path
+    fixture: Path
+    result_type: str
+    output: Path
+
+
+class RenderOutcome(NamedTuple):
+    job: RenderJob
+    seconds: float
+    error: Optional[str]
+
+
+class BatchRenderer:
+    # One Jinja environment and compiled-template cache shared by every
+    # template, and each fixture parsed once, for the life of the process.
+    def __init__(self, search_path: Sequence[Path] = ()) -> None:
+        self.search_path = list(search_path)
+        self.jinja_env = build_jinja_env(self.search_path)
+        self.template_cache = TemplateCache(maxsize=_BATCH_TEMPLATE_CACHE_SIZE)
+        self._handlers: dict[Path, RenderNotificationHandler] = {}
+        self._fixtures: dict[Path, dict[str, Any]] = {}
+
+    def render(self, job: RenderJob) -> str:
+        handler = self._handlers.get(job.template)
+        if handler is None:
+            handler = RenderNotificationHandler(
+                template_path=job.template,
+                jinja_env=self.jinja_env,
+                template_cache=self.template_cache,
+                template_ttl=float("inf"),
+            )
+            self._handlers[job.template] = handler
+        payload_json = select_result_payload(
+            self._fixture(job.fixture), result_type=job.result_type
+        )
+        return handler.render(payload_json=payload_json, result_type=job.result_type)
+
+    def dependencies(self, template: Path) -> set[Path]:
+        # The template plus everything it includes, extends, or imports,
+        # followed transitively. Dynamic template names cannot be resolved
+        # statically and are skipped.
+        found: set[Path] = set()
+        pending = [template.resolve()]
+        while pending:
+            path = pending.pop()
+            if path in found:
+                continue
+            found.add(path)
+            try:
+                ast = self.jinja_env.parse(path.read_text(encoding="utf-8"))
+            except (OSError, TemplateSyntaxError):
+                continue
+            for name in meta.find_referenced_templates(ast):
+                resolved = self._resolve_template(name) if name else None
+                if resolved is not None:
+                    pending.append(resolved)
+        return found
+
+    def invalidate(self, path: Path) -> None:
+        path = path.resolve()
+        for fixture in [f for f in self._fixtures if f.resolve() == path]:
+            del self._fixtures[fixture]
+        for template, handler in self._handlers.items():
+            if template.resolve() == path:
+                for provider in handler.template_providers.values():
+                    provider.invalidate()
+
+    def _fixture(self, path: Path) -> dict[str, Any]:
+        fixture = self._fixtures.get(path)
+        if fixture is None:
+            fixture = load_task_output(path.read_text(encoding="utf-8"))
+            self._fixtures[path] = fixture
+        return fixture
+
+    def _resolve_template(self, name: str) -> Optional[Path]:
+        for root in self.search_path:
+            candidate = root / name
+            if candidate.is_file():
+                return candidate.resolve()
+        return None
+
+
+def build_jinja_env(search_path: Sequence[Path]) -> Environment:
+    # Included and extended templates are loaded from the search path;
+    # Jinja reloads them when their files change.
+    return Environment(
+        undefined=StrictUndefined,
+        loader=FileSystemLoader([str(path) for path in search_path]),
+    )
+
+
+def template_search_path(
+    templates: Iterable[Path], template_dirs: Sequence[Path] = ()
+) -> list[Path]:
+    search_path = dict.fromkeys(template_dirs)
+    search_path.update(dict.fromkeys(template.parent for template in templates))
+    return list(search_path)
+
+
+def default_output_path(template: Path, fixture: Path, result_type: str) -> Path:
+    return Path(fixture.stem) / result_type / template.name
+
+
+def load_manifest(path: Path, *, result_type: Optional[str] = None) -> list[RenderJob]:
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Manifest {path} must be valid JSON") from exc
+    entries = manifest.get("renders") if isinstance(manifest, dict) else manifest
+    if not isinstance(entries, list):
+        raise ValueError(
+            "Manifest must be a list of renders or an object with 'renders'"
+        )
+    root = path.parent
+    jobs = []
+    for entry in entries:
+        if (
+            not isinstance(entry, dict)
+            or "template" not in entry
+            or "fixture" not in entry
+        ):
+            raise ValueError("Manifest entries must include 'template' and 'fixture'")
+        template = root / entry["template"]
+        fixture = root / entry["fixture"]
+        entry_result_type = entry.get("result_type")
+        if entry_result_type is None:
+            expanded = _fixture_jobs(template, fixture, result_type)
+            if "output" in entry and len(expanded) != 1:
+                raise ValueError(
+                    f"Manifest entry for {entry['template']} sets 'output' but "
+                    "renders several result types; add 'result_type'"
+                )
+        elif result_type is None or entry_result_type == result_type:
+            expanded = [
+                RenderJob(
+                    template,
+                    fixture,
+                    entry_result_type,
+                    default_output_path(template, fixture, entry_result_type),
+                )
+            ]
+        else:
+            expanded = []
+        if "output" in entry and expanded:
+            expanded = [expanded[0]._replace(output=Path(entry["output"]))]
+        jobs.extend(expanded)
+    return jobs
+
+
+def discover_jobs(
+    *,
+    template_globs: Sequence[str],
+    fixture_globs: Sequence[str],
+    result_type: Optional[str] = None,
+) -> list[RenderJob]:
+    templates = _expand_globs(template_globs, "template")
+    fixtures = _expand_globs(fixture_globs, "fixture")
+    return [
+        job
+        for fixture in fixtures
+        for template in templates
+        for job in _fixture_jobs(template, fixture, result_type)
+    ]
+
+
+def render_batch(
+    jobs: Sequence[RenderJob],
+    *,
+    output_dir: Path,
+    workers: int = 1,
+    template_dirs: Sequence[Path] = (),
+) -> list[RenderOutcome]:
+    if workers < 1:
+        raise ValueError("jobs must be at least 1")
+    _check_unique_outputs(jobs)
+    search_path = template_search_path((job.template for job in jobs), template_dirs)
+    if workers == 1 or len(jobs) <= 1:
+        renderer = BatchRenderer(search_path)
+        return [_run_job(renderer, job, output_dir) for job in jobs]
+    # Jobs for the same template stay together so each worker compiles as
+    # few templates as possible.
+    ordered = sorted(jobs, key=lambda job: (str(job.template), str(job.fixture)))
+    chunksize = max(1, len(ordered) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(search_path,)
+    ) as pool:
+        outcomes = list(
+            pool.map(
+                _render_in_worker,
+                ordered,
+                [output_dir] * len(ordered),
+                chunksize=chunksize,
+            )
+        )
+    by_job = {outcome.job: outcome for outcome in outcomes}
+    return [by_job[job] for job in jobs]
+
+
+def write_summary(
+    outcomes: Sequence[RenderOutcome],
+    *,
+    output_dir: Path,
+    elapsed: float,
+    stream: TextIO,
+) -> None:
+    failures = [outcome for outcome in outcomes if outcome.error]
+    summary = {
+        "rendered": len(outcomes) - len(failures),
+        "failed": len(failures),
+        "elapsed_seconds": round(elapsed, 6),
+        "render_seconds": round(sum(outcome.seconds for outcome in outcomes), 6),
+        "renders": [
+            {
+                "template": str(outcome.job.template),
+                "fixture": str(outcome.job.fixture),
+                "result_type": outcome.job.result_type,
+                "output": str(outcome.job.output),
+                "seconds": round(outcome.seconds, 6),
+                "error": outcome.error,
+            }
+            for outcome in outcomes
+        ],
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / SUMMARY_FILENAME).write_text(
+        json.dumps(summary, indent=2) + "\n", encoding="utf-8"
+    )
+    for outcome in failures:
+        print(
+            f"error: {outcome.job.template} with {outcome.job.fixture} "
+            f"({outcome.job.result_type}): {outcome.error}",
+            file=sys.stderr,
+        )
+    slowest = max(outcomes, key=lambda outcome: outcome.seconds, default=None)
+    line = (
+        f"Rendered {summary['rendered']} of {len(outcomes)} in {elapsed:.3f}s "
+        f"({summary['failed']} failed)"
+    )
+    if slowest is not None:
+        line += f"; slowest {slowest.job.output} {slowest.seconds * 1000:.1f}ms"
+    print(line, file=stream)
+
+
+def watch_render(
+    jobs: Sequence[RenderJob],
+    *,
+    output_dir: Optional[Path],
+    template_dirs: Sequence[Path] = (),
+    changes: Optional[Callable[[Callable[[], set[Path]]], Iterable[set[Path]]]] = None,
+    stream: Optional[TextIO] = None,
+) -> None:
+    if output_dir is not None:
+        _check_unique_outputs(jobs)
+    search_path = template_search_path((job.template for job in jobs), template_dirs)
+    renderer = BatchRenderer(search_path)
+    watched: dict[RenderJob, set[Path]] = {}
+
+    def render(selected: Sequence[RenderJob]) -> None:
+        start = time.perf_counter()
+        outcomes = [_run_job(renderer, job, output_dir, stream) for job in selected]
+        for job in selected:
+            watched[job] = renderer.dependencies(job.template) | {job.fixture.resolve()}
+        _report_watch(outcomes, elapsed=time.perf_counter() - start)
+
+    def watched_paths() -> set[Path]:
+        return set().union(*watched.values())
+
+    render(jobs)
+    changes = changes or watch_changes
+    for changed in changes(watched_paths):
+        for path in changed:
+            renderer.invalidate(path)
+        affected = [job for job in jobs if watched[job] & changed]
+        if affected:
+            render(affected)
+
+
+def watch_changes(
+    get_paths: Callable[[], set[Path]],
+    *,
+    interval: float = DEFAULT_POLL_INTERVAL,
+    polling: bool = False,
+) -> Iterator[set[Path]]:
+    # Uses inotify (or the platform equivalent) through the optional
+    # watchfiles package, and falls back to polling file stats.
+    if not polling:
+        try:
+            import watchfiles
+        except ImportError:
+            pass
+        else:
+            roots = sorted({str(path.parent) for path in get_paths()})
+            for events in watchfiles.watch(*roots):
+                changed = {Path(name).resolve() for _, name in events}
+                changed &= get_paths()
+                if changed:
+                    yield changed
+            return
+    yield from _poll_changes(get_paths, interval)
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    try:
+        if args.manifest is not None:
+            jobs = load_manifest(args.manifest, result_type=args.result_type)
+        else:
+            jobs = discover_jobs(
+                template_globs=args.templates,
+                fixture_globs=args.fixtures,
+                result_type=args.result_type,
+            )
+        if args.watch:
+            return run_watch(args, jobs, output_dir=args.output_dir)
+        start = time.perf_counter()
+        outcomes = render_batch(
+            jobs,
+            output_dir=args.output_dir,
+            workers=args.jobs,
+            template_dirs=args.template_dir,
+        )
+        elapsed = time.perf_counter() - start
+        write_summary(
+            outcomes, output_dir=args.output_dir, elapsed=elapsed, stream=sys.stdout
+        )
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 1 if any(outcome.error for outcome in outcomes) else 0
+
+
+def run_watch(
+    args: argparse.Namespace,
+    jobs: Sequence[RenderJob],
+    *,
+    output_dir: Optional[Path],
+) -> int:
+    def changes(get_paths: Callable[[], set[Path]]) -> Iterator[set[Path]]:
+        return watch_changes(get_paths, interval=args.poll_interval, polling=args.poll)
+
+    print("Watching for changes; press Ctrl+C to stop.", file=sys.stderr)
+    try:
+        watch_render(
+            jobs,
+            output_dir=output_dir,
+            template_dirs=args.template_dir,
+            changes=changes,
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _fixture_jobs(
+    template: Path, fixture: Path, result_type: Optional[str]
+) -> list[RenderJob]:
+    if result_type is not None:
+        result_types: Iterable[str] = [result_type]
+    else:
+        result_types = load_task_output(fixture.read_text(encoding="utf-8"))
+    return [
+        RenderJob(template, fixture, name, default_output_path(template, fixture, name))
+        for name in result_types
+    ]
+
+
+def _expand_globs(patterns: Sequence[str], kind: str) -> list[Path]:
+    paths: dict[Path, None] = {}
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        if not matches:
+            raise ValueError(f"No {kind} files match '{pattern}'")
+        paths.update((Path(match), None) for match in matches)
+    return list(paths)
+
+
+def _check_unique_outputs(jobs: Sequence[RenderJob]) -> None:
+    seen: dict[Path, RenderJob] = {}
+    for job in jobs:
+        other = seen.setdefault(job.output, job)
+        if other is not job:
+            raise ValueError(
+                f"Renders of {other.template} with {other.fixture} and "
+                f"{job.template} with {job.fixture} both write {job.output}"
+            )
+
+
+def _run_job(
+    renderer: BatchRenderer,
+    job: RenderJob,
+    output_dir: Optional[Path],
+    stream: Optional[TextIO] = None,
+) -> RenderOutcome:
+    start = time.perf_counter()
+    try:
+        body = renderer.render(job)
+        if output_dir is None:
+            print(body, file=stream or sys.stdout)
+        else:
+            path = output_dir / job.output
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(body, encoding="utf-8")
+    except (OSError, ValueError, TemplateError) as exc:
+        return RenderOutcome(job, time.perf_counter() - start, str(exc))
+    return RenderOutcome(job, time.perf_counter() - start, None)
+
+
+_WORKER_RENDERER: Optional[BatchRenderer] = None
+
+
+def _init_worker(search_path: Sequence[Path]) -> None:
+    global _WORKER_RENDERER
+    _WORKER_RENDERER = BatchRenderer(search_path)
+
+
+def _render_in_worker(job: RenderJob, output_dir: Path) -> RenderOutcome:
+    return _run_job(_WORKER_RENDERER, job, output_dir)
+
+
+def _report_watch(outcomes: Sequence[RenderOutcome], *, elapsed: float) -> None:
+    failures = [outcome for outcome in outcomes if outcome.error]
+    for outcome in failures:
+        print(
+            f"error: {outcome.job.template} with {outcome.job.fixture} "
+            f"({outcome.job.result_type}): {outcome.error}",
+            file=sys.stderr,
+        )
+    print(
+        f"Rendered {len(outcomes) - len(failures)} of {len(outcomes)} in "
+        f"{elapsed:.3f}s ({len(failures)} failed)",
+        file=sys.stderr,
+    )
+
+
+def _poll_changes(
+    get_paths: Callable[[], set[Path]], interval: float
+) -> Iterator[set[Path]]:
+    snapshot = _stat_files(get_paths())
+    while True:
+        time.sleep(interval)
+        current = _stat_files(get_paths())
+        # Paths that only just started being watched are recorded, not
+        # reported; their jobs were rendered when they were discovered.
+        changed = {path for path in snapshot if current.get(path) != snapshot[path]}
+        snapshot = current
+        if changed:
+            yield changed
+
+
+def _stat_files(paths: Iterable[Path]) -> dict[Path, Optional[tuple[int, int]]]:
+    stats: dict[Path, Optional[tuple[int, int]]] = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            stats[path] = None
+        else:
+            stats[path] = (stat.st_mtime_ns, stat.st_size)
+    return stats
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    if args.manifest is not None or args.templates or args.fixtures:
+        if args.manifest is not None and (args.templates or args.fixtures):
+            parser.error("--manifest cannot be combined with --templates/--fixtures")
+        if args.manifest is None and not (args.templates and args.fixtures):
+            parser.error("--templates and --fixtures must be used together")
+        if args.output_dir is None:
+            parser.error("batch mode requires --output-dir")
+        if args.template is not None:
+            parser.error("-t/--template cannot be used in batch mode")
+        if args.watch and args.jobs != 1:
+            parser.error("--watch renders in a single process; drop --jobs")
+        return run_batch(args)
+    if args.template is None or args.result_type is None:
+        parser.error(
+            "the following arguments are required: -t/--template, -r/--result-type"
+        )
+    if args.watch:
+        if args.output_json == "-":
+            parser.error("--watch needs a task output file, not stdin")
+        job = RenderJob(
+            args.template,
+            Path(args.output_json),
+            args.result_type,
+            Path(args.template.name),
+        )
+        return run_watch(args, [job], output_dir=None)
     try:
         payload_json = read_payload_json(args.output_json, stdin=sys.stdin)
         payload_json = extract_result_payload(
             payload_json, result_type=args.result_type
         )
-        handler = RenderNotificationHandler(template_path=args.template)
+        handler = RenderNotificationHandler(
+            template_path=args.template,
+            jinja_env=build_jinja_env(
+                template_search_path([args.template], args.template_dir)
+            ),
+        )
         handler.render_payload(payload_json=payload_json, result_type=args.result_type)
     except (OSError, ValueError, TemplateError) as exc:
         print(f"error: {exc}", file=sys.stderr)
@@ -0,0 +1,327 @@
+import contextlib
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from pathlib import Path
+from typing import Any, ContextManager, Iterator, Mapping, Optional
+
+TRACER_ENV_VAR = "LAMBDACRON_TRACER"
+PROFILERS = ("cprofile", "pyinstrument")
+# Shared by every disabled span so the default tracer allocates nothing.
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class Tracer:
+    """
+    Hooks around the stages of a task or notification handler invocation.
+
+    The base class does nothing and is the default. Subclasses override
+    :meth:`invocation` and :meth:`span` to time or profile the work done in
+    each stage.
+
+    Scheduled tasks open ``perform``, ``build_payload`` and ``publish``
+    spans. When a task yields its results, ``perform`` stays open until the
+    last one is produced, so it overlaps the spans for publishing them.
+    Notification handlers open ``validate``, ``parse``, ``render``
+    and ``notify`` spans for each record. ``build_payload`` and ``publish``
+    spans may run on worker threads.
+    """
+
+    def invocation(self, name: str) -> ContextManager[Any]:
+        """
+        Return a context manager wrapping one whole invocation.
+
+        Parameters
+        ----------
+        name : str
+            Name of the task or handler class being invoked.
+
+        Returns
+        -------
+        ContextManager[Any]
+            Context manager entered for the duration of the invocation.
+        """
+        return _NULL_CONTEXT
+
+    def span(
+        self, name: str, attributes: Optional[Mapping[str, Any]] = None
+    ) -> ContextManager[Any]:
+        """
+        Return a context manager wrapping one stage of an invocation.
+
+        Parameters
+        ----------
+        name : str
+            Stage name, such as ``render`` or ``publish``.
+        attributes : Mapping[str, Any], optional
+            Details about the stage, such as the template name.
+
+        Returns
+        -------
+        ContextManager[Any]
+            Context manager entered for the duration of the stage.
+        """
+        return _NULL_CONTEXT
+
+
+class ProfilingTracer(Tracer):
+    """
+    Profile invocations and log where their time went.
+
+    Each profiled invocation logs a ``profile_report`` with the total time
+    spent in each span and the profiler's report. Only the first
+    ``invocations`` invocations of an execution environment are profiled,
+    so profiling can be switched on for a deployment without slowing every
+    call.
+
+    Parameters
+    ----------
+    profiler : str, optional
+        ``"cprofile"`` (deterministic, in the standard library) or
+        ``"pyinstrument"`` (sampling, requires the ``pyinstrument`` package).
+    invocations : int, optional
+        Number of invocations to profile.
+    output_dir : pathlib.Path, optional
+        If set, also write each profile to this directory (``.prof`` files
+        for cProfile, HTML for pyinstrument).
+    top : int, optional
+        Number of functions included in a cProfile report.
+    logger : logging.Logger, optional
+        Logger used for the reports.
+    """
+
+    def __init__(
+        self,
+        profiler: str = "cprofile",
+        *,
+        invocations: int = 1,
+        output_dir: Optional[Path] = None,
+        top: int = 25,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        if profiler not in PROFILERS:
+            raise ValueError(
+                f"Unsupported profiler '{profiler}'; expected one of {PROFILERS}"
+            )
+        if profiler == "pyinstrument":
+            _pyinstrument()
+        if invocations < 1:
+            raise ValueError("invocations must be at least 1")
+        self.profiler = profiler
+        self.invocations = invocations
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        self.top = top
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.profiled = 0
+        self._spans: Optional[dict[str, float]] = None
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def invocation(self, name: str) -> Iterator[None]:
+        """
+        Profile the invocation if the profiling budget is not used up.
+
+        Parameters
+        ----------
+        name : str
+            Name of the task or handler class being invoked.
+        """
+        if self.profiled >= self.invocations:
+            yield
+            return
+        self.profiled += 1
+        self._spans = {}
+        start = time.perf_counter()
+        session = self._start_profiler()
+        try:
+            yield
+        finally:
+            report = self._stop_profiler(session, name)
+            spans, self._spans = self._spans, None
+            self.logger.info(
+                "profile_report",
+                extra={
+                    "invocation": name,
+                    "profiler": self.profiler,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                    "spans_ms": {
+                        span: round(seconds * 1000, 3)
+                        for span, seconds in spans.items()
+                    },
+                    "report": report,
+                },
+            )
+
+    def span(
+        self, name: str, attributes: Optional[Mapping[str, Any]] = None
+    ) -> ContextManager[Any]:
+        """
+        Time a stage while an invocation is being profiled.
+
+        Parameters
+        ----------
+        name : str
+            Stage name.
+        attributes : Mapping[str, Any], optional
+            Ignored.
+
+        Returns
+        -------
+        ContextManager[Any]
+            Context manager timing the stage.
+        """
+        if self._spans is None:
+            return _NULL_CONTEXT
+        return self._timed_span(name)
+
+    @contextlib.contextmanager
+    def _timed_span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                if self._spans is not None:
+                    self._spans[name] = self._spans.get(name, 0.0) + elapsed
+
+    def _start_profiler(self) -> Any:
+        if self.profiler == "pyinstrument":
+            session = _pyinstrument().Profiler()
+            session.start()
+        else:
+            session = cProfile.Profile()
+            session.enable()
+        return session
+
+    def _stop_profiler(self, session: Any, name: str) -> str:
+        if self.profiler == "pyinstrument":
+            session.stop()
+            if self.output_dir is not None:
+                self._output_path(name, "html").write_text(
+                    session.output_html(), encoding="utf-8"
+                )
+            return session.output_text()
+        session.disable()
+        if self.output_dir is not None:
+            session.dump_stats(self._output_path(name, "prof"))
+        stream = io.StringIO()
+        stats = pstats.Stats(session, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        return stream.getvalue()
+
+    def _output_path(self, name: str, suffix: str) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        return self.output_dir / f"{name}-{int(time.time() * 1000)}.{suffix}"
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Report invocations and stages as OpenTelemetry spans.
+
+    Parameters
+    ----------
+    tracer : opentelemetry.trace.Tracer, optional
+        Tracer used to create spans. Defaults to the ``lambdacron`` tracer
+        from the globally configured tracer provider, which requires the
+        ``opentelemetry-api`` package.
+    """
+
+    def __init__(self, tracer: Optional[Any] = None) -> None:
+        if tracer is None:
+            tracer = _opentelemetry_trace().get_tracer("lambdacron")
+        self.tracer = tracer
+
+    def invocation(self, name: str) -> ContextManager[Any]:
+        """
+        Open a span covering the invocation.
+
+        Parameters
+        ----------
+        name : str
+            Name of the task or handler class being invoked.
+
+        Returns
+        -------
+        ContextManager[Any]
+            The span's context manager.
+        """
+        return self.tracer.start_as_current_span(name)
+
+    def span(
+        self, name: str, attributes: Optional[Mapping[str, Any]] = None
+    ) -> ContextManager[Any]:
+        """
+        Open a child span for a stage.
+
+        Parameters
+        ----------
+        name : str
+            Stage name.
+        attributes : Mapping[str, Any], optional
+            Span attributes.
+
+        Returns
+        -------
+        ContextManager[Any]
+            The span's context manager.
+        """
+        return self.tracer.start_as_current_span(
+            f"lambdacron.{name}", attributes=attributes
+        )
+
+
+def load_tracer(env_var: str = TRACER_ENV_VAR) -> Tracer:
+    """
+    Build a tracer from the environment.
+
+    Parameters
+    ----------
+    env_var : str, optional
+        Environment variable naming the tracer: ``cprofile`` or
+        ``pyinstrument`` for a :class:`ProfilingTracer` of the first
+        invocation, or ``opentelemetry`` for an :class:`OpenTelemetryTracer`.
+
+    Returns
+    -------
+    Tracer
+        The configured tracer, or a no-op :class:`Tracer` if the environment
+        variable is unset.
+
+    Raises
+    ------
+    ValueError
+        If the environment variable names an unknown tracer.
+    """
+    name = os.environ.get(env_var, "").strip().lower()
+    if not name:
+        return Tracer()
+    if name in PROFILERS:
+        return ProfilingTracer(name)
+    if name == "opentelemetry":
+        return OpenTelemetryTracer()
+    raise ValueError(f"Unsupported tracer '{name}' in {env_var}")
+
+
+def _pyinstrument() -> Any:
+    try:
+        import pyinstrument
+    except ImportError as exc:
+        raise ValueError(
+            "pyinstrument profiling requires the pyinstrument package"
+        ) from exc
+    return pyinstrument
+
+
+def _opentelemetry_trace() -> Any:
+    try:
+        from opentelemetry import trace
+    except ImportError as exc:
+        raise ValueError(
+            "OpenTelemetry tracing requires the opentelemetry-api package"
+        ) from exc
+    return trace
@@ -0,0 +1,245 @@
+import base64
+import gzip
+import json
+import os
+import threading
+import uuid
+from typing import Any, Mapping, Optional
+
+from lambdacron.clients import get_client
+
+TRANSPORT_KEY = "lambdacron_transport"
+COMPRESSIONS = ("gzip", "zstd")
+_OBJECT_SUFFIXES = {None: ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+
+
+class PayloadTransport:
+    """
+    Compress large result messages and offload the largest ones to S3.
+
+    Messages smaller than ``compress_threshold`` bytes are sent unchanged.
+    Larger messages are compressed and base64-encoded into a small JSON
+    envelope. If that envelope would still exceed ``offload_threshold``
+    bytes and an S3 bucket is configured, the (compressed) message is stored
+    in S3 and only a pointer is published, following the SNS extended client
+    pattern. Offloaded objects are not deleted by consumers, since a topic
+    can fan out to several queues; use an S3 lifecycle rule to expire them.
+
+    Parameters
+    ----------
+    compression : str, optional
+        Compression codec, ``gzip`` or ``zstd``. ``zstd`` requires the
+        ``zstandard`` package.
+    compress_threshold : int, optional
+        Message size in bytes at which compression is applied.
+    offload_threshold : int, optional
+        Encoded message size in bytes above which the message is stored in
+        S3. SNS rejects messages larger than 256 KiB including attributes.
+    s3_bucket : str, optional
+        Bucket used for offloaded messages. Without a bucket, messages are
+        never offloaded.
+    s3_prefix : str, optional
+        Key prefix for offloaded messages.
+    s3_client : botocore.client.BaseClient, optional
+        S3 client used to store and fetch offloaded messages. Defaults to
+        the shared client from :func:`lambdacron.clients.get_client`,
+        created on first use.
+    """
+
+    def __init__(
+        self,
+        *,
+        compression: str = "gzip",
+        compress_threshold: int = 32 * 1024,
+        offload_threshold: int = 200 * 1024,
+        s3_bucket: Optional[str] = None,
+        s3_prefix: str = "lambdacron/payloads/",
+        s3_client: Optional[Any] = None,
+    ) -> None:
+        if compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unsupported compression '{compression}' (expected one of: "
+                + ", ".join(COMPRESSIONS)
+                + ")"
+            )
+        if compress_threshold < 0 or offload_threshold < 0:
+            raise ValueError("thresholds must be non-negative")
+        if compression == "zstd":
+            _zstandard()
+        self.compression = compression
+        self.compress_threshold = compress_threshold
+        self.offload_threshold = offload_threshold
+        self.s3_bucket = s3_bucket
+        self.s3_prefix = s3_prefix
+        self._s3_client = s3_client
+        self._s3_client_lock = threading.Lock()
+
+    @property
+    def s3_client(self) -> Any:
+        """
+        S3 client used for offloaded messages, created on first access.
+        """
+        with self._s3_client_lock:
+            if self._s3_client is None:
+                self._s3_client = get_client("s3")
+            return self._s3_client
+
+    @staticmethod
+    def is_envelope(payload: Any) -> bool:
+        """
+        Return whether a decoded message is a transport envelope.
+
+        Parameters
+        ----------
+        payload : Any
+            Decoded JSON message.
+
+        Returns
+        -------
+        bool
+            ``True`` if the message was produced by :meth:`encode` and must
+            be passed to :meth:`decode`.
+        """
+        return isinstance(payload, dict) and TRANSPORT_KEY in payload
+
+    def encode(self, message: str, *, result_type: str) -> str:
+        """
+        Return the message to publish for a serialized result payload.
+
+        Parameters
+        ----------
+        message : str
+            JSON-serialized result payload.
+        result_type : str
+            Result type, used to name offloaded S3 objects.
+
+        Returns
+        -------
+        str
+            The original message, or a JSON transport envelope.
+        """
+        raw = message.encode("utf-8")
+        if len(raw) < self.compress_threshold:
+            return message
+        compression: Optional[str] = self.compression
+        data = _compress(raw, self.compression)
+        if len(data) >= len(raw):
+            compression, data = None, raw
+        if compression is not None:
+            envelope = _dump_envelope(
+                {
+                    "encoding": compression,
+                    "data": base64.b64encode(data).decode("ascii"),
+                }
+            )
+        else:
+            envelope = message
+        if self.s3_bucket is None or len(envelope.encode("utf-8")) <= (
+            self.offload_threshold
+        ):
+            return envelope
+        key = (
+            f"{self.s3_prefix}{result_type}/{uuid.uuid4().hex}"
+            f"{_OBJECT_SUFFIXES[compression]}"
+        )
+        self.s3_client.put_object(
+            Bucket=self.s3_bucket,
+            Key=key,
+            Body=data,
+            ContentType="application/json",
+        )
+        return _dump_envelope(
+            {
+                "encoding": compression or "identity",
+                "s3_bucket": self.s3_bucket,
+                "s3_key": key,
+            }
+        )
+
+    def decode(self, payload: Mapping[str, Any]) -> str:
+        """
+        Recover the original serialized message from a transport envelope.
+
+        Parameters
+        ----------
+        payload : Mapping[str, Any]
+            Decoded transport envelope.
+
+        Returns
+        -------
+        str
+            JSON-serialized result payload.
+
+        Raises
+        ------
+        ValueError
+            If the envelope is malformed or uses an unknown encoding.
+        """
+        envelope = payload.get(TRANSPORT_KEY)
+        if not isinstance(envelope, dict):
+            raise ValueError("Transport envelope must be a JSON object")
+        encoding = envelope.get("encoding")
+        if "s3_key" in envelope:
+            response = self.s3_client.get_object(
+                Bucket=envelope.get("s3_bucket"), Key=envelope["s3_key"]
+            )
+            data = response["Body"].read()
+        elif isinstance(envelope.get("data"), str):
+            try:
+                data = base64.b64decode(envelope["data"], validate=True)
+            except ValueError as exc:
+                raise ValueError("Transport envelope data must be base64") from exc
+        else:
+            raise ValueError("Transport envelope must include data or an S3 key")
+        if encoding != "identity":
+            data = _decompress(data, encoding)
+        return data.decode("utf-8")
+
+
+def load_payload_transport(
+    env_var: str = "LAMBDACRON_PAYLOAD_BUCKET",
+) -> Optional[PayloadTransport]:
+    """
+    Build a payload transport from the environment.
+
+    Parameters
+    ----------
+    env_var : str, optional
+        Environment variable holding the S3 bucket for offloaded payloads.
+
+    Returns
+    -------
+    PayloadTransport or None
+        A gzip transport that offloads to the configured bucket, or ``None``
+        if the environment variable is unset.
+    """
+    bucket = os.environ.get(env_var)
+    if not bucket:
+        return None
+    return PayloadTransport(s3_bucket=bucket)
+
+
+def _dump_envelope(envelope: Mapping[str, Any]) -> str:
+    return json.dumps({TRANSPORT_KEY: envelope})
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    return _zstandard().ZstdCompressor().compress(data)
+
+
+def _decompress(data: bytes, compression: Any) -> bytes:
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "zstd":
+        return _zstandard().ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unsupported transport encoding: {compression}")
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ValueError("zstd compression requires the zstandard package") from exc
+    return zstandard
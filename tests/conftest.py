@@ -1,6 +1,16 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SRC_ROOT = PROJECT_ROOT / "src"
 sys.path.insert(0, str(SRC_ROOT))
+
+
+@pytest.fixture(autouse=True)
+def isolated_bytecode_cache(tmp_path_factory, monkeypatch):
+    # Keep compiled template bytecode out of the shared temporary directory.
+    monkeypatch.setenv(
+        "LAMBDACRON_BYTECODE_CACHE_DIR", str(tmp_path_factory.mktemp("bytecode"))
+    )
@@ -1,13 +1,30 @@
+import contextlib
+import io
 import json
 import logging
+import os
+import stat
+import threading
+import time
 
 import pytest
+from jinja2 import Environment
 
 from lambdacron.notifications.base import (
+    CachingTemplateProvider,
     EnvVarTemplateProvider,
     FileTemplateProvider,
     RenderedTemplateNotificationHandler,
+    TemplateBytecodeCache,
+    TemplateCache,
+    TemplateProvider,
+    TemplateProviderLoader,
+    load_bytecode_cache,
 )
+from lambdacron.idempotency import IdempotencyLedger, SQLiteIdempotencyStore
+from lambdacron.metrics import MetricsRecorder
+from lambdacron.tracing import Tracer
+from lambdacron.transport import PayloadTransport
 
 
 class CapturingHandler(RenderedTemplateNotificationHandler):
@@ -19,6 +36,28 @@ class CapturingHandler(RenderedTemplateNotificationHandler):
         self.calls.append({"result": result, "rendered": rendered, "record": record})
 
 
+class CountingProvider(TemplateProvider):
+    def __init__(self, template="Hello {{ name }}", version=None):
+        self.template = template
+        self.version = version
+        self.fetches = 0
+
+    def get_template(self):
+        self.fetches += 1
+        return self.template
+
+    def get_version(self):
+        return self.version
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
 def build_sqs_event(
     body,
     *,
@@ -250,3 +289,638 @@ def test_notification_handler_rejects_result_type_mismatch(monkeypatch):
     response = handler.lambda_handler(event, context=None)
 
     assert response == {"batchItemFailures": [{"itemIdentifier": "msg-123"}]}
+
+
+def test_template_cache_reuses_compiled_templates():
+    cache = TemplateCache()
+    env = Environment()
+
+    first = cache.get(env, "body", "Hello {{ name }}")
+    second = cache.get(env, "body", "Hello {{ name }}")
+
+    assert first is second
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_template_cache_recompiles_changed_source():
+    cache = TemplateCache()
+    env = Environment()
+
+    first = cache.get(env, "body", "Hello {{ name }}")
+    second = cache.get(env, "body", "Goodbye {{ name }}")
+
+    assert first is not second
+    assert second.render(name="Ada") == "Goodbye Ada"
+    assert cache.misses == 2
+
+
+def test_template_cache_evicts_least_recently_used():
+    cache = TemplateCache(maxsize=2)
+    env = Environment()
+    cache.get(env, "a", "A")
+    cache.get(env, "b", "B")
+    cache.get(env, "a", "A")
+
+    cache.get(env, "c", "C")
+    cache.get(env, "a", "A")
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.hits == 2
+    cache.get(env, "b", "B")
+    assert cache.misses == 4
+
+
+def test_notification_handler_compiles_templates_once_per_batch(monkeypatch):
+    monkeypatch.setenv("TEMPLATE", "Status {{ status }}")
+    handler = CapturingHandler(template_providers={"body": EnvVarTemplateProvider()})
+    event = {
+        "Records": [
+            {
+                "body": json.dumps({"status": status, "result_type": "success"}),
+                "eventSource": "aws:sqs",
+                "messageId": f"msg-{status}",
+            }
+            for status in ("ok", "late", "done")
+        ]
+    }
+
+    handler.lambda_handler(event, context=None)
+    handler.lambda_handler(event, context=None)
+
+    assert [call["rendered"]["body"] for call in handler.calls[:3]] == [
+        "Status ok",
+        "Status late",
+        "Status done",
+    ]
+    assert handler.template_cache.misses == 1
+    assert handler.template_cache.hits == 5
+
+
+def test_file_template_provider_version_tracks_changes(tmp_path):
+    template_path = tmp_path / "template.jinja2"
+    template_path.write_text("Hello", encoding="utf-8")
+    provider = FileTemplateProvider(template_path)
+    first = provider.get_version()
+
+    template_path.write_text("Hello again", encoding="utf-8")
+
+    assert first is not None
+    assert provider.get_version() != first
+    assert FileTemplateProvider(tmp_path / "missing").get_version() is None
+
+
+def test_caching_template_provider_serves_within_ttl():
+    inner = CountingProvider()
+    clock = FakeClock()
+    provider = CachingTemplateProvider(inner, ttl=30, clock=clock)
+
+    assert inner.fetches == 0
+    assert provider.get_template() == "Hello {{ name }}"
+    clock.now = 29
+    provider.get_template()
+
+    assert inner.fetches == 1
+
+
+def test_caching_template_provider_revalidates_with_version():
+    inner = CountingProvider(version="v1")
+    clock = FakeClock()
+    provider = CachingTemplateProvider(inner, ttl=30, clock=clock)
+    provider.get_template()
+
+    clock.now = 31
+    provider.get_template()
+    assert inner.fetches == 1
+
+    inner.version = "v2"
+    inner.template = "Updated"
+    clock.now = 62
+    assert provider.get_template() == "Updated"
+    assert inner.fetches == 2
+
+
+def test_caching_template_provider_refetches_without_version():
+    inner = CountingProvider()
+    clock = FakeClock()
+    provider = CachingTemplateProvider(inner, ttl=30, clock=clock)
+    provider.get_template()
+
+    clock.now = 31
+    provider.get_template()
+
+    assert inner.fetches == 2
+
+
+def test_caching_template_provider_invalidate():
+    inner = CountingProvider(version="v1")
+    provider = CachingTemplateProvider(inner, ttl=30, clock=FakeClock())
+    provider.get_template()
+
+    provider.invalidate()
+    provider.get_template()
+
+    assert inner.fetches == 2
+
+
+def test_caching_template_provider_version_follows_ttl():
+    inner = CountingProvider("One")
+    clock = FakeClock()
+    provider = CachingTemplateProvider(inner, ttl=30, clock=clock)
+
+    first = provider.get_version()
+    inner.template = "Two"
+    assert provider.get_version() == first
+    assert inner.fetches == 1
+
+    clock.now = 31
+    assert provider.get_version() != first
+    assert provider.get_template() == "Two"
+    assert inner.fetches == 2
+
+
+def test_notification_handler_wraps_providers_with_template_ttl(monkeypatch):
+    monkeypatch.setenv("TEMPLATE", "Hello {{ name }}")
+    inner = EnvVarTemplateProvider()
+    handler = CapturingHandler(template_providers={"body": inner}, template_ttl=60)
+    event = build_sqs_event(json.dumps({"name": "Ada", "result_type": "success"}))
+
+    handler.lambda_handler(event, context=None)
+    monkeypatch.setenv("TEMPLATE", "Goodbye {{ name }}")
+    handler.lambda_handler(event, context=None)
+
+    provider = handler.template_providers["body"]
+    assert isinstance(provider, CachingTemplateProvider)
+    assert provider.provider is inner
+    assert [call["rendered"]["body"] for call in handler.calls] == [
+        "Hello Ada",
+        "Hello Ada",
+    ]
+
+
+class SlowHandler(RenderedTemplateNotificationHandler):
+    def __init__(self, *args, fail_names=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail_names = set(fail_names)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sent = []
+
+    def notify(self, *, result, rendered, record):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self.lock:
+            self.in_flight -= 1
+        if result["name"] in self.fail_names:
+            raise RuntimeError(f"cannot notify {result['name']}")
+        with self.lock:
+            self.sent.append(rendered["body"])
+
+
+def build_batch_event(names, *, group_id=None):
+    records = []
+    for name in names:
+        record = {
+            "body": json.dumps({"name": name, "result_type": "success"}),
+            "eventSource": "aws:sqs",
+            "messageId": f"msg-{name}",
+        }
+        if group_id:
+            record["attributes"] = {"MessageGroupId": group_id}
+        records.append(record)
+    return {"Records": records}
+
+
+def test_notification_handler_notifies_concurrently(monkeypatch):
+    monkeypatch.setenv("TEMPLATE", "Hello {{ name }}")
+    handler = SlowHandler(
+        template_providers={"body": EnvVarTemplateProvider()},
+        notify_concurrency=4,
+        fail_names={"b", "e"},
+    )
+    event = build_batch_event(["a", "b", "c", "d", "e", "f"])
+
+    response = handler.lambda_handler(event, context=None)
+
+    assert response == {
+        "batchItemFailures": [{"itemIdentifier": "msg-b"}, {"itemIdentifier": "msg-e"}]
+    }
+    assert sorted(handler.sent) == ["Hello a", "Hello c", "Hello d", "Hello f"]
+    assert 1 < handler.max_in_flight <= 4
+
+
+def test_notification_handler_concurrent_reports_render_failures(monkeypatch):
+    monkeypatch.setenv("TEMPLATE", "Hello {{ name }}")
+    handler = SlowHandler(
+        template_providers={"body": EnvVarTemplateProvider()},
+        notify_concurrency=2,
+    )
+    event = build_batch_event(["a", "b"])
+    event["Records"].insert(
+        1, build_sqs_event("{bad", message_id="msg-bad")["Records"][0]
+    )
+
+    response = handler.lambda_handler(event, context=None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "msg-bad"}]}
+    assert sorted(handler.sent) == ["Hello a", "Hello b"]
+
+
+def test_notification_handler_concurrent_preserves_fifo_group_order(monkeypatch):
+    monkeypatch.setenv("TEMPLATE", "Hello {{ name }}")
+    handler = SlowHandler(
+        template_providers={"body": EnvVarTemplateProvider()},
+        notify_concurrency=4,
+        fail_names={"c"},
+    )
+    event = build_batch_event(["a", "b", "c", "d", "e"], group_id="group-1")
+
+    response = handler.lambda_handler(event, context=None)
+
+    assert handler.max_in_flight == 1
+    assert handler.sent == ["Hello a", "Hello b"]
+    assert response == {
+        "batchItemFailures": [
+            {"itemIdentifier": "msg-c"},
+            {"itemIdentifier": "msg-d"},
+            {"itemIdentifier": "msg-e"},
+        ]
+    }
+
+
+def test_notification_handler_skipped_fifo_record_without_message_id(monkeypatch):
+    monkeypatch.setenv("TEMPLATE", "Hello {{ name }}")
+    handler = SlowHandler(
+        template_providers={"body": EnvVarTemplateProvider()},
+        notify_concurrency=2,
+        fail_names={"a"},
+    )
+    event = build_batch_event(["a", "b"], group_id="group-1")
+    del event["Records"][1]["messageId"]
+
+    with pytest.raises(RuntimeError, match="earlier record in its message group"):
+        handler.lambda_handler(event, context=None)
+
+
+def test_notification_handler_rejects_invalid_notify_concurrency():
+    with pytest.raises(ValueError, match="notify_concurrency must be at least 1"):
+        CapturingHandler(
+            template_providers={"body": EnvVarTemplateProvider()},
+            notify_concurrency=0,
+        )
+
+
+def test_parse_result_skips_envelope_probe_for_raw_delivery(monkeypatch):
+    monkeypatch.setenv("TEMPLATE", "Message {{ Message }}")
+    handler = CapturingHandler(template_providers={"body": EnvVarTemplateProvider()})
+    event = build_sqs_event(
+        json.dumps({"Message": "hello", "result_type": "success"}),
+        message_attributes={
+            "result_type": {"dataType": "String", "stringValue": "success"}
+        },
+    )
+
+    response = handler.lambda_handler(event, context=None)
+
+    assert handler.calls[0]["rendered"] == {"body": "Message hello"}
+    assert response == {"batchItemFailures": []}
+
+
+def test_notification_handler_logs_decode_time(monkeypatch, caplog):
+    pytest.importorskip("orjson")
+    monkeypatch.setenv("TEMPLATE", "Result {{ status }}")
+    monkeypatch.setenv("LAMBDACRON_JSON_CODEC", "orjson")
+    handler = CapturingHandler(
+        template_providers={"body": EnvVarTemplateProvider()},
+        logger=logging.getLogger("test_notifications"),
+    )
+    sns_body = json.dumps(
+        {"Message": json.dumps({"status": "good", "result_type": "success"})}
+    )
+
+    with caplog.at_level(logging.INFO):
+        handler.lambda_handler(build_sqs_event(sns_body), context=None)
+
+    assert handler.calls[0]["result"] == {"status": "good", "result_type": "success"}
+    complete = next(
+        record
+        for record in caplog.records
+        if record.message == "notification_batch_complete"
+    )
+    assert complete.json_codec == "orjson"
+    assert complete.decode_ms >= 0
+    assert complete.failure_count == 0
+
+
+def test_parse_result_inflates_transported_payloads(monkeypatch):
+    monkeypatch.setenv("TEMPLATE", "{{ items | length }} items")
+    transport = PayloadTransport(compress_threshold=0)
+    handler = CapturingHandler(
+        template_providers={"body": EnvVarTemplateProvider()},
+        payload_transport=transport,
+    )
+    message = json.dumps({"items": list(range(500)), "result_type": "report"})
+    event = build_sqs_event(
+        transport.encode(message, result_type="report"),
+        message_attributes={
+            "result_type": {"dataType": "String", "stringValue": "report"}
+        },
+    )
+
+    response = handler.lambda_handler(event, context=None)
+
+    assert handler.calls[0]["rendered"] == {"body": "500 items"}
+    assert response == {"batchItemFailures": []}
+
+
+def test_notification_handler_emits_metrics_once_per_invocation(monkeypatch):
+    monkeypatch.setenv("TEMPLATE", "Hello {{ name }}")
+    stream = io.StringIO()
+    handler = CapturingHandler(
+        template_providers={"body": EnvVarTemplateProvider()},
+        metrics=MetricsRecorder(dimensions={"Handler": "Capturing"}, stream=stream),
+    )
+    event = build_batch_event(["a", "b"])
+    event["Records"].append({"body": "not json", "messageId": "msg-bad"})
+
+    handler.lambda_handler(event, context=None)
+
+    documents = [json.loads(line) for line in stream.getvalue().splitlines()]
+    (summary,) = [doc for doc in documents if "Template" not in doc]
+    (render,) = [doc for doc in documents if "Template" in doc]
+    assert summary["Handler"] == "Capturing"
+    assert summary["RecordsPerBatch"] == 3
+    assert summary["RecordFailures"] == 1
+    assert len(summary["NotifyLatency"]) == 2
+    assert summary["HandlerDuration"] >= 0
+    assert render["Template"] == "body"
+    assert len(render["RenderTime"]) == 2
+
+
+class RecordingTracer(Tracer):
+    def __init__(self):
+        self.events = []
+
+    @contextlib.contextmanager
+    def invocation(self, name):
+        self.events.append(("invocation", name))
+        yield
+
+    @contextlib.contextmanager
+    def span(self, name, attributes=None):
+        self.events.append(("span", name))
+        yield
+
+
+def test_notification_handler_traces_stages(monkeypatch):
+    monkeypatch.setenv("TEMPLATE", "Hello {{ name }}")
+    tracer = RecordingTracer()
+    handler = CapturingHandler(
+        template_providers={"body": EnvVarTemplateProvider()}, tracer=tracer
+    )
+
+    handler.lambda_handler(build_batch_event(["a"]), context=None)
+
+    assert tracer.events == [
+        ("invocation", "CapturingHandler"),
+        ("span", "validate"),
+        ("span", "parse"),
+        ("span", "render"),
+        ("span", "notify"),
+    ]
+
+
+def test_notification_handler_includes_partials(monkeypatch):
+    monkeypatch.setenv("TEMPLATE", '{% include "header" %}: {{ status }}')
+    handler = CapturingHandler(
+        template_providers={"body": EnvVarTemplateProvider()},
+        partial_providers={"header": CountingProvider("Report {{ result_type }}")},
+    )
+    event = build_sqs_event(json.dumps({"status": "ok", "result_type": "success"}))
+
+    handler.lambda_handler(event, context=None)
+
+    assert handler.calls[0]["rendered"] == {"body": "Report success: ok"}
+
+
+def test_notification_handler_caches_partials_without_version(monkeypatch):
+    monkeypatch.setenv("TEMPLATE", '{% include "header" %}: {{ name }}')
+    header = CountingProvider("Report")
+    footer = CountingProvider("Thanks", version="1")
+    handler = CapturingHandler(
+        template_providers={"body": EnvVarTemplateProvider()},
+        partial_providers={"header": header, "footer": footer},
+    )
+
+    handler.lambda_handler(build_batch_event(["a", "b", "c"]), context=None)
+
+    assert [call["rendered"]["body"] for call in handler.calls] == [
+        "Report: a",
+        "Report: b",
+        "Report: c",
+    ]
+    assert header.fetches == 1
+    assert isinstance(handler.partial_providers["header"], CachingTemplateProvider)
+    assert handler.partial_providers["footer"] is footer
+
+
+def test_template_provider_loader_reloads_changed_templates():
+    provider = CountingProvider("One", version="1")
+    env = Environment(loader=TemplateProviderLoader({"partial": provider}))
+
+    first = env.get_template("partial")
+    assert env.get_template("partial") is first
+    provider.template, provider.version = "Two", "2"
+
+    assert env.get_template("partial").render() == "Two"
+    assert env.loader.list_templates() == ["partial"]
+
+
+def test_template_cache_reuses_bytecode_across_processes(tmp_path, monkeypatch):
+    env = Environment(bytecode_cache=TemplateBytecodeCache(tmp_path))
+    TemplateCache().get(env, "body", "Hello {{ name }}")
+    fresh_env = Environment(bytecode_cache=TemplateBytecodeCache(tmp_path))
+
+    def fail_compile(*args, **kwargs):
+        raise AssertionError("template was compiled again")
+
+    monkeypatch.setattr(fresh_env, "compile", fail_compile)
+    template = TemplateCache().get(fresh_env, "other-name", "Hello {{ name }}")
+
+    assert template.render(name="Ada") == "Hello Ada"
+
+
+def test_bytecode_cache_falls_back_to_precompiled_dir(tmp_path, monkeypatch):
+    precompiled = tmp_path / "precompiled"
+    env = Environment(bytecode_cache=TemplateBytecodeCache(precompiled))
+    TemplateCache().get(env, "body", "Hi {{ name }}")
+    monkeypatch.setenv("LAMBDACRON_BYTECODE_CACHE_DIR", str(tmp_path / "writable"))
+    monkeypatch.setenv("LAMBDACRON_PRECOMPILED_TEMPLATES", str(precompiled))
+    fresh_env = Environment(bytecode_cache=load_bytecode_cache())
+    monkeypatch.setattr(fresh_env, "compile", None)
+
+    template = TemplateCache().get(fresh_env, "body", "Hi {{ name }}")
+
+    assert template.render(name="Ada") == "Hi Ada"
+
+
+def test_load_bytecode_cache_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("LAMBDACRON_BYTECODE_CACHE_DIR", "")
+
+    assert load_bytecode_cache() is None
+
+
+def use_default_bytecode_cache(tmp_path, monkeypatch):
+    monkeypatch.delenv("LAMBDACRON_BYTECODE_CACHE_DIR")
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    return tmp_path / f"lambdacron-jinja-{os.getuid()}"
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="needs POSIX users")
+def test_load_bytecode_cache_defaults_to_private_dir(tmp_path, monkeypatch):
+    directory = use_default_bytecode_cache(tmp_path, monkeypatch)
+    directory.mkdir(mode=0o777)
+    directory.chmod(0o777)
+
+    cache = load_bytecode_cache()
+
+    assert cache.directory == str(directory)
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="needs POSIX users")
+def test_load_bytecode_cache_refuses_planted_default_dir(tmp_path, monkeypatch):
+    directory = use_default_bytecode_cache(tmp_path, monkeypatch)
+    (tmp_path / "planted").mkdir()
+    directory.symlink_to(tmp_path / "planted")
+
+    assert load_bytecode_cache() is None
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="needs POSIX users")
+def test_load_bytecode_cache_refuses_default_dir_of_other_user(tmp_path, monkeypatch):
+    # The directory is created by the real user, as if another user had
+    # planted it under this user's name.
+    uid = os.getuid() + 1
+    use_default_bytecode_cache(tmp_path, monkeypatch)
+    monkeypatch.setattr("os.getuid", lambda: uid)
+
+    assert load_bytecode_cache() is None
+
+
+def count_renders(handler):
+    renders = []
+    render_templates = handler._render_templates
+
+    def counting_render(templates, result):
+        renders.append(result["name"])
+        return render_templates(templates, result)
+
+    handler._render_templates = counting_render
+    return renders
+
+
+def build_repeated_event(names):
+    event = build_batch_event(names)
+    for position, record in enumerate(event["Records"]):
+        record["messageId"] = f"msg-{position}"
+    return event
+
+
+def test_notification_handler_renders_repeated_payloads_once():
+    provider = CountingProvider("Hello {{ name }}")
+    handler = SlowHandler(template_providers={"body": provider})
+    renders = count_renders(handler)
+
+    response = handler.lambda_handler(
+        build_repeated_event(["ada", "bob", "ada", "ada"]), context=None
+    )
+
+    assert renders == ["ada", "bob"]
+    assert sorted(handler.sent) == ["Hello ada", "Hello ada", "Hello ada", "Hello bob"]
+    assert response == {"batchItemFailures": []}
+
+
+def test_notification_handler_render_memo_respects_limit():
+    handler = SlowHandler(
+        template_providers={"body": CountingProvider("Hello {{ name }}")},
+        render_memo_limit=len("Hello ada"),
+    )
+    renders = count_renders(handler)
+
+    handler.lambda_handler(
+        build_repeated_event(["ada", "bobby", "ada", "bobby"]), context=None
+    )
+
+    assert renders == ["ada", "bobby", "bobby"]
+
+
+def test_notification_handler_dedupes_notifications():
+    handler = SlowHandler(
+        template_providers={"body": CountingProvider("Hello {{ name }}")},
+        fail_names={"bob"},
+        dedupe_notifications=True,
+    )
+
+    response = handler.lambda_handler(
+        build_repeated_event(["ada", "bob", "ada", "bob"]), context=None
+    )
+
+    assert handler.sent == ["Hello ada"]
+    assert response == {
+        "batchItemFailures": [{"itemIdentifier": "msg-1"}, {"itemIdentifier": "msg-3"}]
+    }
+
+
+def test_notification_handler_duplicate_without_message_id():
+    handler = SlowHandler(
+        template_providers={"body": CountingProvider("Hello {{ name }}")},
+        fail_names={"bob"},
+        dedupe_notifications=True,
+    )
+    event = build_repeated_event(["bob", "bob"])
+    del event["Records"][1]["messageId"]
+
+    with pytest.raises(RuntimeError, match="identical record in the batch failed"):
+        handler.lambda_handler(event, context=None)
+
+
+def test_notification_handler_rejects_negative_render_memo_limit():
+    with pytest.raises(ValueError, match="render_memo_limit"):
+        CapturingHandler(
+            template_providers={"body": CountingProvider()}, render_memo_limit=-1
+        )
+
+
+def test_notification_handler_skips_records_already_delivered():
+    ledger = IdempotencyLedger(SQLiteIdempotencyStore())
+    handler = SlowHandler(
+        template_providers={"body": CountingProvider("Hello {{ name }}")},
+        fail_names={"bob"},
+        idempotency=ledger,
+    )
+
+    first = handler.lambda_handler(build_batch_event(["ada", "bob"]), context=None)
+    handler.fail_names = set()
+    second = handler.lambda_handler(build_batch_event(["ada", "bob"]), context=None)
+
+    assert first == {"batchItemFailures": [{"itemIdentifier": "msg-bob"}]}
+    assert second == {"batchItemFailures": []}
+    assert handler.sent == ["Hello ada", "Hello bob"]
+
+
+def test_notification_handler_retries_records_claimed_elsewhere():
+    ledger = IdempotencyLedger(SQLiteIdempotencyStore())
+    ledger.claim("message:msg-ada")
+    handler = SlowHandler(
+        template_providers={"body": CountingProvider("Hello {{ name }}")},
+        idempotency=ledger,
+    )
+
+    response = handler.lambda_handler(build_batch_event(["ada", "bob"]), context=None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "msg-ada"}]}
+    assert handler.sent == ["Hello bob"]
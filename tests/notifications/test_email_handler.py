@@ -1,9 +1,18 @@
 import json
+from types import SimpleNamespace
 
-from botocore.exceptions import ClientError
+import boto3
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+from moto import mock_aws
+from moto.ses.models import ses_backends
 
 from lambdacron.notifications.base import EnvVarTemplateProvider
-from lambdacron.notifications.email_handler import EmailNotificationHandler
+from lambdacron.notifications.email_handler import (
+    BULK_PASSTHROUGH_TEMPLATE,
+    EmailNotificationHandler,
+)
+from lambdacron.rate_limit import TokenBucket
 
 
 class FakeSesClient:
@@ -109,3 +118,450 @@ def test_email_handler_reports_ses_error(monkeypatch):
     response = handler.lambda_handler(event, context=None)
 
     assert response == {"batchItemFailures": [{"itemIdentifier": "msg-err"}]}
+
+
+@pytest.fixture
+def email_templates(monkeypatch):
+    monkeypatch.setenv("EMAIL_SUBJECT_TEMPLATE", "Hello {{ name }}")
+    monkeypatch.setenv("EMAIL_TEXT_TEMPLATE", "Text for {{ name }}")
+    monkeypatch.setenv("EMAIL_HTML_TEMPLATE", "<p>{{ name }} & co</p>")
+
+
+@pytest.fixture
+def ses_client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("ses", region_name="us-east-1")
+        client.verify_email_identity(EmailAddress="sender@example.com")
+        yield client
+
+
+def build_bulk_handler(ses_client, *, recipients=("ops@example.com",), **kwargs):
+    return EmailNotificationHandler(
+        subject_template_provider=EnvVarTemplateProvider("EMAIL_SUBJECT_TEMPLATE"),
+        text_template_provider=EnvVarTemplateProvider("EMAIL_TEXT_TEMPLATE"),
+        html_template_provider=EnvVarTemplateProvider("EMAIL_HTML_TEMPLATE"),
+        sender="sender@example.com",
+        recipients=list(recipients),
+        ses_client=ses_client,
+        bulk_send=True,
+        **kwargs,
+    )
+
+
+def build_batch_event(names):
+    return {
+        "Records": [
+            {
+                "body": json.dumps({"name": name, "result_type": "success"}),
+                "eventSource": "aws:sqs",
+                "messageId": f"msg-{name}",
+            }
+            for name in names
+        ]
+    }
+
+
+def test_email_handler_bulk_sends_batch_in_one_call(email_templates, ses_client):
+    handler = build_bulk_handler(ses_client)
+
+    response = handler.lambda_handler(build_batch_event(["Ada", "Grace"]), None)
+
+    assert response == {"batchItemFailures": []}
+    backend = ses_backends["123456789012"]["us-east-1"]
+    (message,) = backend.sent_messages
+    assert message.template == "lambdacron-passthrough"
+    data = [
+        json.loads(destination["ReplacementTemplateData"])
+        for destination in message.destinations
+    ]
+    assert data == [
+        {"subject": "Hello Ada", "text": "Text for Ada", "html": "<p>Ada & co</p>"},
+        {
+            "subject": "Hello Grace",
+            "text": "Text for Grace",
+            "html": "<p>Grace & co</p>",
+        },
+    ]
+    template = ses_client.get_template(TemplateName="lambdacron-passthrough")
+    assert template["Template"]["HtmlPart"] == "{{{html}}}"
+
+
+def test_email_handler_bulk_maps_destination_failures(email_templates):
+    class PartialFailureSesClient:
+        def __init__(self):
+            self.calls = []
+
+        def get_template(self, **kwargs):
+            return {"Template": dict(BULK_PASSTHROUGH_TEMPLATE)}
+
+        def send_bulk_templated_email(self, **kwargs):
+            self.calls.append(kwargs)
+            return {
+                "Status": [
+                    {"Status": "Success", "MessageId": "ses-1"},
+                    {"Status": "MessageRejected", "Error": "Rejected"},
+                    {"Status": "Success", "MessageId": "ses-3"},
+                ]
+            }
+
+    ses_client = PartialFailureSesClient()
+    handler = build_bulk_handler(ses_client)
+
+    response = handler.lambda_handler(build_batch_event(["a", "b", "c"]), None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "msg-b"}]}
+    assert len(ses_client.calls) == 1
+
+
+def test_email_handler_bulk_fails_records_without_status(email_templates):
+    class ShortStatusSesClient:
+        def get_template(self, **kwargs):
+            return {"Template": dict(BULK_PASSTHROUGH_TEMPLATE)}
+
+        def send_bulk_templated_email(self, **kwargs):
+            return {"Status": [{"Status": "Success", "MessageId": "ses-1"}]}
+
+    handler = build_bulk_handler(ShortStatusSesClient())
+
+    response = handler.lambda_handler(build_batch_event(["a", "b", "c"]), None)
+
+    assert response == {
+        "batchItemFailures": [{"itemIdentifier": "msg-b"}, {"itemIdentifier": "msg-c"}]
+    }
+
+
+def test_email_handler_bulk_passes_subject_through_unescaped(
+    monkeypatch, email_templates, ses_client
+):
+    monkeypatch.setenv("EMAIL_SUBJECT_TEMPLATE", "{{ name }} & co")
+    handler = build_bulk_handler(ses_client)
+
+    handler.lambda_handler(build_batch_event(["Ada"]), None)
+
+    backend = ses_backends["123456789012"]["us-east-1"]
+    (message,) = backend.sent_messages
+    (destination,) = message.destinations
+    data = json.loads(destination["ReplacementTemplateData"])
+    assert data["subject"] == "Ada & co"
+    template = ses_client.get_template(TemplateName="lambdacron-passthrough")
+    assert template["Template"]["SubjectPart"] == "{{{subject}}}"
+
+
+def test_email_handler_bulk_updates_stale_template(email_templates, ses_client):
+    ses_client.create_template(
+        Template={
+            "TemplateName": "lambdacron-passthrough",
+            "SubjectPart": "{{subject}}",
+            "TextPart": "{{{text}}}",
+            "HtmlPart": "{{{html}}}",
+        }
+    )
+    handler = build_bulk_handler(ses_client)
+
+    handler.lambda_handler(build_batch_event(["Ada"]), None)
+
+    template = ses_client.get_template(TemplateName="lambdacron-passthrough")
+    assert template["Template"]["SubjectPart"] == "{{{subject}}}"
+
+
+def test_email_handler_bulk_chunks_large_batches(email_templates, ses_client):
+    handler = build_bulk_handler(ses_client)
+    names = [f"user{index}" for index in range(60)]
+
+    response = handler.lambda_handler(build_batch_event(names), None)
+
+    assert response == {"batchItemFailures": []}
+    backend = ses_backends["123456789012"]["us-east-1"]
+    assert [len(message.destinations) for message in backend.sent_messages] == [
+        50,
+        10,
+    ]
+
+
+def test_email_handler_bulk_template_setup_error_fails_chunk(email_templates):
+    class DeniedSesClient:
+        def __init__(self):
+            self.sends = 0
+
+        def get_template(self, **kwargs):
+            return {"Template": {"SubjectPart": "{{subject}}"}}
+
+        def update_template(self, **kwargs):
+            raise ClientError(
+                {"Error": {"Code": "AccessDenied", "Message": "denied"}},
+                "UpdateTemplate",
+            )
+
+        def send_bulk_templated_email(self, **kwargs):
+            self.sends += 1
+
+    ses_client = DeniedSesClient()
+    handler = build_bulk_handler(ses_client)
+
+    response = handler.lambda_handler(build_batch_event(["a", "b"]), None)
+
+    assert response == {
+        "batchItemFailures": [{"itemIdentifier": "msg-a"}, {"itemIdentifier": "msg-b"}]
+    }
+    assert ses_client.sends == 0
+
+
+def test_email_handler_bulk_call_error_fails_chunk(email_templates):
+    error_response = {
+        "Error": {"Code": "MessageRejected", "Message": "Not verified"},
+        "ResponseMetadata": {"RequestId": "req-123", "HTTPStatusCode": 400},
+    }
+
+    class ErrorSesClient:
+        def get_template(self, **kwargs):
+            return {"Template": dict(BULK_PASSTHROUGH_TEMPLATE)}
+
+        def send_bulk_templated_email(self, **kwargs):
+            raise ClientError(error_response, "SendBulkTemplatedEmail")
+
+    handler = build_bulk_handler(ErrorSesClient())
+
+    response = handler.lambda_handler(build_batch_event(["a", "b"]), None)
+
+    assert response == {
+        "batchItemFailures": [{"itemIdentifier": "msg-a"}, {"itemIdentifier": "msg-b"}]
+    }
+
+
+def throttling_error(message="Maximum sending rate exceeded."):
+    return ClientError(
+        {"Error": {"Code": "Throttling", "Message": message}}, "SendEmail"
+    )
+
+
+class ThrottlingSesClient:
+    def __init__(self, failures, message="Maximum sending rate exceeded."):
+        self.failures = failures
+        self.message = message
+        self.calls = 0
+
+    def send_email(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise throttling_error(self.message)
+        return {"MessageId": f"ses-{self.calls}"}
+
+    def get_send_quota(self):
+        return {"MaxSendRate": 14.0, "Max24HourSend": 200.0, "SentLast24Hours": 0.0}
+
+
+def build_handler(ses_client, **kwargs):
+    return EmailNotificationHandler(
+        subject_template_provider=EnvVarTemplateProvider("EMAIL_SUBJECT_TEMPLATE"),
+        text_template_provider=EnvVarTemplateProvider("EMAIL_TEXT_TEMPLATE"),
+        html_template_provider=EnvVarTemplateProvider("EMAIL_HTML_TEMPLATE"),
+        sender="sender@example.com",
+        recipients=["ops@example.com"],
+        ses_client=ses_client,
+        **kwargs,
+    )
+
+
+def lambda_context(remaining_ms):
+    return SimpleNamespace(get_remaining_time_in_millis=lambda: remaining_ms)
+
+
+def test_email_handler_retries_throttled_send(email_templates, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("time.sleep", sleeps.append)
+    ses_client = ThrottlingSesClient(failures=2)
+    handler = build_handler(ses_client)
+
+    response = handler.lambda_handler(
+        build_batch_event(["Ada"]), lambda_context(60_000)
+    )
+
+    assert response == {"batchItemFailures": []}
+    assert ses_client.calls == 3
+    assert len(sleeps) == 2
+
+
+def test_email_handler_stops_retrying_past_deadline(email_templates, monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    ses_client = ThrottlingSesClient(failures=10)
+    handler = build_handler(ses_client)
+
+    response = handler.lambda_handler(build_batch_event(["Ada"]), lambda_context(500))
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "msg-Ada"}]}
+    assert ses_client.calls == 1
+
+
+def test_email_handler_does_not_retry_daily_quota(email_templates, monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    ses_client = ThrottlingSesClient(
+        failures=1, message="Daily message quota exceeded."
+    )
+    handler = build_handler(ses_client)
+
+    response = handler.lambda_handler(build_batch_event(["Ada"]), None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "msg-Ada"}]}
+    assert ses_client.calls == 1
+
+
+def test_email_handler_rate_limit_uses_send_quota(email_templates):
+    ses_client = ThrottlingSesClient(failures=0)
+    handler = build_handler(ses_client, rate_limit=True)
+
+    handler.lambda_handler(build_batch_event(["Ada", "Grace"]), None)
+
+    assert handler.rate_limiter.rate == 14.0
+    assert ses_client.calls == 2
+
+
+def test_email_handler_fails_records_when_rate_wait_exceeds_deadline(
+    email_templates,
+):
+    ses_client = ThrottlingSesClient(failures=0)
+    limiter = TokenBucket(0.1, capacity=1)
+    handler = build_handler(ses_client, rate_limiter=limiter, deadline_reserve=0)
+
+    response = handler.lambda_handler(
+        build_batch_event(["Ada", "Grace"]), lambda_context(1_000)
+    )
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "msg-Grace"}]}
+    assert ses_client.calls == 1
+
+
+def test_email_handler_bulk_fails_later_chunks_when_rate_wait_exceeds_deadline(
+    email_templates,
+):
+    class BulkSesClient:
+        def __init__(self):
+            self.sizes = []
+
+        def get_template(self, **kwargs):
+            return {"Template": dict(BULK_PASSTHROUGH_TEMPLATE)}
+
+        def send_bulk_templated_email(self, **kwargs):
+            self.sizes.append(len(kwargs["Destinations"]))
+            return {"Status": [{"Status": "Success"}] * len(kwargs["Destinations"])}
+
+    ses_client = BulkSesClient()
+    limiter = TokenBucket(1.0, capacity=50)
+    handler = build_bulk_handler(ses_client, rate_limiter=limiter, deadline_reserve=0)
+    names = [f"user{index:03d}" for index in range(120)]
+
+    response = handler.lambda_handler(build_batch_event(names), lambda_context(1_000))
+
+    assert ses_client.sizes == [50]
+    assert response == {
+        "batchItemFailures": [{"itemIdentifier": f"msg-{name}"} for name in names[50:]]
+    }
+
+
+class FlakySesClient:
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def send_email(self, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"MessageId": f"ses-{self.calls}"}
+
+
+def test_email_handler_retries_transient_errors(email_templates, monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    server_error = ClientError(
+        {
+            "Error": {"Code": "InternalFailure", "Message": "boom"},
+            "ResponseMetadata": {"HTTPStatusCode": 500},
+        },
+        "SendEmail",
+    )
+    connection_error = EndpointConnectionError(endpoint_url="https://ses")
+    ses_client = FlakySesClient([server_error, connection_error])
+    handler = build_handler(ses_client)
+
+    response = handler.lambda_handler(
+        build_batch_event(["Ada"]), lambda_context(60_000)
+    )
+
+    assert response == {"batchItemFailures": []}
+    assert ses_client.calls == 3
+
+
+def test_email_handler_does_not_retry_client_faults(email_templates, monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    rejected = ClientError(
+        {
+            "Error": {"Code": "MessageRejected", "Message": "bad"},
+            "ResponseMetadata": {"HTTPStatusCode": 400},
+        },
+        "SendEmail",
+    )
+    ses_client = FlakySesClient([rejected])
+    handler = build_handler(ses_client)
+
+    response = handler.lambda_handler(
+        build_batch_event(["Ada"]), lambda_context(60_000)
+    )
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "msg-Ada"}]}
+    assert ses_client.calls == 1
+
+
+def test_email_handler_default_client_leaves_throttle_retries_to_handler(
+    monkeypatch, email_templates
+):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    handler = build_bulk_handler(None)
+
+    assert handler.ses_client.meta.config.retries == {
+        "mode": "standard",
+        "total_max_attempts": 1,
+    }
+
+
+class RecordingBucket(TokenBucket):
+    def __init__(self):
+        super().__init__(100.0)
+        self.taken = []
+
+    def acquire(self, tokens=1.0, *, timeout=None):
+        self.taken.append(tokens)
+        return super().acquire(tokens, timeout=timeout)
+
+
+def test_email_handler_rate_limit_counts_recipients(email_templates):
+    limiter = RecordingBucket()
+    handler = EmailNotificationHandler(
+        subject_template_provider=EnvVarTemplateProvider("EMAIL_SUBJECT_TEMPLATE"),
+        text_template_provider=EnvVarTemplateProvider("EMAIL_TEXT_TEMPLATE"),
+        html_template_provider=EnvVarTemplateProvider("EMAIL_HTML_TEMPLATE"),
+        sender="sender@example.com",
+        recipients=["ops@example.com", "dev@example.com", "qa@example.com"],
+        ses_client=ThrottlingSesClient(failures=0),
+        rate_limiter=limiter,
+    )
+
+    handler.lambda_handler(build_batch_event(["Ada", "Grace"]), None)
+
+    assert limiter.taken == [3, 3]
+
+
+def test_email_handler_bulk_rate_limit_counts_recipients(email_templates, ses_client):
+    limiter = RecordingBucket()
+    handler = build_bulk_handler(
+        ses_client,
+        recipients=["ops@example.com", "dev@example.com"],
+        rate_limiter=limiter,
+    )
+
+    handler.lambda_handler(build_batch_event(["Ada", "Grace", "Linus"]), None)
+
+    assert limiter.taken == [6]
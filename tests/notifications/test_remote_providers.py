@@ -0,0 +1,136 @@
+import hashlib
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from lambdacron.notifications.remote_providers import (
+    HttpTemplateProvider,
+    S3TemplateProvider,
+)
+
+
+class TemplateServer:
+    def __init__(self):
+        self.template = "Hello {{ name }}"
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/template.j2":
+                    self.send_error(404)
+                    return
+                body = server.template.encode("utf-8")
+                etag = f'"{hashlib.sha256(body).hexdigest()}"'
+                if_none_match = self.headers.get("If-None-Match")
+                server.requests.append(if_none_match)
+                if if_none_match == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def template_server():
+    with TemplateServer() as server:
+        yield server
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="templates")
+        yield client
+
+
+def test_http_template_provider_uses_conditional_get(template_server):
+    provider = HttpTemplateProvider(f"{template_server.url}/template.j2")
+
+    assert provider.get_template() == "Hello {{ name }}"
+    assert provider.get_template() == "Hello {{ name }}"
+
+    first, second = template_server.requests
+    assert first is None
+    assert second is not None
+
+
+def test_http_template_provider_refetches_changed_template(template_server):
+    provider = HttpTemplateProvider(f"{template_server.url}/template.j2")
+    provider.get_template()
+
+    template_server.template = "Goodbye {{ name }}"
+
+    assert provider.get_template() == "Goodbye {{ name }}"
+
+
+def test_http_template_provider_raises_for_missing_template(template_server):
+    provider = HttpTemplateProvider(f"{template_server.url}/missing.j2")
+
+    with pytest.raises(urllib.error.HTTPError):
+        provider.get_template()
+
+
+def test_s3_template_provider_uses_conditional_get(s3_client):
+    s3_client.put_object(Bucket="templates", Key="body.j2", Body=b"Hi {{ name }}")
+    calls = []
+    original_get_object = s3_client.get_object
+
+    def get_object(**kwargs):
+        calls.append(kwargs)
+        return original_get_object(**kwargs)
+
+    s3_client.get_object = get_object
+    provider = S3TemplateProvider("templates", "body.j2", s3_client=s3_client)
+
+    assert provider.get_template() == "Hi {{ name }}"
+    assert provider.get_template() == "Hi {{ name }}"
+
+    assert "IfNoneMatch" not in calls[0]
+    assert calls[1]["IfNoneMatch"]
+
+
+def test_s3_template_provider_refetches_changed_object(s3_client):
+    s3_client.put_object(Bucket="templates", Key="body.j2", Body=b"Hi {{ name }}")
+    provider = S3TemplateProvider.from_uri(
+        "s3://templates/body.j2", s3_client=s3_client
+    )
+    provider.get_template()
+
+    s3_client.put_object(Bucket="templates", Key="body.j2", Body=b"Bye {{ name }}")
+
+    assert provider.get_template() == "Bye {{ name }}"
+
+
+def test_s3_template_provider_rejects_invalid_uri():
+    with pytest.raises(ValueError, match="Invalid S3 template URI"):
+        S3TemplateProvider.from_uri("https://example.com/x", s3_client=object())
@@ -0,0 +1,139 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from lambdacron.change_detection import (
+    ChangeDetector,
+    DynamoDBStateStore,
+    LocalFileStateStore,
+    ResultState,
+    S3StateStore,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def aws_credentials(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+
+@pytest.fixture
+def s3_store(aws_credentials):
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="state")
+        yield S3StateStore("state", s3_client=client)
+
+
+@pytest.fixture
+def dynamodb_store(aws_credentials):
+    with mock_aws():
+        client = boto3.client("dynamodb", region_name="us-east-1")
+        client.create_table(
+            TableName="lambdacron-state",
+            KeySchema=[{"AttributeName": "result_key", "KeyType": "HASH"}],
+            AttributeDefinitions=[
+                {"AttributeName": "result_key", "AttributeType": "S"}
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield DynamoDBStateStore("lambdacron-state", dynamodb_client=client)
+
+
+@pytest.fixture(params=["local", "s3", "dynamodb"])
+def store(request, tmp_path):
+    if request.param == "local":
+        return LocalFileStateStore(tmp_path / "state" / "results.json")
+    return request.getfixturevalue(f"{request.param}_store")
+
+
+def test_state_store_round_trips(store):
+    assert store.get("success") is None
+
+    store.put("success", ResultState(digest="abc", published_at=12.5))
+    store.put("failure", ResultState(digest="def", published_at=13.0))
+
+    assert store.get("success") == ResultState(digest="abc", published_at=12.5)
+    assert store.get("failure") == ResultState(digest="def", published_at=13.0)
+
+
+def test_change_detector_skips_unchanged_results(tmp_path):
+    detector = ChangeDetector(LocalFileStateStore(tmp_path / "state.json"))
+
+    assert detector.filter({"a": {"x": 1}, "b": {"y": 2}}) == {
+        "a": {"x": 1},
+        "b": {"y": 2},
+    }
+    detector.commit()
+
+    assert detector.filter({"a": {"x": 1}, "b": {"y": 3}}) == {"b": {"y": 3}}
+
+
+def test_change_detector_ignores_key_order(tmp_path):
+    detector = ChangeDetector(LocalFileStateStore(tmp_path / "state.json"))
+
+    detector.filter({"a": {"x": 1, "y": 2}})
+    detector.commit()
+
+    assert detector.filter({"a": {"y": 2, "x": 1}}) == {}
+
+
+def test_change_detector_republishes_after_max_staleness(tmp_path):
+    clock = FakeClock()
+    detector = ChangeDetector(
+        LocalFileStateStore(tmp_path / "state.json"), max_staleness=300, clock=clock
+    )
+    detector.filter({"a": {"x": 1}})
+    detector.commit()
+
+    clock.now += 299
+    assert detector.filter({"a": {"x": 1}}) == {}
+    clock.now += 1
+    assert detector.filter({"a": {"x": 1}}) == {"a": {"x": 1}}
+
+
+def test_change_detector_does_not_store_excluded_or_discarded_results(tmp_path):
+    detector = ChangeDetector(LocalFileStateStore(tmp_path / "state.json"))
+
+    detector.filter({"a": {"x": 1}, "b": {"y": 2}})
+    detector.commit(exclude=["b"])
+    detector.filter({"c": {"z": 3}})
+    detector.discard()
+
+    assert detector.filter({"a": {"x": 1}, "b": {"y": 2}, "c": {"z": 3}}) == {
+        "b": {"y": 2},
+        "c": {"z": 3},
+    }
+
+
+def test_change_detector_filters_streams(tmp_path):
+    detector = ChangeDetector(
+        LocalFileStateStore(tmp_path / "state.json"), namespace="task/"
+    )
+    detector.filter({"a": {"x": 1}})
+    detector.commit()
+
+    results = detector.filter(iter([("a", {"x": 1}), ("b", {"y": 2})]))
+
+    assert list(results) == [("b", {"y": 2})]
+    assert detector.store.get("task/a") is not None
+
+
+def test_change_detector_rejects_duplicate_streamed_result_types(tmp_path):
+    detector = ChangeDetector(LocalFileStateStore(tmp_path / "state.json"))
+    detector.filter({"a": {"x": 1}})
+    detector.commit()
+
+    results = detector.filter(iter([("a", {"x": 1}), ("a", {"x": 2})]))
+
+    with pytest.raises(ValueError, match="Duplicate result type 'a'"):
+        list(results)
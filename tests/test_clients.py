@@ -0,0 +1,74 @@
+from unittest.mock import Mock
+
+import pytest
+
+from lambdacron.clients import (
+    DEFAULT_MAX_POOL_CONNECTIONS,
+    clear_clients,
+    client_config,
+    get_client,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    clear_clients()
+    yield
+    clear_clients()
+
+
+def test_client_config_is_tuned():
+    config = client_config(max_pool_connections=25)
+
+    assert config.max_pool_connections == 25
+    assert config.retries == {"mode": "adaptive", "total_max_attempts": 5}
+    assert config.tcp_keepalive is True
+
+
+def test_client_config_rejects_empty_pool():
+    with pytest.raises(ValueError, match="max_pool_connections must be at least 1"):
+        client_config(max_pool_connections=0)
+
+
+def test_get_client_shares_clients_per_service():
+    sns = get_client("sns")
+
+    assert get_client("sns") is sns
+    assert get_client("ses") is not sns
+    assert get_client("sns", region_name="eu-west-1") is not sns
+    assert sns.meta.config.max_pool_connections == DEFAULT_MAX_POOL_CONNECTIONS
+
+
+def test_get_client_grows_pool_for_concurrency():
+    small = get_client("sns")
+    large = get_client("sns", max_concurrency=32)
+
+    assert large is not small
+    assert large.meta.config.max_pool_connections == 32
+    assert get_client("sns", max_concurrency=4) is large
+
+
+def test_get_client_uses_explicit_session_without_caching():
+    session = Mock()
+
+    get_client("sns", max_concurrency=16, session=session)
+    get_client("sns", max_concurrency=16, session=session)
+
+    assert session.client.call_count == 2
+    config = session.client.call_args.kwargs["config"]
+    assert config.max_pool_connections == 16
+
+
+def test_get_client_caches_per_retry_settings():
+    default = get_client("ses")
+    no_retries = get_client("ses", retry_mode="standard", max_attempts=1)
+
+    assert no_retries is not default
+    assert no_retries.meta.config.retries == {
+        "mode": "standard",
+        "total_max_attempts": 1,
+    }
+    assert get_client("ses", retry_mode="standard", max_attempts=1) is no_retries
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from lambdacron.codec import get_json_codec
+
+
+def test_get_json_codec_defaults_to_stdlib(monkeypatch):
+    monkeypatch.delenv("LAMBDACRON_JSON_CODEC", raising=False)
+
+    codec = get_json_codec()
+
+    assert codec.name == "json"
+    assert codec.dumps({"a": 1}) == json.dumps({"a": 1})
+
+
+def test_get_json_codec_reads_env(monkeypatch):
+    pytest.importorskip("orjson")
+    monkeypatch.setenv("LAMBDACRON_JSON_CODEC", "orjson")
+
+    assert get_json_codec().name == "orjson"
+
+
+def test_get_json_codec_rejects_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown JSON codec"):
+        get_json_codec("yaml")
+
+
+def test_get_json_codec_auto_picks_installed_backend():
+    codec = get_json_codec("auto")
+
+    assert codec.name in {"orjson", "msgspec", "json"}
+    assert codec.loads(codec.dumps({"a": [1, 2]})) == {"a": [1, 2]}
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_json_codec_round_trips_and_reports_decode_errors(name):
+    if name != "json":
+        pytest.importorskip(name)
+    codec = get_json_codec(name)
+    payload = {"result_type": "success", "items": [{"name": "é", "value": 1.5}]}
+
+    encoded = codec.dumps(payload)
+
+    assert isinstance(encoded, str)
+    assert codec.loads(encoded) == payload
+    assert codec.loads(encoded.encode("utf-8")) == payload
+    with pytest.raises(codec.decode_errors):
+        codec.loads("{bad")
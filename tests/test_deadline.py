@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+import pytest
+
+from lambdacron.deadline import Deadline, DeadlineExceeded
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_deadline_from_context_reserves_time():
+    clock = FakeClock()
+    context = SimpleNamespace(get_remaining_time_in_millis=lambda: 10_000)
+
+    deadline = Deadline.from_context(context, reserve=4.0, clock=clock)
+
+    assert deadline.remaining() == pytest.approx(6.0)
+    clock.now += 6.0
+    assert deadline.expired
+    with pytest.raises(DeadlineExceeded):
+        deadline.check()
+
+
+def test_deadline_without_context_never_expires():
+    deadline = Deadline.from_context(SimpleNamespace(), reserve=4.0)
+
+    assert deadline.remaining() is None
+    assert not deadline.expired
+    deadline.check()
+
+
+def test_deadline_cancel_expires_immediately():
+    deadline = Deadline()
+
+    deadline.cancel()
+
+    assert deadline.remaining() == 0.0
+    assert deadline.expired
+    with pytest.raises(DeadlineExceeded):
+        deadline.check()
@@ -0,0 +1,123 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from lambdacron.idempotency import (
+    COMPLETED,
+    IN_PROGRESS,
+    DynamoDBIdempotencyStore,
+    IdempotencyLedger,
+    SQLiteIdempotencyStore,
+    load_idempotency_ledger,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def aws_credentials(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+
+@pytest.fixture
+def dynamodb_store(aws_credentials):
+    with mock_aws():
+        client = boto3.client("dynamodb", region_name="us-east-1")
+        client.create_table(
+            TableName="lambdacron-idempotency",
+            KeySchema=[{"AttributeName": "idempotency_key", "KeyType": "HASH"}],
+            AttributeDefinitions=[
+                {"AttributeName": "idempotency_key", "AttributeType": "S"}
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield DynamoDBIdempotencyStore("lambdacron-idempotency", dynamodb_client=client)
+
+
+@pytest.fixture(params=["sqlite", "dynamodb"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteIdempotencyStore(tmp_path / "ledger.sqlite3")
+    return request.getfixturevalue(f"{request.param}_store")
+
+
+def test_store_claims_each_key_once(store):
+    assert store.claim("msg-1", expires_at=1_100, now=1_000) is None
+    assert store.claim("msg-1", expires_at=1_100, now=1_050) == IN_PROGRESS
+
+    store.complete("msg-1", expires_at=2_000)
+
+    assert store.claim("msg-1", expires_at=1_200, now=1_100) == COMPLETED
+    assert store.claim("msg-2", expires_at=1_200, now=1_100) is None
+
+
+def test_store_reclaims_expired_entries(store):
+    store.claim("msg-1", expires_at=1_100, now=1_000)
+    assert store.claim("msg-1", expires_at=1_300, now=1_200) is None
+
+    store.complete("msg-1", expires_at=1_400)
+
+    assert store.claim("msg-1", expires_at=1_600, now=1_500) is None
+
+
+def test_store_release_only_drops_claims(store):
+    store.claim("msg-1", expires_at=1_100, now=1_000)
+    store.release("msg-1")
+    assert store.claim("msg-1", expires_at=1_100, now=1_000) is None
+
+    store.complete("msg-1", expires_at=2_000)
+    store.release("msg-1")
+
+    assert store.claim("msg-1", expires_at=1_100, now=1_000) == COMPLETED
+
+
+def test_ledger_keys_on_message_id_or_content():
+    store = SQLiteIdempotencyStore()
+    by_message = IdempotencyLedger(store, namespace="email:")
+    by_content = IdempotencyLedger(store, key_source="content")
+    record = {"messageId": "msg-1"}
+    rendered = {"body": "Hello"}
+
+    assert by_message.key(record, rendered) == "email:message:msg-1"
+    assert by_content.key(record, rendered) == by_content.key(
+        {"messageId": "msg-2"}, {"body": "Hello"}
+    )
+    assert by_message.key({}, rendered).startswith("email:content:")
+
+
+def test_ledger_remembers_completed_keys_for_ttl():
+    clock = FakeClock()
+    ledger = IdempotencyLedger(SQLiteIdempotencyStore(), ttl=60, clock=clock)
+
+    assert ledger.claim("key") is None
+    ledger.complete("key")
+    clock.now += 59
+    assert ledger.claim("key") == COMPLETED
+    clock.now += 2
+
+    assert ledger.claim("key") is None
+
+
+def test_ledger_validates_arguments():
+    with pytest.raises(ValueError, match="key_source"):
+        IdempotencyLedger(SQLiteIdempotencyStore(), key_source="body")
+    with pytest.raises(ValueError, match="positive"):
+        IdempotencyLedger(SQLiteIdempotencyStore(), ttl=0)
+
+
+def test_load_idempotency_ledger_reads_table_name(monkeypatch):
+    monkeypatch.delenv("LAMBDACRON_IDEMPOTENCY_TABLE", raising=False)
+    assert load_idempotency_ledger() is None
+
+    monkeypatch.setenv("LAMBDACRON_IDEMPOTENCY_TABLE", "ledger")
+    ledger = load_idempotency_ledger()
+
+    assert ledger.store.table_name == "ledger"
@@ -0,0 +1,89 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+CONTAINER_LAMBDA = REPO_ROOT / "notification-container" / "lambda.py"
+
+# Generous enough for slow CI machines; importing boto3 alone usually takes
+# longer than this on a Lambda cold start.
+IMPORT_BUDGET_SECONDS = 0.5
+
+PROBE = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import lambdacron.lambda_task
+import lambdacron.notifications
+lambdacron.notifications.PrintNotificationHandler
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "modules": sorted(
+        name for name in sys.modules if name.split(".")[0] in ("boto3", "botocore")
+    ),
+}))
+"""
+
+CONTAINER_PROBE = """
+import importlib.util
+import json
+import sys
+
+spec = importlib.util.spec_from_file_location("container_lambda", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+module.get_print_handler()
+print(json.dumps({
+    "modules": sorted(
+        name for name in sys.modules if name.split(".")[0] in ("boto3", "botocore")
+    ),
+}))
+"""
+
+
+def run_probe(code, *args):
+    env = {**os.environ, "PYTHONPATH": str(SRC_ROOT)}
+    output = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        check=True,
+        capture_output=True,
+        env=env,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def test_task_and_print_handler_imports_skip_boto3():
+    assert run_probe(PROBE)["modules"] == []
+
+
+def test_container_print_handler_skips_boto3():
+    probe = run_probe(CONTAINER_PROBE, str(CONTAINER_LAMBDA))
+    assert probe["modules"] == []
+
+
+def test_import_time_budget():
+    # Take the best of a few runs so one slow process start does not fail
+    # the test.
+    seconds = min(run_probe(PROBE)["seconds"] for _ in range(3))
+    assert seconds < IMPORT_BUDGET_SECONDS
+
+
+def test_notifications_exports_resolve_lazily():
+    import lambdacron.notifications as notifications
+    from lambdacron.notifications.email_handler import EmailNotificationHandler
+
+    assert notifications.EmailNotificationHandler is EmailNotificationHandler
+    assert "EmailNotificationHandler" in dir(notifications)
+    for name in notifications.__all__:
+        assert getattr(notifications, name) is not None
+    with pytest.raises(AttributeError, match="no attribute 'Missing'"):
+        notifications.Missing
@@ -1,18 +1,36 @@
+import asyncio
+import contextlib
+import io
 import json
 import logging
+import threading
+import time
 from types import SimpleNamespace
 from unittest.mock import Mock
 
 import pytest
 
+from lambdacron.change_detection import ChangeDetector, LocalFileStateStore
+from lambdacron.codec import get_json_codec
+from lambdacron.deadline import Deadline
 from lambdacron.lambda_task import (
+    AsyncCronLambdaTask,
+    BatchPublishError,
     CronLambdaTask,
     build_result_message_payload,
+    build_sns_publish_entry,
+    chunk_sns_batch_entries,
     dispatch_sns_messages,
+    dispatch_sns_messages_async,
+    estimate_sns_entry_size,
     extract_context_metadata,
+    is_fifo_topic,
     load_sns_message_group_id,
     load_sns_topic_arn,
 )
+from lambdacron.metrics import MetricsRecorder
+from lambdacron.tracing import Tracer
+from lambdacron.transport import TRANSPORT_KEY, PayloadTransport
 
 
 def test_extract_context_metadata_handles_missing_attrs():
@@ -178,7 +196,7 @@ def test_cron_lambda_task_init_loads_sns_topic_arn(monkeypatch):
     assert task.sns_topic_arn == "arn:one"
 
 
-def test_cron_lambda_task_init_creates_client_when_missing():
+def test_cron_lambda_task_creates_client_on_first_use():
     session = Mock()
     sns_client = Mock()
     session.client.return_value = sns_client
@@ -189,5 +207,864 @@ def test_cron_lambda_task_init_creates_client_when_missing():
 
     task = SampleTask(sns_topic_arn="arn:one", session=session)
 
-    session.client.assert_called_once_with("sns")
+    session.client.assert_not_called()
     assert task.sns_client is sns_client
+    assert task.sns_client is sns_client
+    session.client.assert_called_once()
+    assert session.client.call_args.args == ("sns",)
+    config = session.client.call_args.kwargs["config"]
+    assert config.retries["mode"] == "adaptive"
+    assert config.tcp_keepalive
+
+
+def _successful_batch(**kwargs):
+    return {
+        "Successful": [
+            {"Id": entry["Id"], "MessageId": f"sns-{entry['Id']}"}
+            for entry in kwargs["PublishBatchRequestEntries"]
+        ],
+        "Failed": [],
+    }
+
+
+def test_dispatch_sns_messages_batches_entries():
+    sns_client = Mock()
+    sns_client.publish_batch.side_effect = _successful_batch
+    result = {f"type_{index}": {"index": index} for index in range(12)}
+
+    dispatch_sns_messages(
+        result=result,
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_dispatch_batch"),
+        batch=True,
+    )
+
+    sns_client.publish.assert_not_called()
+    batches = [
+        call.kwargs["PublishBatchRequestEntries"]
+        for call in sns_client.publish_batch.call_args_list
+    ]
+    assert [len(entries) for entries in batches] == [10, 2]
+    first = batches[0][0]
+    assert first == {
+        "Id": "0",
+        **build_sns_publish_entry(result_type="type_0", message={"index": 0}),
+    }
+    assert all(
+        call.kwargs["TopicArn"] == "arn:one"
+        for call in sns_client.publish_batch.call_args_list
+    )
+
+
+def test_chunk_sns_batch_entries_respects_size_limit():
+    entries = [
+        build_sns_publish_entry(
+            result_type=f"type_{index}", message={"data": "x" * 100}
+        )
+        for index in range(4)
+    ]
+    entry_size = estimate_sns_entry_size(entries[0])
+
+    chunks = chunk_sns_batch_entries(entries, max_bytes=entry_size * 2)
+
+    assert [len(chunk) for chunk in chunks] == [2, 2]
+
+
+def test_dispatch_sns_messages_retries_only_failed_batch_entries(monkeypatch):
+    monkeypatch.setattr("lambdacron.lambda_task._PUBLISH_BATCH_RETRY_DELAY", 0)
+    sns_client = Mock()
+    responses = [
+        {
+            "Successful": [{"Id": "0", "MessageId": "sns-0"}],
+            "Failed": [
+                {"Id": "1", "Code": "InternalError", "SenderFault": False},
+            ],
+        },
+        {"Successful": [{"Id": "1", "MessageId": "sns-1"}], "Failed": []},
+    ]
+    sns_client.publish_batch.side_effect = responses
+
+    dispatch_sns_messages(
+        result={"success": {"ok": True}, "failure": {"ok": False}},
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_dispatch_retry"),
+        batch=True,
+    )
+
+    retried = sns_client.publish_batch.call_args_list[1].kwargs
+    assert [entry["Id"] for entry in retried["PublishBatchRequestEntries"]] == ["1"]
+
+
+def test_dispatch_sns_messages_reports_failed_batch_entries(monkeypatch):
+    monkeypatch.setattr("lambdacron.lambda_task._PUBLISH_BATCH_RETRY_DELAY", 0)
+    sns_client = Mock()
+    sns_client.publish_batch.return_value = {
+        "Successful": [{"Id": "0", "MessageId": "sns-0"}],
+        "Failed": [
+            {
+                "Id": "1",
+                "Code": "InvalidParameter",
+                "Message": "bad",
+                "SenderFault": True,
+            },
+        ],
+    }
+
+    with pytest.raises(BatchPublishError, match="failure") as exc_info:
+        dispatch_sns_messages(
+            result={"success": {"ok": True}, "failure": {"ok": False}},
+            sns_topic_arn="arn:one",
+            sns_client=sns_client,
+            logger=logging.getLogger("test_dispatch_failed"),
+            batch=True,
+        )
+
+    assert sns_client.publish_batch.call_count == 1
+    assert exc_info.value.failures["failure"]["Code"] == "InvalidParameter"
+
+
+def test_dispatch_sns_messages_retries_fifo_chunk_before_next(monkeypatch):
+    monkeypatch.setattr("lambdacron.lambda_task._PUBLISH_BATCH_RETRY_DELAY", 0)
+    sns_client = Mock()
+    responses = [
+        {
+            "Successful": [{"Id": str(index)} for index in range(10) if index != 1],
+            "Failed": [{"Id": "1", "Code": "InternalError", "SenderFault": False}],
+        }
+    ]
+    sns_client.publish_batch.side_effect = lambda **kwargs: (
+        responses.pop(0) if responses else _successful_batch(**kwargs)
+    )
+
+    dispatch_sns_messages(
+        result={f"type_{index}": {"index": index} for index in range(12)},
+        sns_topic_arn="arn:aws:sns:us-east-1:123:results.fifo",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_dispatch_fifo_retry"),
+        batch=True,
+        max_in_flight=4,
+    )
+
+    sent = [
+        [entry["Id"] for entry in call.kwargs["PublishBatchRequestEntries"]]
+        for call in sns_client.publish_batch.call_args_list
+    ]
+    assert sent == [[str(index) for index in range(10)], ["1"], ["10", "11"]]
+
+
+def test_dispatch_sns_messages_holds_back_failed_fifo_group(monkeypatch):
+    monkeypatch.setattr("lambdacron.lambda_task._PUBLISH_BATCH_RETRY_DELAY", 0)
+    sns_client = Mock()
+    sns_client.publish_batch.return_value = {
+        "Successful": [{"Id": str(index)} for index in range(9)],
+        "Failed": [{"Id": "9", "Code": "InvalidParameter", "SenderFault": True}],
+    }
+
+    with pytest.raises(BatchPublishError) as exc_info:
+        dispatch_sns_messages(
+            result={f"type_{index}": {"index": index} for index in range(12)},
+            sns_topic_arn="arn:aws:sns:us-east-1:123:results.fifo",
+            sns_client=sns_client,
+            logger=logging.getLogger("test_dispatch_fifo_blocked"),
+            batch=True,
+        )
+
+    sns_client.publish_batch.assert_called_once()
+    failures = exc_info.value.failures
+    assert failures["type_9"]["Code"] == "InvalidParameter"
+    assert failures["type_10"]["Code"] == "MessageGroupBlocked"
+    assert set(failures) == {"type_9", "type_10", "type_11"}
+
+
+def test_dispatch_sns_messages_holds_back_failed_fifo_group_in_streams():
+    sns_client = Mock()
+    sns_client.publish_batch.side_effect = [
+        {
+            "Successful": [{"Id": str(index)} for index in range(9)],
+            "Failed": [{"Id": "9", "Code": "InvalidParameter", "SenderFault": True}],
+        }
+    ]
+
+    with pytest.raises(BatchPublishError) as exc_info:
+        dispatch_sns_messages(
+            result=((f"type_{index}", {"index": index}) for index in range(12)),
+            sns_topic_arn="arn:aws:sns:us-east-1:123:results.fifo",
+            sns_client=sns_client,
+            logger=logging.getLogger("test_dispatch_stream_fifo_blocked"),
+            batch=True,
+        )
+
+    sns_client.publish_batch.assert_called_once()
+    assert set(exc_info.value.failures) == {"type_9", "type_10", "type_11"}
+
+
+def test_cron_lambda_task_batch_publish_flag():
+    sns_client = Mock()
+    sns_client.publish_batch.side_effect = _successful_batch
+
+    class SampleTask(CronLambdaTask):
+        def _perform_task(self, event, context):
+            return {"success": {"ok": True}, "failure": {"ok": False}}
+
+    task = SampleTask(
+        sns_topic_arn="arn:one", sns_client=sns_client, batch_publish=True
+    )
+    task.lambda_handler({}, SimpleNamespace())
+
+    sns_client.publish.assert_not_called()
+    sns_client.publish_batch.assert_called_once()
+
+
+class ConcurrencyTrackingSnsClient:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.published = []
+
+    def publish(self, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+            self.published.append(kwargs["MessageAttributes"]["result_type"])
+        return {"MessageId": "sns-1"}
+
+
+def test_is_fifo_topic():
+    assert is_fifo_topic("arn:aws:sns:us-east-1:123:results.fifo")
+    assert not is_fifo_topic("arn:aws:sns:us-east-1:123:results")
+
+
+def test_dispatch_sns_messages_publishes_concurrently():
+    sns_client = ConcurrencyTrackingSnsClient()
+    result = {f"type_{index}": {"index": index} for index in range(8)}
+
+    stats = dispatch_sns_messages(
+        result=result,
+        sns_topic_arn="arn:aws:sns:us-east-1:123:results",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_dispatch_concurrent"),
+        max_in_flight=4,
+    )
+
+    assert len(sns_client.published) == 8
+    assert 1 < sns_client.max_in_flight <= 4
+    assert stats.publish_calls == 8
+    assert stats.slowest_publish >= sns_client.delay
+    assert stats.duration >= stats.slowest_publish
+
+
+def test_dispatch_sns_messages_preserves_fifo_group_order():
+    sns_client = ConcurrencyTrackingSnsClient(delay=0.005)
+    result = {f"type_{index}": {"index": index} for index in range(6)}
+
+    dispatch_sns_messages(
+        result=result,
+        sns_topic_arn="arn:aws:sns:us-east-1:123:results.fifo",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_dispatch_fifo"),
+        max_in_flight=4,
+    )
+
+    assert sns_client.max_in_flight == 1
+    assert [attr["StringValue"] for attr in sns_client.published] == list(result)
+
+
+def test_dispatch_sns_messages_rejects_invalid_max_in_flight():
+    with pytest.raises(ValueError, match="max_in_flight must be at least 1"):
+        dispatch_sns_messages(
+            result={},
+            sns_topic_arn="arn:one",
+            sns_client=Mock(),
+            logger=logging.getLogger("test_dispatch_invalid"),
+            max_in_flight=0,
+        )
+
+
+def test_cron_lambda_task_reports_dispatch_timing(caplog):
+    class SampleTask(CronLambdaTask):
+        def _perform_task(self, event, context):
+            return {"success": {"ok": True}, "failure": {"ok": False}}
+
+    task = SampleTask(
+        sns_topic_arn="arn:one",
+        sns_client=Mock(),
+        logger=logging.getLogger("test_task_timing"),
+        max_in_flight=2,
+    )
+
+    with caplog.at_level(logging.INFO):
+        task.lambda_handler({}, SimpleNamespace())
+
+    (record,) = [r for r in caplog.records if r.message == "sns_dispatch"]
+    assert record.publish_calls == 2
+    assert record.dispatch_ms >= record.slowest_publish_ms >= 0
+
+
+def test_dispatch_sns_messages_uses_json_codec():
+    orjson = pytest.importorskip("orjson")
+    sns_client = Mock()
+
+    dispatch_sns_messages(
+        result={"success": {"ok": True}},
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_dispatch"),
+        json_codec=get_json_codec("orjson"),
+    )
+
+    message = sns_client.publish.call_args.kwargs["Message"]
+    assert message == orjson.dumps({"ok": True, "result_type": "success"}).decode()
+
+
+def test_dispatch_sns_messages_applies_payload_transport():
+    sns_client = Mock()
+
+    dispatch_sns_messages(
+        result={"report": {"items": list(range(1000))}},
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_dispatch"),
+        payload_transport=PayloadTransport(compress_threshold=1024),
+    )
+
+    message = json.loads(sns_client.publish.call_args.kwargs["Message"])
+    assert message[TRANSPORT_KEY]["encoding"] == "gzip"
+
+
+def test_dispatch_sns_messages_publishes_while_generator_runs():
+    published = threading.Event()
+    sns_client = Mock()
+    sns_client.publish.side_effect = lambda **kwargs: published.set()
+    overlapped = []
+
+    def results():
+        yield "first", {"index": 0}
+        # The first result should be published while this one is computed.
+        overlapped.append(published.wait(timeout=5))
+        yield "second", {"index": 1}
+
+    stats = dispatch_sns_messages(
+        result=results(),
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_dispatch_stream"),
+    )
+
+    assert overlapped == [True]
+    assert stats.result_count == 2
+    assert sns_client.publish.call_count == 2
+
+
+def test_dispatch_sns_messages_rejects_duplicate_streamed_result_types():
+    sns_client = Mock()
+    closed = []
+
+    def results():
+        try:
+            yield "success", {"ok": True}
+            yield "success", {"ok": False}
+            yield "never", {}
+        finally:
+            closed.append(True)
+
+    with pytest.raises(ValueError, match="Duplicate result type 'success'"):
+        dispatch_sns_messages(
+            result=results(),
+            sns_topic_arn="arn:one",
+            sns_client=sns_client,
+            logger=logging.getLogger("test_dispatch_stream"),
+        )
+
+    sns_client.publish.assert_called_once()
+    assert closed == [True]
+
+
+def test_dispatch_sns_messages_batches_streamed_results():
+    sns_client = Mock()
+    sns_client.publish_batch.side_effect = _successful_batch
+
+    stats = dispatch_sns_messages(
+        result=((f"type_{index}", {"index": index}) for index in range(12)),
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_dispatch_stream_batch"),
+        batch=True,
+    )
+
+    sizes = [
+        len(call.kwargs["PublishBatchRequestEntries"])
+        for call in sns_client.publish_batch.call_args_list
+    ]
+    assert sorted(sizes) == [2, 10]
+    assert stats.result_count == 12
+
+
+def test_dispatch_sns_messages_preserves_fifo_order_for_streams():
+    sns_client = ConcurrencyTrackingSnsClient(delay=0.005)
+    result_types = [f"type_{index}" for index in range(6)]
+
+    dispatch_sns_messages(
+        result=((result_type, {}) for result_type in result_types),
+        sns_topic_arn="arn:aws:sns:us-east-1:123:results.fifo",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_dispatch_stream_fifo"),
+        max_in_flight=4,
+    )
+
+    assert sns_client.max_in_flight == 1
+    assert [attr["StringValue"] for attr in sns_client.published] == result_types
+
+
+def test_cron_lambda_task_accepts_async_generator(caplog):
+    sns_client = Mock()
+
+    class AsyncTask(CronLambdaTask):
+        async def _perform_task(self, event, context):
+            for result_type in ("success", "failure"):
+                yield result_type, {"type": result_type}
+
+    task = AsyncTask(
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_task_async"),
+    )
+
+    with caplog.at_level(logging.INFO):
+        task.lambda_handler({}, SimpleNamespace())
+
+    messages = [
+        json.loads(call.kwargs["Message"]) for call in sns_client.publish.call_args_list
+    ]
+    assert messages == [
+        {"type": "success", "result_type": "success"},
+        {"type": "failure", "result_type": "failure"},
+    ]
+    (record,) = [r for r in caplog.records if r.message == "sns_dispatch"]
+    assert record.result_count == 2
+
+
+class SampleAsyncTask(AsyncCronLambdaTask):
+    def __init__(self, **kwargs):
+        super().__init__(
+            sns_topic_arn="arn:one", logger=logging.getLogger("test_async"), **kwargs
+        )
+        self.loops = []
+
+    async def _perform_task(self, event, context):
+        self.loops.append(asyncio.get_running_loop())
+        results = await asyncio.gather(
+            *(self._fetch(name) for name in ("success", "failure"))
+        )
+        return dict(results)
+
+    async def _fetch(self, name):
+        await asyncio.sleep(0)
+        return name, {"name": name}
+
+
+def test_async_cron_lambda_task_publishes_results():
+    sns_client = Mock()
+    task = SampleAsyncTask(sns_client=sns_client)
+
+    task.lambda_handler({}, SimpleNamespace())
+
+    assert [
+        json.loads(call.kwargs["Message"])["name"]
+        for call in sns_client.publish.call_args_list
+    ] == ["success", "failure"]
+
+
+def test_async_cron_lambda_task_reuses_loop_across_invocations():
+    task = SampleAsyncTask(sns_client=Mock())
+
+    task.lambda_handler({}, SimpleNamespace())
+    task.lambda_handler({}, SimpleNamespace())
+    first, second = task.loops
+    task.close()
+    task.lambda_handler({}, SimpleNamespace())
+
+    assert first is second
+    assert first.is_closed()
+    assert task.loops[2] is not first
+    task.close()
+
+
+def test_async_cron_lambda_task_rejects_running_loop():
+    task = SampleAsyncTask(sns_client=Mock())
+
+    async def invoke():
+        task.lambda_handler({}, SimpleNamespace())
+
+    with pytest.raises(RuntimeError, match="await handle"):
+        asyncio.run(invoke())
+
+
+def test_dispatch_sns_messages_async_streams_async_generators():
+    sns_client = Mock()
+
+    async def results():
+        for index in range(5):
+            await asyncio.sleep(0)
+            yield f"type_{index}", {"index": index}
+
+    stats = asyncio.run(
+        dispatch_sns_messages_async(
+            result=results(),
+            sns_topic_arn="arn:one",
+            sns_client=sns_client,
+            logger=logging.getLogger("test_dispatch_async"),
+            max_in_flight=2,
+        )
+    )
+
+    assert stats.result_count == 5
+    assert sns_client.publish.call_count == 5
+
+
+def test_dispatch_sns_messages_async_stops_on_duplicate_result_type():
+    sns_client = Mock()
+
+    async def results():
+        for result_type in ["a", "a", "b", "c", "d", "e", "f", "g"]:
+            yield result_type, {}
+
+    with pytest.raises(ValueError, match="Duplicate result type 'a'"):
+        asyncio.run(
+            dispatch_sns_messages_async(
+                result=results(),
+                sns_topic_arn="arn:one",
+                sns_client=sns_client,
+                logger=logging.getLogger("test_dispatch_async"),
+            )
+        )
+
+    sns_client.publish.assert_called_once()
+
+
+def lambda_context(remaining_seconds):
+    deadline = time.monotonic() + remaining_seconds
+    return SimpleNamespace(
+        get_remaining_time_in_millis=lambda: int((deadline - time.monotonic()) * 1000)
+    )
+
+
+def test_cron_lambda_task_stops_streaming_at_deadline(caplog):
+    sns_client = Mock()
+    requested = []
+
+    class SlowTask(CronLambdaTask):
+        def _perform_task(self, event, context):
+            for result_type in ("first", "second", "third"):
+                requested.append(result_type)
+                yield result_type, {}
+                time.sleep(0.1)
+
+    task = SlowTask(
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_task_deadline"),
+        dispatch_reserve=5.0,
+    )
+
+    with caplog.at_level(logging.INFO):
+        task.lambda_handler({}, lambda_context(5.05))
+
+    assert requested == ["first", "second"]
+    assert sns_client.publish.call_count == 2
+    (record,) = [r for r in caplog.records if r.message == "task_deadline_exceeded"]
+    assert record.results_produced == 2
+
+
+def test_cron_lambda_task_handles_deadline_check(caplog):
+    sns_client = Mock()
+
+    class CheckingTask(CronLambdaTask):
+        def _perform_task(self, event, context):
+            yield "first", {}
+            self.deadline.cancel()
+            self.deadline.check()
+            yield "second", {}
+
+    task = CheckingTask(
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_task_deadline"),
+    )
+
+    with caplog.at_level(logging.INFO):
+        task.lambda_handler({}, SimpleNamespace())
+
+    sns_client.publish.assert_called_once()
+    assert any(r.message == "task_deadline_exceeded" for r in caplog.records)
+
+
+def test_dispatch_sns_messages_drops_results_after_deadline(caplog):
+    deadline = Deadline()
+    sns_client = Mock()
+    sns_client.publish.side_effect = lambda **kwargs: deadline.cancel()
+
+    with caplog.at_level(logging.WARNING):
+        stats = dispatch_sns_messages(
+            result={"first": {}, "second": {}, "third": {}},
+            sns_topic_arn="arn:one",
+            sns_client=sns_client,
+            logger=logging.getLogger("test_dispatch_deadline"),
+            deadline=deadline,
+        )
+
+    sns_client.publish.assert_called_once()
+    assert stats.dropped == ("second", "third")
+    (record,) = [r for r in caplog.records if r.message == "sns_results_dropped"]
+    assert record.result_types == ["second", "third"]
+
+
+def test_async_cron_lambda_task_times_out_slow_coroutine(caplog):
+    sns_client = Mock()
+
+    class SlowAsyncTask(AsyncCronLambdaTask):
+        async def _perform_task(self, event, context):
+            await asyncio.sleep(5)
+            return {"late": {}}
+
+    task = SlowAsyncTask(
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_async_deadline"),
+        dispatch_reserve=5.0,
+    )
+
+    with caplog.at_level(logging.INFO):
+        task.lambda_handler({}, lambda_context(5.05))
+    task.close()
+
+    sns_client.publish.assert_not_called()
+    assert any(r.message == "task_deadline_exceeded" for r in caplog.records)
+
+
+def test_cron_lambda_task_suppresses_unchanged_results(tmp_path):
+    sns_client = Mock()
+
+    class StableTask(CronLambdaTask):
+        def _perform_task(self, event, context):
+            return {"same": {"ok": True}, "changing": {"run": event["run"]}}
+
+    task = StableTask(
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_task_changes"),
+        change_detector=ChangeDetector(LocalFileStateStore(tmp_path / "state.json")),
+    )
+
+    task.lambda_handler({"run": 1}, SimpleNamespace())
+    task.lambda_handler({"run": 2}, SimpleNamespace())
+
+    published = [
+        call.kwargs["MessageAttributes"]["result_type"]["StringValue"]
+        for call in sns_client.publish.call_args_list
+    ]
+    assert published == ["same", "changing", "changing"]
+
+
+def test_cron_lambda_task_rejects_duplicate_results_with_change_detector(tmp_path):
+    sns_client = Mock()
+
+    class RepeatingTask(CronLambdaTask):
+        def _perform_task(self, event, context):
+            yield "a", {"ok": True}
+            yield "a", {"ok": True}
+
+    detector = ChangeDetector(LocalFileStateStore(tmp_path / "state.json"))
+    detector.filter({"a": {"ok": True}})
+    detector.commit()
+    task = RepeatingTask(
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_task_changes"),
+        change_detector=detector,
+    )
+
+    with pytest.raises(ValueError, match="Duplicate result type 'a'"):
+        task.lambda_handler({}, SimpleNamespace())
+    sns_client.publish.assert_not_called()
+
+
+def test_cron_lambda_task_keeps_state_for_failed_batch_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    sns_client = Mock()
+    sns_client.publish_batch.return_value = {
+        "Successful": [{"Id": "0", "MessageId": "m-0"}],
+        "Failed": [{"Id": "1", "Code": "InternalError", "SenderFault": False}],
+    }
+
+    class SampleTask(CronLambdaTask):
+        def _perform_task(self, event, context):
+            return {"ok": {"value": 1}, "flaky": {"value": 2}}
+
+    detector = ChangeDetector(LocalFileStateStore(tmp_path / "state.json"))
+    task = SampleTask(
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        logger=logging.getLogger("test_task_changes"),
+        batch_publish=True,
+        change_detector=detector,
+    )
+
+    with pytest.raises(BatchPublishError):
+        task.lambda_handler({}, SimpleNamespace())
+
+    assert detector.store.get("ok") is not None
+    assert detector.store.get("flaky") is None
+
+
+def test_cron_lambda_task_emits_metrics_once_per_invocation():
+    class SampleTask(CronLambdaTask):
+        def _perform_task(self, event, context):
+            return {"success": {"ok": True}, "failure": {"ok": False}}
+
+    stream = io.StringIO()
+    task = SampleTask(
+        sns_topic_arn="arn:one",
+        sns_client=Mock(),
+        metrics=MetricsRecorder(dimensions={"Task": "SampleTask"}, stream=stream),
+    )
+
+    task.lambda_handler({}, SimpleNamespace())
+
+    documents = [json.loads(line) for line in stream.getvalue().splitlines()]
+    (summary,) = [doc for doc in documents if "ResultType" not in doc]
+    assert summary["Task"] == "SampleTask"
+    assert summary["ResultCount"] == 2
+    assert summary["PublishCalls"] == 2
+    assert summary["DroppedResults"] == 0
+    assert summary["TaskDuration"] >= summary["DispatchDuration"] >= 0
+    latencies = {
+        doc["ResultType"]: doc["PublishLatency"]
+        for doc in documents
+        if "ResultType" in doc
+    }
+    assert set(latencies) == {"success", "failure"}
+
+
+def test_cron_lambda_task_counts_failed_batch_entries_in_metrics(monkeypatch):
+    monkeypatch.setattr("lambdacron.lambda_task._PUBLISH_BATCH_RETRY_DELAY", 0)
+    sns_client = Mock()
+    sns_client.publish_batch.return_value = {
+        "Successful": [{"Id": "0", "MessageId": "sns-0"}],
+        "Failed": [
+            {
+                "Id": "1",
+                "Code": "InvalidParameter",
+                "Message": "bad",
+                "SenderFault": True,
+            }
+        ],
+    }
+
+    class SampleTask(CronLambdaTask):
+        def _perform_task(self, event, context):
+            return {"success": {"ok": True}, "failure": {"ok": False}}
+
+    stream = io.StringIO()
+    task = SampleTask(
+        sns_topic_arn="arn:one",
+        sns_client=sns_client,
+        batch_publish=True,
+        metrics=MetricsRecorder(stream=stream),
+    )
+
+    with pytest.raises(BatchPublishError):
+        task.lambda_handler({}, SimpleNamespace())
+
+    documents = [json.loads(line) for line in stream.getvalue().splitlines()]
+    failures = {
+        doc["ResultType"]: doc["PublishFailures"]
+        for doc in documents
+        if "PublishFailures" in doc
+    }
+    assert failures == {"failure": 1}
+    assert any("TaskDuration" in doc for doc in documents)
+
+
+class RecordingTracer(Tracer):
+    def __init__(self):
+        self.events = []
+
+    @contextlib.contextmanager
+    def invocation(self, name):
+        self.events.append(("invocation", name))
+        yield
+
+    @contextlib.contextmanager
+    def span(self, name, attributes=None):
+        self.events.append(("span", name))
+        yield
+
+
+class TimingTracer(Tracer):
+    def __init__(self):
+        self.spans = []
+
+    @contextlib.contextmanager
+    def span(self, name, attributes=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, time.perf_counter() - start))
+
+
+def test_cron_lambda_task_perform_span_covers_streamed_results():
+    class StreamingTask(CronLambdaTask):
+        def _perform_task(self, event, context):
+            for result_type in ("first", "second"):
+                time.sleep(0.05)
+                yield result_type, {}
+
+    tracer = TimingTracer()
+    task = StreamingTask(sns_topic_arn="arn:one", sns_client=Mock(), tracer=tracer)
+
+    task.lambda_handler({}, SimpleNamespace())
+
+    (perform,) = [seconds for name, seconds in tracer.spans if name == "perform"]
+    assert perform >= 0.1
+
+
+def test_async_cron_lambda_task_perform_span_covers_streamed_results():
+    class StreamingTask(AsyncCronLambdaTask):
+        async def _perform_task(self, event, context):
+            for result_type in ("first", "second"):
+                await asyncio.sleep(0.05)
+                yield result_type, {}
+
+    tracer = TimingTracer()
+    task = StreamingTask(sns_topic_arn="arn:one", sns_client=Mock(), tracer=tracer)
+
+    task.lambda_handler({}, SimpleNamespace())
+
+    (perform,) = [seconds for name, seconds in tracer.spans if name == "perform"]
+    assert perform >= 0.1
+
+
+def test_cron_lambda_task_traces_stages():
+    class SampleTask(CronLambdaTask):
+        def _perform_task(self, event, context):
+            return {"success": {"ok": True}}
+
+    tracer = RecordingTracer()
+    task = SampleTask(sns_topic_arn="arn:one", sns_client=Mock(), tracer=tracer)
+
+    task.lambda_handler({}, SimpleNamespace())
+
+    assert tracer.events == [
+        ("invocation", "SampleTask"),
+        ("span", "perform"),
+        ("span", "build_payload"),
+        ("span", "publish"),
+    ]
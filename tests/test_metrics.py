@@ -0,0 +1,131 @@
+import io
+import json
+
+from lambdacron.metrics import MetricsRecorder, load_metrics
+
+
+def read_documents(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_metrics_recorder_flushes_emf_document():
+    stream = io.StringIO()
+    recorder = MetricsRecorder(
+        "Test", dimensions={"Task": "Sample"}, stream=stream, clock=lambda: 1.5
+    )
+
+    recorder.put("ResultCount", 3)
+    recorder.put("TaskDuration", 12.5, "Milliseconds")
+    recorder.put("TaskDuration", 7.5, "Milliseconds")
+    recorder.flush()
+
+    (document,) = read_documents(stream)
+    assert document["_aws"] == {
+        "Timestamp": 1500,
+        "CloudWatchMetrics": [
+            {
+                "Namespace": "Test",
+                "Dimensions": [["Task"]],
+                "Metrics": [
+                    {"Name": "ResultCount", "Unit": "Count"},
+                    {"Name": "TaskDuration", "Unit": "Milliseconds"},
+                ],
+            }
+        ],
+    }
+    assert document["Task"] == "Sample"
+    assert document["ResultCount"] == 3
+    assert document["TaskDuration"] == [12.5, 7.5]
+
+
+def test_metrics_recorder_groups_by_dimensions():
+    stream = io.StringIO()
+    recorder = MetricsRecorder(dimensions={"Task": "Sample"}, stream=stream)
+
+    recorder.put("PublishLatency", 1.0, dimensions={"ResultType": "a"})
+    recorder.put("PublishLatency", 2.0, dimensions={"ResultType": "b"})
+    recorder.flush()
+
+    documents = read_documents(stream)
+    assert [doc["ResultType"] for doc in documents] == ["a", "b"]
+    assert [doc["PublishLatency"] for doc in documents] == [1.0, 2.0]
+    assert documents[0]["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [
+        ["Task", "ResultType"]
+    ]
+
+
+def test_metrics_recorder_splits_documents_at_emf_limits():
+    stream = io.StringIO()
+    recorder = MetricsRecorder(stream=stream)
+
+    for value in range(150):
+        recorder.put("Latency", value)
+    for index in range(120):
+        recorder.put(f"Metric{index}", index)
+    recorder.flush()
+
+    documents = read_documents(stream)
+    assert len(documents) == 2
+    assert len(documents[0]["Latency"]) == 100
+    assert len(documents[1]["Latency"]) == 50
+    for document in documents:
+        assert len(document["_aws"]["CloudWatchMetrics"][0]["Metrics"]) <= 100
+    names = [
+        metric["Name"]
+        for document in documents
+        for metric in document["_aws"]["CloudWatchMetrics"][0]["Metrics"]
+    ]
+    assert sorted(set(names)) == sorted(
+        ["Latency"] + [f"Metric{i}" for i in range(120)]
+    )
+
+
+def test_metrics_recorder_flush_clears_buffer():
+    stream = io.StringIO()
+    recorder = MetricsRecorder(stream=stream)
+
+    recorder.put("ResultCount", 1)
+    recorder.flush()
+    recorder.flush()
+
+    assert len(read_documents(stream)) == 1
+
+
+def test_metrics_recorder_timer_records_milliseconds():
+    stream = io.StringIO()
+    recorder = MetricsRecorder(stream=stream)
+
+    with recorder.timer("RenderTime", dimensions={"Template": "body"}):
+        pass
+    recorder.flush()
+
+    (document,) = read_documents(stream)
+    assert document["Template"] == "body"
+    assert document["RenderTime"] >= 0
+    assert document["_aws"]["CloudWatchMetrics"][0]["Metrics"] == [
+        {"Name": "RenderTime", "Unit": "Milliseconds"}
+    ]
+
+
+def test_disabled_metrics_recorder_writes_nothing():
+    stream = io.StringIO()
+    recorder = MetricsRecorder(enabled=False, stream=stream)
+
+    recorder.put("ResultCount", 1)
+    with recorder.timer("TaskDuration"):
+        pass
+    recorder.flush()
+
+    assert stream.getvalue() == ""
+
+
+def test_load_metrics_reads_env(monkeypatch):
+    monkeypatch.delenv("LAMBDACRON_METRICS_NAMESPACE", raising=False)
+    assert not load_metrics().enabled
+
+    monkeypatch.setenv("LAMBDACRON_METRICS_NAMESPACE", "Custom")
+    recorder = load_metrics(dimensions={"Task": "Sample"})
+
+    assert recorder.enabled
+    assert recorder.namespace == "Custom"
+    assert recorder.dimensions == {"Task": "Sample"}
@@ -0,0 +1,52 @@
+from jinja2 import Environment, StrictUndefined
+
+from lambdacron import precompile
+from lambdacron.notifications.base import (
+    TemplateBytecodeCache,
+    TemplateCache,
+    TemplateProviderLoader,
+    directory_template_providers,
+)
+
+
+def write_templates(tmp_path):
+    templates = tmp_path / "templates"
+    (templates / "partials").mkdir(parents=True)
+    (templates / "partials" / "footer.txt").write_text("-- {{ result_type }}")
+    (templates / "print.txt").write_text(
+        '{{ message }} {% include "partials/footer.txt" %}'
+    )
+    (templates / ".gitkeep").write_text("")
+    return templates
+
+
+def test_precompile_main_writes_bytecode_used_at_runtime(tmp_path, capsys, monkeypatch):
+    templates = write_templates(tmp_path)
+    output_dir = tmp_path / "bytecode"
+
+    code = precompile.main([str(templates), "--output-dir", str(output_dir)])
+
+    assert code == 0
+    assert "Precompiled 2 templates" in capsys.readouterr().out
+    env = Environment(
+        undefined=StrictUndefined,
+        loader=TemplateProviderLoader(directory_template_providers(templates)),
+        bytecode_cache=TemplateBytecodeCache(
+            tmp_path / "writable", precompiled_dir=output_dir
+        ),
+    )
+    monkeypatch.setattr(env, "compile", None)
+    template = TemplateCache().get(env, "body", (templates / "print.txt").read_text())
+
+    assert template.render(message="hi", result_type="daily") == "hi -- daily"
+
+
+def test_precompile_main_reports_syntax_errors(tmp_path, capsys):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "broken.txt").write_text("{% if %}")
+
+    code = precompile.main([str(templates), "-o", str(tmp_path / "bytecode")])
+
+    assert code == 1
+    assert capsys.readouterr().err.startswith("error:")
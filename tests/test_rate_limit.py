@@ -0,0 +1,53 @@
+import pytest
+
+from lambdacron.rate_limit import TokenBucket
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_up_to_capacity():
+    fake = FakeTime()
+    bucket = TokenBucket(2, capacity=3, clock=fake.clock, sleep=fake.sleep)
+
+    for _ in range(3):
+        assert bucket.acquire()
+
+    assert fake.sleeps == []
+
+
+def test_token_bucket_waits_for_refill():
+    fake = FakeTime()
+    bucket = TokenBucket(4, clock=fake.clock, sleep=fake.sleep)
+    for _ in range(4):
+        bucket.acquire()
+
+    bucket.acquire()
+    bucket.acquire()
+
+    assert fake.sleeps == pytest.approx([0.25, 0.25])
+
+
+def test_token_bucket_refuses_wait_beyond_timeout():
+    fake = FakeTime()
+    bucket = TokenBucket(1, clock=fake.clock, sleep=fake.sleep)
+    bucket.acquire()
+
+    assert not bucket.acquire(timeout=0.5)
+    assert bucket.acquire(timeout=1.0)
+    assert fake.sleeps == pytest.approx([1.0])
+
+
+def test_token_bucket_rejects_invalid_rate():
+    with pytest.raises(ValueError, match="rate must be positive"):
+        TokenBucket(0)
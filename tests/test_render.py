@@ -1,4 +1,5 @@
 import json
+import threading
 from io import StringIO
 
 import pytest
@@ -190,3 +191,291 @@ def test_render_main_rejects_non_object_result_payload(tmp_path, capsys):
         "Result payload for type 'success' must be a JSON object, got str"
         in captured.err
     )
+
+
+def write_batch_inputs(tmp_path):
+    templates = tmp_path / "templates"
+    fixtures = tmp_path / "fixtures"
+    templates.mkdir()
+    fixtures.mkdir()
+    (templates / "status.txt").write_text(
+        "Status {{ status }} ({{ result_type }})", encoding="utf-8"
+    )
+    (templates / "short.txt").write_text("{{ status }}", encoding="utf-8")
+    (fixtures / "daily.json").write_text(
+        json.dumps({"success": {"status": "ok"}, "failure": {"status": "bad"}}),
+        encoding="utf-8",
+    )
+    (fixtures / "weekly.json").write_text(
+        json.dumps({"success": {"status": "fine"}}), encoding="utf-8"
+    )
+    return templates, fixtures
+
+
+def test_render_main_batch_renders_globs(tmp_path, capsys):
+    templates, fixtures = write_batch_inputs(tmp_path)
+    output_dir = tmp_path / "out"
+
+    code = render.main(
+        [
+            "--templates",
+            str(templates / "*.txt"),
+            "--fixtures",
+            str(fixtures / "*.json"),
+            "--output-dir",
+            str(output_dir),
+        ]
+    )
+
+    captured = capsys.readouterr()
+    assert code == 0
+    assert captured.out.startswith("Rendered 6 of 6 in ")
+    assert (output_dir / "daily" / "failure" / "status.txt").read_text(
+        encoding="utf-8"
+    ) == "Status bad (failure)"
+    assert (output_dir / "weekly" / "success" / "short.txt").read_text(
+        encoding="utf-8"
+    ) == "fine"
+    summary = json.loads((output_dir / render.SUMMARY_FILENAME).read_text())
+    assert summary["rendered"] == 6
+    assert summary["failed"] == 0
+    assert all(entry["seconds"] >= 0 for entry in summary["renders"])
+
+
+def test_render_main_batch_reads_manifest(tmp_path, capsys):
+    write_batch_inputs(tmp_path)
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "renders": [
+                    {
+                        "template": "templates/status.txt",
+                        "fixture": "fixtures/daily.json",
+                        "result_type": "success",
+                        "output": "daily-success.txt",
+                    },
+                    {
+                        "template": "templates/short.txt",
+                        "fixture": "fixtures/daily.json",
+                    },
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    output_dir = tmp_path / "out"
+
+    code = render.main(["--manifest", str(manifest), "-o", str(output_dir)])
+
+    assert code == 0
+    assert (output_dir / "daily-success.txt").read_text(
+        encoding="utf-8"
+    ) == "Status ok (success)"
+    assert sorted(path.name for path in (output_dir / "daily").iterdir()) == [
+        "failure",
+        "success",
+    ]
+
+
+def test_render_main_batch_reports_failures(tmp_path, capsys):
+    templates, fixtures = write_batch_inputs(tmp_path)
+    (templates / "missing.txt").write_text("{{ missing }}", encoding="utf-8")
+    output_dir = tmp_path / "out"
+
+    code = render.main(
+        [
+            "--templates",
+            str(templates / "*.txt"),
+            "--fixtures",
+            str(fixtures / "weekly.json"),
+            "-r",
+            "success",
+            "-o",
+            str(output_dir),
+        ]
+    )
+
+    captured = capsys.readouterr()
+    assert code == 1
+    assert "missing.txt" in captured.err
+    assert "undefined" in captured.err.lower()
+    summary = json.loads((output_dir / render.SUMMARY_FILENAME).read_text())
+    assert summary["rendered"] == 2
+    assert summary["failed"] == 1
+
+
+def test_render_main_batch_uses_process_pool(tmp_path, capsys):
+    templates, fixtures = write_batch_inputs(tmp_path)
+    serial_dir = tmp_path / "serial"
+    pooled_dir = tmp_path / "pooled"
+    args = [
+        "--templates",
+        str(templates / "*.txt"),
+        "--fixtures",
+        str(fixtures / "*.json"),
+    ]
+
+    assert render.main(args + ["-o", str(serial_dir)]) == 0
+    assert render.main(args + ["-o", str(pooled_dir), "--jobs", "2"]) == 0
+
+    def rendered(root):
+        return {
+            path.relative_to(root): path.read_text(encoding="utf-8")
+            for path in root.rglob("*.txt")
+        }
+
+    assert rendered(pooled_dir) == rendered(serial_dir)
+
+
+def test_render_main_batch_rejects_duplicate_outputs(tmp_path, capsys):
+    templates, fixtures = write_batch_inputs(tmp_path)
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "daily.json").write_text(
+        json.dumps({"success": {"status": "ok"}}), encoding="utf-8"
+    )
+
+    code = render.main(
+        [
+            "--templates",
+            str(templates / "short.txt"),
+            "--fixtures",
+            str(fixtures / "daily.json"),
+            "--fixtures",
+            str(other / "daily.json"),
+            "-r",
+            "success",
+            "-o",
+            str(tmp_path / "out"),
+        ]
+    )
+
+    captured = capsys.readouterr()
+    assert code == 1
+    assert "both write" in captured.err
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--templates", "*.txt", "-o", "out"],
+        ["--templates", "*.txt", "--fixtures", "*.json"],
+        ["--manifest", "m.json", "--templates", "*.txt", "-o", "out"],
+    ],
+)
+def test_render_main_batch_validates_arguments(argv):
+    with pytest.raises(SystemExit) as exc_info:
+        render.main(argv)
+
+    assert exc_info.value.code == 2
+
+
+def test_render_main_renders_included_templates(tmp_path, capsys):
+    partials = tmp_path / "partials"
+    partials.mkdir()
+    (partials / "footer.txt").write_text("-- {{ result_type }}", encoding="utf-8")
+    template_path = tmp_path / "template.txt"
+    template_path.write_text(
+        '{{ message }} {% include "footer.txt" %}', encoding="utf-8"
+    )
+    output_path = tmp_path / "output.json"
+    output_path.write_text(json.dumps({"example": {"message": "hi"}}), encoding="utf-8")
+
+    code = render.main(
+        [
+            "-t",
+            str(template_path),
+            "-r",
+            "example",
+            "-I",
+            str(partials),
+            str(output_path),
+        ]
+    )
+
+    assert code == 0
+    assert capsys.readouterr().out.strip() == "hi -- example"
+
+
+def write_layered_templates(tmp_path):
+    templates, fixtures = write_batch_inputs(tmp_path)
+    (templates / "base.html").write_text(
+        "<p>{% block body %}{% endblock %}</p>", encoding="utf-8"
+    )
+    (templates / "footer.html").write_text("footer", encoding="utf-8")
+    (templates / "page.txt").write_text(
+        '{% extends "base.html" %}{% block body %}{{ status }} '
+        '{% include "footer.html" %}{% endblock %}',
+        encoding="utf-8",
+    )
+    return templates, fixtures
+
+
+def test_batch_renderer_finds_transitive_dependencies(tmp_path):
+    templates, _ = write_layered_templates(tmp_path)
+    renderer = render.BatchRenderer([templates])
+
+    assert renderer.dependencies(templates / "page.txt") == {
+        (templates / name).resolve()
+        for name in ("page.txt", "base.html", "footer.html")
+    }
+    assert renderer.dependencies(templates / "short.txt") == {
+        (templates / "short.txt").resolve()
+    }
+
+
+def test_watch_render_rerenders_only_affected_outputs(tmp_path, capsys):
+    templates, fixtures = write_layered_templates(tmp_path)
+    output_dir = tmp_path / "out"
+    jobs = render.discover_jobs(
+        template_globs=[str(templates / "*.txt")],
+        fixture_globs=[str(fixtures / "weekly.json")],
+    )
+    watched = []
+
+    def changes(get_paths):
+        watched.append(get_paths())
+        (templates / "footer.html").write_text("new footer", encoding="utf-8")
+        yield {(templates / "footer.html").resolve()}
+        watched.append(get_paths())
+        (fixtures / "weekly.json").write_text(
+            json.dumps({"success": {"status": "great"}}), encoding="utf-8"
+        )
+        yield {(fixtures / "weekly.json").resolve()}
+
+    render.watch_render(jobs, output_dir=output_dir, changes=changes)
+
+    rendered = output_dir / "weekly" / "success"
+    assert (rendered / "page.txt").read_text() == "<p>great new footer</p>"
+    assert (rendered / "short.txt").read_text() == "great"
+    assert (templates / "base.html").resolve() in watched[0]
+    lines = capsys.readouterr().err.splitlines()
+    assert [line.split(" in ")[0] for line in lines] == [
+        "Rendered 3 of 3",
+        "Rendered 1 of 1",
+        "Rendered 3 of 3",
+    ]
+
+
+def test_watch_changes_polls_for_modified_files(tmp_path):
+    watched = tmp_path / "template.txt"
+    watched.write_text("one", encoding="utf-8")
+    changes = render.watch_changes(
+        lambda: {watched.resolve()}, interval=0.01, polling=True
+    )
+    timer = threading.Timer(0.05, watched.write_text, ("three",))
+    timer.start()
+
+    assert next(changes) == {watched.resolve()}
+    timer.join()
+
+
+def test_render_main_watch_rejects_stdin(tmp_path):
+    template_path = tmp_path / "template.txt"
+    template_path.write_text("{{ message }}", encoding="utf-8")
+
+    with pytest.raises(SystemExit) as exc_info:
+        render.main(["-t", str(template_path), "-r", "example", "--watch"])
+
+    assert exc_info.value.code == 2
@@ -0,0 +1,103 @@
+import contextlib
+import logging
+
+import pytest
+
+from lambdacron.tracing import (
+    OpenTelemetryTracer,
+    ProfilingTracer,
+    Tracer,
+    load_tracer,
+)
+
+
+class FakeOtelTracer:
+    def __init__(self):
+        self.spans = []
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        self.spans.append((name, attributes))
+        yield
+
+
+def busy_work():
+    return sum(index * index for index in range(1000))
+
+
+def test_default_tracer_is_a_shared_no_op():
+    tracer = Tracer()
+
+    assert tracer.span("render") is tracer.span("notify")
+    with tracer.invocation("Task"), tracer.span("perform"):
+        pass
+
+
+def test_profiling_tracer_logs_report_for_first_invocation(caplog):
+    tracer = ProfilingTracer(logger=logging.getLogger("test_profile"))
+
+    with caplog.at_level(logging.INFO):
+        with tracer.invocation("SampleTask"):
+            with tracer.span("perform"):
+                busy_work()
+            with tracer.span("publish"):
+                busy_work()
+        with tracer.invocation("SampleTask"):
+            busy_work()
+
+    (record,) = [r for r in caplog.records if r.message == "profile_report"]
+    assert record.invocation == "SampleTask"
+    assert record.profiler == "cprofile"
+    assert set(record.spans_ms) == {"perform", "publish"}
+    assert "busy_work" in record.report
+    assert tracer.span("perform") is Tracer().span("perform")
+
+
+def test_profiling_tracer_writes_profile_files(tmp_path):
+    tracer = ProfilingTracer(output_dir=tmp_path)
+
+    with tracer.invocation("SampleTask"):
+        busy_work()
+
+    assert len(list(tmp_path.glob("SampleTask-*.prof"))) == 1
+
+
+def test_profiling_tracer_rejects_unknown_profiler():
+    with pytest.raises(ValueError, match="Unsupported profiler"):
+        ProfilingTracer("yappi")
+
+
+def test_profiling_tracer_requires_pyinstrument():
+    try:
+        import pyinstrument  # noqa: F401
+    except ImportError:
+        with pytest.raises(ValueError, match="requires the pyinstrument package"):
+            ProfilingTracer("pyinstrument")
+    else:
+        pytest.skip("pyinstrument is installed")
+
+
+def test_opentelemetry_tracer_opens_spans():
+    otel = FakeOtelTracer()
+    tracer = OpenTelemetryTracer(otel)
+
+    with tracer.invocation("SampleTask"):
+        with tracer.span("render", {"template": "body"}):
+            pass
+
+    assert otel.spans == [
+        ("SampleTask", None),
+        ("lambdacron.render", {"template": "body"}),
+    ]
+
+
+def test_load_tracer_reads_env(monkeypatch):
+    monkeypatch.delenv("LAMBDACRON_TRACER", raising=False)
+    assert type(load_tracer()) is Tracer
+
+    monkeypatch.setenv("LAMBDACRON_TRACER", "cProfile")
+    assert isinstance(load_tracer(), ProfilingTracer)
+
+    monkeypatch.setenv("LAMBDACRON_TRACER", "zipkin")
+    with pytest.raises(ValueError, match="Unsupported tracer 'zipkin'"):
+        load_tracer()
@@ -0,0 +1,102 @@
+import json
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from lambdacron.transport import (
+    TRANSPORT_KEY,
+    PayloadTransport,
+    load_payload_transport,
+)
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="payloads")
+        yield client
+
+
+def build_message(item_count):
+    return json.dumps(
+        {
+            "items": [
+                {"name": f"item-{index}", "ok": True} for index in range(item_count)
+            ],
+            "result_type": "report",
+        }
+    )
+
+
+def test_payload_transport_leaves_small_messages_inline():
+    transport = PayloadTransport(compress_threshold=1024)
+    message = build_message(1)
+
+    assert transport.encode(message, result_type="report") == message
+
+
+def test_payload_transport_compresses_large_messages():
+    transport = PayloadTransport(compress_threshold=1024)
+    message = build_message(200)
+
+    encoded = transport.encode(message, result_type="report")
+    envelope = json.loads(encoded)
+
+    assert envelope[TRANSPORT_KEY]["encoding"] == "gzip"
+    assert len(encoded) < len(message)
+    assert PayloadTransport.is_envelope(envelope)
+    assert transport.decode(envelope) == message
+
+
+def test_payload_transport_offloads_to_s3(s3_client):
+    transport = PayloadTransport(
+        compress_threshold=1024,
+        offload_threshold=256,
+        s3_bucket="payloads",
+        s3_client=s3_client,
+    )
+    message = build_message(200)
+
+    envelope = json.loads(transport.encode(message, result_type="report"))
+
+    pointer = envelope[TRANSPORT_KEY]
+    assert pointer["s3_bucket"] == "payloads"
+    assert pointer["s3_key"].startswith("lambdacron/payloads/report/")
+    assert pointer["s3_key"].endswith(".json.gz")
+    assert transport.decode(envelope) == message
+
+
+def test_payload_transport_does_not_offload_without_bucket():
+    transport = PayloadTransport(compress_threshold=1024, offload_threshold=256)
+
+    envelope = json.loads(transport.encode(build_message(200), result_type="report"))
+
+    assert "data" in envelope[TRANSPORT_KEY]
+
+
+def test_payload_transport_rejects_unknown_encoding():
+    transport = PayloadTransport()
+
+    with pytest.raises(ValueError, match="Unsupported transport encoding"):
+        transport.decode({TRANSPORT_KEY: {"encoding": "brotli", "data": ""}})
+
+
+def test_payload_transport_rejects_unknown_compression():
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        PayloadTransport(compression="lz4")
+
+
+def test_load_payload_transport_reads_env(monkeypatch):
+    monkeypatch.delenv("LAMBDACRON_PAYLOAD_BUCKET", raising=False)
+    assert load_payload_transport() is None
+
+    monkeypatch.setenv("LAMBDACRON_PAYLOAD_BUCKET", "payloads")
+    transport = load_payload_transport()
+
+    assert transport is not None
+    assert transport.s3_bucket == "payloads"